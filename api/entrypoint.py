@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from celery import Celery
@@ -45,6 +46,7 @@ from oss.src.core.observability.service import ObservabilityService
 from oss.src.apis.fastapi.observability.router import ObservabilityRouter
 
 from oss.src.dbs.postgres.tracing.dao import TracingDAO
+from oss.src.dbs.postgres.shared.partitions import run_partitions_maintenance
 from oss.src.dbs.postgres.git.dao import GitDAO
 from oss.src.dbs.postgres.blobs.dao import BlobDAO
 
@@ -104,8 +106,12 @@ async def lifespan(application: FastAPI, cache=True):
     await check_for_new_entities_migratons()
     await check_for_new_tracing_migrations()
 
+    partitions_maintenance = asyncio.create_task(run_partitions_maintenance())
+
     yield
 
+    partitions_maintenance.cancel()
+
 
 app = FastAPI(lifespan=lifespan, openapi_tags=open_api_tags_metadata)
 
@@ -0,0 +1,98 @@
+"""add next_version to variants, and unique versions to revisions
+
+Revision ID: 0698355c7643
+Revises: 0698355c7642
+Create Date: 2026-10-19 09:12:31.482117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0698355c7643"
+down_revision: Union[str, None] = "0698355c7642"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for kind in ("workflow", "testset"):
+        # - VARIANTS -----------------------------------------------------------
+
+        op.add_column(
+            f"{kind}_variants",
+            sa.Column(
+                "next_version",
+                sa.Integer(),
+                nullable=False,
+                server_default="0",
+            ),
+        )
+
+        # - REVISIONS ----------------------------------------------------------
+
+        # Renumber versions by creation order, as concurrent commits may have
+        # produced duplicates, before they are made unique
+        op.execute(
+            f"""
+            UPDATE {kind}_revisions AS r
+            SET version = v.version
+            FROM (
+                SELECT
+                    project_id,
+                    id,
+                    (
+                        ROW_NUMBER() OVER (
+                            PARTITION BY project_id, variant_id
+                            ORDER BY created_at, id
+                        ) - 1
+                    )::text AS version
+                FROM {kind}_revisions
+            ) AS v
+            WHERE r.project_id = v.project_id
+            AND r.id = v.id;
+            """
+        )
+
+        op.execute(
+            f"""
+            UPDATE {kind}_variants AS v
+            SET next_version = r.count
+            FROM (
+                SELECT project_id, variant_id, COUNT(*) AS count
+                FROM {kind}_revisions
+                GROUP BY project_id, variant_id
+            ) AS r
+            WHERE v.project_id = r.project_id
+            AND v.id = r.variant_id;
+            """
+        )
+
+        # Versions are strings, but history is ordered by their integer value
+        op.create_index(
+            f"ix_{kind}_revisions_project_id_variant_id_version",
+            f"{kind}_revisions",
+            ["project_id", "variant_id", sa.text("CAST(version AS INTEGER)")],
+            unique=True,
+        )
+
+        # ----------------------------------------------------------------------
+
+
+def downgrade() -> None:
+    for kind in ("testset", "workflow"):
+        # - REVISIONS ----------------------------------------------------------
+
+        op.drop_index(
+            f"ix_{kind}_revisions_project_id_variant_id_version",
+            table_name=f"{kind}_revisions",
+        )
+
+        # - VARIANTS -----------------------------------------------------------
+
+        op.drop_column(f"{kind}_variants", "next_version")
+
+        # ----------------------------------------------------------------------
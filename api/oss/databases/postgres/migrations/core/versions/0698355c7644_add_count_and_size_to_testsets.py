@@ -0,0 +1,60 @@
+"""add count and size to (legacy) testsets
+
+Revision ID: 0698355c7644
+Revises: 0698355c7643
+Create Date: 2026-10-19 13:05:47.215930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0698355c7644"
+down_revision: Union[str, None] = "0698355c7643"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # - TESTSETS ---------------------------------------------------------------
+
+    op.add_column(
+        "testsets",
+        sa.Column(
+            "count",
+            sa.Integer(),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "testsets",
+        sa.Column(
+            "size",
+            sa.Integer(),
+            nullable=True,
+        ),
+    )
+
+    op.execute(
+        """
+        UPDATE testsets
+        SET
+            count = jsonb_array_length(csvdata),
+            size = octet_length(csvdata::text)
+        WHERE jsonb_typeof(csvdata) = 'array';
+        """
+    )
+
+    # --------------------------------------------------------------------------
+
+
+def downgrade() -> None:
+    # - TESTSETS ---------------------------------------------------------------
+
+    op.drop_column("testsets", "size")
+    op.drop_column("testsets", "count")
+
+    # --------------------------------------------------------------------------
@@ -0,0 +1,198 @@
+"""partition spans and nodes by start time
+
+Revision ID: b3e1c2d4f5a6
+Revises: 847972cfa14a
+Create Date: 2026-10-19 14:21:36.518204
+
+"""
+
+import os
+from typing import Sequence, Union
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e1c2d4f5a6"
+down_revision: Union[str, None] = "847972cfa14a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INTERVAL = os.environ.get("AGENTA_TRACING_PARTITION_INTERVAL", "day")
+AHEAD = int(os.environ.get("AGENTA_TRACING_PARTITIONS_AHEAD", "7"))
+
+# Partitioned by the start time sent by the client, which a retried span repeats,
+# so that the primary key still rejects duplicates.
+TABLES = {
+    "spans": {
+        "partition_key": "start_time",
+        "primary_key": '"project_id", "trace_id", "span_id"',
+        "indexes": {
+            "ix_project_id_trace_id": '("project_id", "trace_id")',
+            "ix_project_id_span_id": '("project_id", "span_id")',
+            "ix_project_id_start_time": '("project_id", "start_time")',
+            "ix_project_id": '("project_id")',
+            "ix_attributes_gin": 'USING gin ("attributes")',
+            "ix_events_gin": 'USING gin ("events")',
+            "ix_links_gin": 'USING gin ("links")',
+            "ix_references_gin": 'USING gin ("references")',
+        },
+    },
+    "nodes": {
+        "partition_key": "time_start",
+        "primary_key": '"project_id", "node_id"',
+        "indexes": {
+            "index_project_id_node_id": '("project_id", "created_at")',
+            "index_project_id_root_id": '("project_id", "root_id")',
+            "index_project_id_tree_id": '("project_id", "tree_id")',
+        },
+    },
+}
+
+
+def _period_start(moment: datetime) -> datetime:
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if INTERVAL == "week":
+        start -= timedelta(days=start.weekday())
+
+    return start
+
+
+def upgrade() -> None:
+    step = timedelta(weeks=1) if INTERVAL == "week" else timedelta(days=1)
+
+    # Existing rows stay where they are, as a single partition, so that no data
+    # is copied. Retention drops it once it expires. Its upper bound leaves one
+    # spare period, for spans written while the migration runs.
+    boundaries = {}
+
+    # The bound is checked first, as a NOT VALID constraint validated in its own
+    # transaction, which scans the table without blocking writes. The attach
+    # then relies on the constraint, instead of scanning under lock.
+    with op.get_context().autocommit_block():
+        for table, spec in TABLES.items():
+            key = spec["partition_key"]
+
+            latest = (
+                op.get_bind()
+                .execute(sa.text(f"SELECT MAX({key}) FROM {table}"))
+                .scalar()
+            )
+
+            boundary = _period_start(datetime.now(timezone.utc)) + 2 * step
+
+            if latest is not None:
+                latest = latest.replace(tzinfo=latest.tzinfo or timezone.utc)
+
+                boundary = max(boundary, _period_start(latest) + step)
+
+            boundaries[table] = boundary
+
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_partition_check "
+                f"CHECK ({key} IS NOT NULL AND {key} < '{boundary.isoformat()}') "
+                f"NOT VALID"
+            )
+            op.execute(
+                f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_partition_check"
+            )
+
+            # The new primary key includes the partition key. Its index is built
+            # without blocking writes, so that the attach reuses it.
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_legacy_pkey "
+                f'ON {table} ({spec["primary_key"]}, "{key}")'
+            )
+
+    for table, spec in TABLES.items():
+        key = spec["partition_key"]
+        legacy = f"{table}_legacy"
+        boundary = boundaries[table]
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {table}_pkey")
+
+        # An index is only reused for a primary key if it backs one already
+        op.execute(
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {table}_legacy_pkey "
+            f"PRIMARY KEY USING INDEX {table}_legacy_pkey"
+        )
+
+        for index in spec["indexes"]:
+            op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({key})"
+        )
+
+        # The partition key must be part of the primary key
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+            f'PRIMARY KEY ({spec["primary_key"]}, "{key}")'
+        )
+
+        # Identical indexes on the legacy table are attached, not rebuilt
+        for index, definition in spec["indexes"].items():
+            op.execute(f"CREATE INDEX {index} ON {table} {definition}")
+
+        op.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+        )
+
+        # Implied by the partition bound, from now on
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {table}_partition_check")
+
+        # Catches rows outside of any partition, e.g. if maintenance falls behind
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        start = boundary
+
+        for _ in range(AHEAD):
+            op.execute(
+                f"CREATE TABLE {table}_p{start:%Y%m%d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') "
+                f"TO ('{(start + step).isoformat()}')"
+            )
+
+            start += step
+
+
+def downgrade() -> None:
+    for table, spec in TABLES.items():
+        legacy = f"{table}_legacy"
+
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {legacy}")
+
+        op.execute(f"INSERT INTO {legacy} SELECT * FROM {table}")
+
+        op.execute(f"DROP TABLE {table}")
+
+        op.execute(
+            f"""
+            DO $$
+            DECLARE name TEXT;
+            BEGIN
+                SELECT conname INTO name
+                FROM pg_constraint
+                WHERE conrelid = '{legacy}'::regclass AND contype = 'p';
+
+                IF name IS NOT NULL THEN
+                    EXECUTE format('ALTER TABLE {legacy} DROP CONSTRAINT %I', name);
+                END IF;
+            END $$;
+            """
+        )
+
+        op.execute(f"ALTER TABLE {legacy} RENAME TO {table}")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+            f'PRIMARY KEY ({spec["primary_key"]})'
+        )
+
+        for index in spec["indexes"]:
+            op.execute(f"ALTER INDEX {index}_legacy RENAME TO {index}")
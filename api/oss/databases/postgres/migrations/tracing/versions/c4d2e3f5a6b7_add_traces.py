@@ -0,0 +1,168 @@
+"""add traces (summaries of spans, by trace)
+
+Revision ID: c4d2e3f5a6b7
+Revises: b3e1c2d4f5a6
+Create Date: 2026-10-19 15:02:11.734095
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d2e3f5a6b7"
+down_revision: Union[str, None] = "b3e1c2d4f5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "traces",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("trace_id", sa.UUID(), nullable=False),
+        sa.Column("span_id", sa.UUID(), nullable=False),
+        sa.Column("parent_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "span_kind",
+            postgresql.ENUM(name="otelspankind", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("span_name", sa.VARCHAR(), nullable=False),
+        sa.Column(
+            "status_code",
+            postgresql.ENUM(name="otelstatuscode", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("status_message", sa.VARCHAR(), nullable=True),
+        sa.Column(
+            "attributes",
+            postgresql.JSONB(none_as_null=True, astext_type=sa.Text()),
+            nullable=True,
+        ),
+        sa.Column("start_time", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("end_time", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("span_count", sa.Integer(), nullable=False),
+        sa.Column("has_errors", sa.Boolean(), nullable=False),
+        sa.Column("costs", sa.Float(), nullable=True),
+        sa.Column("tokens", sa.Float(), nullable=True),
+        sa.Column(
+            "references",
+            postgresql.JSONB(none_as_null=True, astext_type=sa.Text()),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("project_id", "trace_id"),
+    )
+    op.create_index(
+        "ix_traces_project_id_start_time",
+        "traces",
+        ["project_id", "start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_traces_start_time",
+        "traces",
+        ["start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_traces_attributes_gin",
+        "traces",
+        ["attributes"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_traces_references_gin",
+        "traces",
+        ["references"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"references": "jsonb_path_ops"},
+    )
+
+    # Summarizes existing traces, as TracingDAO._refresh_traces does
+    op.execute(
+        """
+        INSERT INTO traces (
+            project_id, trace_id, span_id, parent_id,
+            span_kind, span_name, status_code, status_message, attributes,
+            start_time, end_time, span_count, has_errors, costs, tokens,
+            "references", created_at
+        )
+        SELECT
+            stats.project_id, stats.trace_id, roots.span_id, roots.parent_id,
+            roots.span_kind, roots.span_name,
+            roots.status_code, roots.status_message, roots.attributes,
+            stats.start_time, stats.end_time, stats.span_count,
+            stats.has_errors, stats.costs, stats.tokens,
+            refs."references", stats.created_at
+        FROM (
+            SELECT
+                project_id,
+                trace_id,
+                MIN(start_time) AS start_time,
+                MAX(end_time) AS end_time,
+                COUNT(*) AS span_count,
+                BOOL_OR(status_code = 'STATUS_CODE_ERROR') AS has_errors,
+                SUM(
+                    CASE WHEN jsonb_typeof(COALESCE(
+                        attributes #> '{ag,metrics,unit,costs,total}',
+                        attributes #> '{agenta,metrics,unit,costs,total}'
+                    )) = 'number' THEN CAST(COALESCE(
+                        attributes #> '{ag,metrics,unit,costs,total}',
+                        attributes #> '{agenta,metrics,unit,costs,total}'
+                    ) AS FLOAT) END
+                ) AS costs,
+                SUM(
+                    CASE WHEN jsonb_typeof(COALESCE(
+                        attributes #> '{ag,metrics,unit,tokens,total}',
+                        attributes #> '{agenta,metrics,unit,tokens,total}'
+                    )) = 'number' THEN CAST(COALESCE(
+                        attributes #> '{ag,metrics,unit,tokens,total}',
+                        attributes #> '{agenta,metrics,unit,tokens,total}'
+                    ) AS FLOAT) END
+                ) AS tokens,
+                MIN(created_at) AS created_at
+            FROM spans
+            GROUP BY project_id, trace_id
+        ) AS stats
+        JOIN (
+            SELECT DISTINCT ON (project_id, trace_id)
+                project_id, trace_id, span_id, parent_id,
+                span_kind, span_name, status_code, status_message, attributes
+            FROM spans
+            ORDER BY project_id, trace_id, parent_id IS NOT NULL, start_time
+        ) AS roots
+        ON roots.project_id = stats.project_id
+        AND roots.trace_id = stats.trace_id
+        LEFT JOIN (
+            SELECT
+                project_id,
+                trace_id,
+                jsonb_agg(DISTINCT reference) AS "references"
+            FROM spans, jsonb_array_elements(spans."references") AS reference
+            GROUP BY project_id, trace_id
+        ) AS refs
+        ON refs.project_id = stats.project_id
+        AND refs.trace_id = stats.trace_id;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_traces_references_gin", table_name="traces")
+    op.drop_index("ix_traces_attributes_gin", table_name="traces")
+    op.drop_index("ix_traces_start_time", table_name="traces")
+    op.drop_index("ix_traces_project_id_start_time", table_name="traces")
+    op.drop_table("traces")
@@ -0,0 +1,193 @@
+"""add content (full text search) to spans
+
+Revision ID: d5e3f4a6b7c8
+Revises: c4d2e3f5a6b7
+Create Date: 2026-10-19 16:10:42.385017
+
+A stored generated column would rewrite every partition of spans under an
+ACCESS EXCLUSIVE lock, blocking ingestion for as long as the rewrite takes.
+Instead, content is a plain column (added without a rewrite) that a trigger
+fills on insert and on update. Existing spans are backfilled partition by
+partition, in batches that each commit on their own, and the index is built
+concurrently on each partition before being attached to the parent index.
+
+Spans written while the migration runs are covered by the trigger, so the
+migration can run while the API is up. It can also be interrupted and rerun.
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e3f4a6b7c8"
+down_revision: Union[str, None] = "c4d2e3f5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_CONFIG = "simple"
+FTS_MAX_LENGTH = 65_536
+
+BATCH_SIZE = int(os.environ.get("AGENTA_TRACING_BACKFILL_BATCH_SIZE", "10000"))
+
+
+def _fts_document(
+    attributes: str,
+    path: str,
+    weight: str,
+) -> str:
+    return (
+        f"setweight(to_tsvector('{FTS_CONFIG}'::regconfig, left(COALESCE("
+        f"{attributes} #>> '{{ag,data,{path}}}'::text[], "
+        f"{attributes} #>> '{{agenta,data,{path}}}'::text[], "
+        f"''), {FTS_MAX_LENGTH})), '{weight}')"
+    )
+
+
+def _fts_content(
+    attributes: str,
+) -> str:
+    return (
+        f"{_fts_document(attributes, 'inputs', 'A')} || "
+        f"{_fts_document(attributes, 'outputs', 'B')}"
+    )
+
+
+def _partitions() -> Sequence[str]:
+    return (
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'spans'
+                ORDER BY child.relname
+                """
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _backfill(
+    partition: str,
+) -> None:
+    # Walks the primary key, so that each batch starts where the last one ended
+    last = None
+
+    while True:
+        after = (
+            "WHERE (project_id, trace_id, span_id, start_time)"
+            " > (:project_id, :trace_id, :span_id, :start_time)"
+            if last
+            else ""
+        )
+
+        last = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    f"""
+                    WITH batch AS (
+                        SELECT project_id, trace_id, span_id, start_time
+                        FROM {partition}
+                        {after}
+                        ORDER BY project_id, trace_id, span_id, start_time
+                        LIMIT {BATCH_SIZE}
+                    ),
+                    updated AS (
+                        UPDATE {partition} AS spans
+                        SET content = {_fts_content("spans.attributes")}
+                        FROM batch
+                        WHERE spans.project_id = batch.project_id
+                        AND spans.trace_id = batch.trace_id
+                        AND spans.span_id = batch.span_id
+                        AND spans.start_time = batch.start_time
+                        AND spans.content IS NULL
+                    )
+                    SELECT project_id, trace_id, span_id, start_time
+                    FROM batch
+                    ORDER BY
+                        project_id DESC, trace_id DESC, span_id DESC, start_time DESC
+                    LIMIT 1
+                    """
+                ),
+                last._asdict() if last else {},
+            )
+            .first()
+        )
+
+        if last is None:
+            return
+
+
+def upgrade() -> None:
+    # Without a default, the column is only added to the catalog
+    op.execute("ALTER TABLE spans ADD COLUMN IF NOT EXISTS content tsvector")
+
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION spans_content() RETURNS trigger AS $$
+        BEGIN
+            NEW.content := {_fts_content("NEW.attributes")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS spans_content ON spans")
+    op.execute(
+        "CREATE TRIGGER spans_content "
+        "BEFORE INSERT OR UPDATE OF attributes ON spans "
+        "FOR EACH ROW EXECUTE FUNCTION spans_content()"
+    )
+
+    # Invalid until every partition has its own index attached.
+    # Partitions created from now on get theirs on creation.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_content_gin ON ONLY spans USING gin (content)"
+    )
+
+    with op.get_context().autocommit_block():
+        for partition in _partitions():
+            _backfill(partition)
+
+            index = f"{partition}_content_idx"
+
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+                f"ON {partition} USING gin (content)"
+            )
+
+            attached = (
+                op.get_bind()
+                .execute(
+                    sa.text(
+                        """
+                        SELECT 1
+                        FROM pg_inherits
+                        WHERE inhrelid = CAST(:index AS regclass)
+                        """
+                    ),
+                    {"index": index},
+                )
+                .first()
+            )
+
+            if not attached:
+                op.execute(f"ALTER INDEX ix_content_gin ATTACH PARTITION {index}")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_content_gin")
+    op.execute("DROP TRIGGER IF EXISTS spans_content ON spans")
+    op.execute("DROP FUNCTION IF EXISTS spans_content()")
+    op.execute("ALTER TABLE spans DROP COLUMN IF EXISTS content")
@@ -0,0 +1,97 @@
+"""add span references (index of spans, by reference)
+
+Revision ID: e6f4a5b7c8d9
+Revises: d5e3f4a6b7c8
+Create Date: 2026-10-19 17:24:08.912446
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f4a5b7c8d9"
+down_revision: Union[str, None] = "d5e3f4a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "span_references",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("trace_id", sa.UUID(), nullable=False),
+        sa.Column("span_id", sa.UUID(), nullable=False),
+        sa.Column("ref_index", sa.Integer(), nullable=False),
+        sa.Column("ref_type", sa.VARCHAR(), nullable=True),
+        sa.Column("ref_id", sa.UUID(), nullable=True),
+        sa.Column("ref_slug", sa.VARCHAR(), nullable=True),
+        sa.Column("ref_version", sa.VARCHAR(), nullable=True),
+        sa.Column("start_time", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "trace_id", "span_id", "ref_index"),
+    )
+    op.create_index(
+        "ix_span_references_project_id_ref_id_start_time",
+        "span_references",
+        ["project_id", "ref_id", "start_time"],
+        unique=False,
+        postgresql_include=["trace_id", "span_id"],
+    )
+    op.create_index(
+        "ix_span_references_project_id_ref_slug_start_time",
+        "span_references",
+        ["project_id", "ref_slug", "start_time"],
+        unique=False,
+        postgresql_include=["trace_id", "span_id"],
+    )
+    op.create_index(
+        "ix_span_references_start_time",
+        "span_references",
+        ["start_time"],
+        unique=False,
+    )
+
+    # Indexes existing spans, as TracingDAO._refresh_references does on ingest
+    op.execute(
+        """
+        INSERT INTO span_references (
+            project_id, trace_id, span_id, ref_index,
+            ref_type, ref_id, ref_slug, ref_version,
+            start_time, created_at
+        )
+        SELECT
+            spans.project_id, spans.trace_id, spans.span_id,
+            CAST(reference.ordinality AS INTEGER),
+            reference.value ->> 'attributes.key',
+            CASE WHEN (reference.value ->> 'id') ~* '^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$'
+                THEN CAST(reference.value ->> 'id' AS UUID) END,
+            reference.value ->> 'slug',
+            reference.value ->> 'version',
+            spans.start_time, spans.created_at
+        FROM spans
+        JOIN jsonb_array_elements(spans."references") WITH ORDINALITY
+            AS reference(value, ordinality) ON true
+        WHERE jsonb_typeof(spans."references") = 'array'
+        AND jsonb_typeof(reference.value) = 'object'
+        ON CONFLICT DO NOTHING;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_span_references_start_time",
+        table_name="span_references",
+    )
+    op.drop_index(
+        "ix_span_references_project_id_ref_slug_start_time",
+        table_name="span_references",
+    )
+    op.drop_index(
+        "ix_span_references_project_id_ref_id_start_time",
+        table_name="span_references",
+    )
+    op.drop_table("span_references")
@@ -302,6 +302,10 @@ class ObservabilityRouter:
         if format == "opentelemetry" and query_dto.grouping:
             query_dto.grouping.focus = Focus.NODE
 
+        # format = opentelemetry -> whole nodes
+        if format == "opentelemetry":
+            query_dto.fields = None
+
         try:
             span_dtos, count = await self.service.query(
                 project_id=UUID(request.state.project_id),
@@ -144,12 +144,16 @@ def parse_query_request(
     size: Optional[int] = Query(None),
     next: Optional[str] = Query(None),  # pylint: disable=W0622:redefined-builtin
     stop: Optional[str] = Query(None),
+    # PROJECTION
+    # - Option 2: Flat query parameters
+    fields: Optional[List[str]] = Query(None),
 ) -> QueryDTO:
     return QueryDTO(
         grouping=_parse_grouping(focus=focus),
         windowing=_parse_windowing(oldest=oldest, newest=newest),
         filtering=_parse_filtering(filtering=filtering),
         pagination=_parse_pagination(page=page, size=size, next=next, stop=stop),
+        fields=fields,
     )
 
 
@@ -1,7 +1,9 @@
 from typing import Optional, List
+from uuid import UUID
 
 from pydantic import BaseModel
 
+from oss.src.core.testsets.dtos import TestsetRevisionDiff
 from oss.src.core.shared.dtos import (
     Identifier,
     Slug,
@@ -14,6 +16,8 @@ from oss.src.core.shared.dtos import (
 
 class Testset(Identifier, Slug, Lifecycle, Header):
     testcases: Optional[List[Testcase]] = None
+    testcase_ids: Optional[List[UUID]] = None
+    revision_id: Optional[UUID] = None
     metadata: Optional[Metadata] = None
 
 
@@ -38,3 +42,13 @@ class TestsetsResponse(BaseModel):
 class TestcaseResponse(BaseModel):
     count: int
     testcase: Optional[Testcase] = None
+
+
+class TestcasesResponse(BaseModel):
+    count: int
+    testcases: List[Testcase] = []
+
+
+class TestsetDiffResponse(BaseModel):
+    count: int
+    diff: Optional[TestsetRevisionDiff] = None
@@ -1,12 +1,10 @@
-from typing import Union, Optional, List, Literal
+from typing import Union, Optional, List, Dict, Any, Iterator, Literal
 from uuid import uuid4, UUID
-from tempfile import TemporaryDirectory
-from os import path as os_path
 
 from pydantic import ValidationError
 
 from fastapi import Request, status, HTTPException, UploadFile, File, Form, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 
 from oss.src.utils.common import APIRouter, is_ee
 from oss.src.utils.logging import get_module_logger
@@ -20,6 +18,8 @@ from oss.src.core.testsets.dtos import (
     TestsetArtifact,
     TestsetVariant,
     TestsetRevision,
+    TestsetSampling,
+    SamplingMethod,
 )
 
 from oss.src.apis.fastapi.testsets.models import (
@@ -28,20 +28,25 @@ from oss.src.apis.fastapi.testsets.models import (
     TestsetResponse,
     TestsetsResponse,
     TestcaseResponse,
+    TestcasesResponse,
+    TestsetDiffResponse,
     Testset,
     Testcase,
 )
 
 from oss.src.apis.fastapi.testsets.utils import (
-    csv_file_to_json_array,
-    json_file_to_json_array,
+    csv_file_to_json_rows,
+    json_file_to_json_rows,
+    jsonl_file_to_json_rows,
+    json_rows_to_testcases,
     json_array_to_json_object,
-    json_array_to_csv_file,
-    json_array_to_json_file,
+    testcases_to_file_stream,
     format_validation_error,
     validate_testset_limits,
     TESTSETS_SIZE_EXCEPTION,
     TESTSETS_SIZE_LIMIT,
+    TESTSETS_MEDIA_TYPES,
+    TESTCASES_PAGE_LIMIT,
 )
 
 if is_ee():
@@ -186,6 +191,39 @@ class TestsetsRouter:
             response_model_exclude_none=True,
         )
 
+        # GET /api/v1/testsets/{testset_id}/testcases
+        self.router.add_api_route(
+            "/{testset_id}/testcases",
+            self.fetch_testset_testcases,
+            methods=["GET"],
+            operation_id="fetch_testset_testcases",
+            status_code=status.HTTP_200_OK,
+            response_model=TestcasesResponse,
+            response_model_exclude_none=True,
+        )
+
+        # GET /api/v1/testsets/{testset_id}/sample
+        self.router.add_api_route(
+            "/{testset_id}/sample",
+            self.sample_testset_testcases,
+            methods=["GET"],
+            operation_id="sample_testset_testcases",
+            status_code=status.HTTP_200_OK,
+            response_model=TestcasesResponse,
+            response_model_exclude_none=True,
+        )
+
+        # GET /api/v1/testsets/{testset_id}/diff
+        self.router.add_api_route(
+            "/{testset_id}/diff",
+            self.diff_testset_revisions,
+            methods=["GET"],
+            operation_id="diff_testset_revisions",
+            status_code=status.HTTP_200_OK,
+            response_model=TestsetDiffResponse,
+            response_model_exclude_none=True,
+        )
+
         # GET /api/v1/testcases/{testcase_id}
         self.router.add_api_route(
             "/testcases/{testcase_id}",
@@ -236,113 +274,18 @@ class TestsetsRouter:
                 detail=format_validation_error(e, testset_request.model_dump()),
             ) from e
 
-        testset_artifact: Optional[
-            TestsetArtifact
-        ] = await self.testsets_service.create_artifact(
-            project_id=UUID(request.state.project_id),
-            user_id=UUID(request.state.user_id),
-            #
-            artifact_slug=testset_request.testset.slug,
-            #
-            artifact_flags=self.TESTCASES_FLAGS,
-            artifact_metadata=testset_request.testset.metadata,
-            artifact_name=testset_request.testset.name,
-            artifact_description=testset_request.testset.description,
-        )
-
-        if testset_artifact is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create testset. Please try again or contact support.",
-            )
-
-        testset_variant_slug = uuid4().hex
-
-        testset_variant: Optional[
-            TestsetVariant
-        ] = await self.testsets_service.create_variant(
-            project_id=UUID(request.state.project_id),
-            user_id=UUID(request.state.user_id),
-            #
-            artifact_id=testset_artifact.id,
-            #
-            variant_slug=testset_variant_slug,
-            #
-            variant_flags=self.TESTCASES_FLAGS,
-            variant_metadata=testset_request.testset.metadata,
-        )
-
-        if testset_variant is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create testset. Please try again or contact support.",
-            )
-
-        testset_revision_slug = uuid4().hex
-
-        testset_revision: Optional[
-            TestsetRevision
-        ] = await self.testsets_service.create_revision(
-            project_id=UUID(request.state.project_id),
-            user_id=UUID(request.state.user_id),
-            #
-            variant_id=testset_variant.id,
-            #
-            revision_slug=testset_revision_slug,
-            #
-            revision_flags=self.TESTCASES_FLAGS,
-            revision_metadata=testset_request.testset.metadata,
-        )
-
-        if testset_revision is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create testset. Please try again or contact support.",
-            )
-
-        testset_revision_slug = uuid4().hex
-
-        testset_revision: Optional[
-            TestsetRevision
-        ] = await self.testsets_service.commit_revision(
-            project_id=UUID(request.state.project_id),
-            user_id=UUID(request.state.user_id),
-            #
-            variant_id=testset_variant.id,
-            #
-            revision_slug=testset_revision_slug,
-            #
-            revision_flags=self.TESTCASES_FLAGS,
-            revision_metadata=testset_request.testset.metadata,
-            revision_data=testset_revision_data,
-        )
-
-        if testset_revision is None:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create testset. Please try again or contact support.",
-            )
-
-        testset = Testset(
-            id=testset_artifact.id,
-            slug=testset_artifact.slug,
-            #
-            created_at=testset_artifact.created_at,
-            updated_at=testset_artifact.updated_at,
-            deleted_at=testset_artifact.deleted_at,
-            created_by_id=testset_artifact.created_by_id,
-            updated_by_id=testset_artifact.updated_by_id,
-            deleted_by_id=testset_artifact.deleted_by_id,
+        testset_header = Testset(
+            slug=testset_request.testset.slug,
             #
-            metadata=testset_artifact.metadata,
-            name=testset_artifact.name,
-            description=testset_artifact.description,
-            testcases=testset_revision.data.testcases,
+            metadata=testset_request.testset.metadata,
+            name=testset_request.testset.name,
+            description=testset_request.testset.description,
         )
 
-        testset_response = TestsetResponse(
-            count=1,
-            testset=testset,
+        testset_response = await self._create_testset(
+            request=request,
+            testset_header=testset_header,
+            testset_revision_data=testset_revision_data,
         )
 
         return testset_response
@@ -353,6 +296,7 @@ class TestsetsRouter:
         *,
         request: Request,
         testset_id: Union[UUID, str],
+        include_testcases: bool = Query(True),
     ) -> TestsetResponse:
         if is_ee():
             if not await check_action_access(
@@ -404,6 +348,8 @@ class TestsetsRouter:
             project_id=UUID(request.state.project_id),
             #
             variant_ref=testset_variant_ref,
+            #
+            include_testcases=include_testcases,
         )
 
         if testset_revision is None:
@@ -426,7 +372,13 @@ class TestsetsRouter:
             metadata=testset_artifact.metadata,
             name=testset_artifact.name,
             description=testset_artifact.description,
-            testcases=testset_revision.data.testcases,
+            revision_id=testset_revision.id,
+            testcases=(
+                testset_revision.data.testcases if testset_revision.data else None
+            ),
+            testcase_ids=(
+                testset_revision.data.testcase_ids if testset_revision.data else None
+            ),
         )
 
         testset_response = TestsetResponse(
@@ -605,6 +557,7 @@ class TestsetsRouter:
             metadata=testset_artifact.metadata,
             name=testset_artifact.name,
             description=testset_artifact.description,
+            revision_id=testset_revision.id,
             testcases=testset_revision.data.testcases,
         )
 
@@ -763,6 +716,7 @@ class TestsetsRouter:
         *,
         request: Request,
         metadata_request: Optional[TagsRequest] = None,
+        include_testcases: bool = Query(True),
     ) -> TestsetsResponse:
         if is_ee():
             if not await check_action_access(
@@ -791,33 +745,50 @@ class TestsetsRouter:
                 detail="Failed to query testsets. Please try again or contact support.",
             )
 
-        for testset_artifact in testset_artifacts:
-            testset_artifact_ref = Reference(
-                id=testset_artifact.id,
-            )
+        # One query per level (variants, revisions, testcases), not per testset
+        testset_variants: List[
+            TestsetVariant
+        ] = await self.testsets_service.query_variants(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ids=[
+                testset_artifact.id for testset_artifact in testset_artifacts
+            ],
+        )
 
-            testset_variant: Optional[
-                TestsetVariant
-            ] = await self.testsets_service.fetch_variant(
-                project_id=UUID(request.state.project_id),
-                #
-                artifact_ref=testset_artifact_ref,
+        testset_variants_by_artifact_id: Dict[UUID, TestsetVariant] = {}
+
+        for testset_variant in testset_variants:
+            testset_variants_by_artifact_id.setdefault(
+                testset_variant.artifact_id, testset_variant
             )
 
+        testset_revisions: List[
+            TestsetRevision
+        ] = await self.testsets_service.log_variants_revisions(
+            project_id=UUID(request.state.project_id),
+            #
+            variant_ids=[
+                testset_variant.id
+                for testset_variant in testset_variants_by_artifact_id.values()
+            ],
+            depth=1,
+            #
+            include_testcases=include_testcases,
+        )
+
+        testset_revisions_by_variant_id: Dict[UUID, TestsetRevision] = {
+            testset_revision.variant_id: testset_revision
+            for testset_revision in testset_revisions
+        }
+
+        for testset_artifact in testset_artifacts:
+            testset_variant = testset_variants_by_artifact_id.get(testset_artifact.id)
+
             if testset_variant is None:
                 continue
 
-            testset_variant_ref = Reference(
-                id=testset_variant.id,
-            )
-
-            testset_revision: Optional[
-                TestsetRevision
-            ] = await self.testsets_service.fetch_revision(
-                project_id=UUID(request.state.project_id),
-                #
-                variant_ref=testset_variant_ref,
-            )
+            testset_revision = testset_revisions_by_variant_id.get(testset_variant.id)
 
             if testset_revision is None:
                 continue
@@ -837,7 +808,17 @@ class TestsetsRouter:
                     metadata=testset_artifact.metadata,
                     name=testset_artifact.name,
                     description=testset_artifact.description,
-                    testcases=testset_revision.data.testcases,
+                    revision_id=testset_revision.id,
+                    testcases=(
+                        testset_revision.data.testcases
+                        if testset_revision.data
+                        else None
+                    ),
+                    testcase_ids=(
+                        testset_revision.data.testcase_ids
+                        if testset_revision.data
+                        else None
+                    ),
                 )
             )
 
@@ -854,7 +835,7 @@ class TestsetsRouter:
         *,
         request: Request,
         file: UploadFile = File(...),
-        file_type: Literal["CSV", "JSON"] = Form(None),
+        file_type: Literal["CSV", "JSON", "JSONL"] = Form(None),
         testset_slug: Optional[str] = Form(None),
         testset_name: Optional[str] = File(None),
         testset_description: Optional[str] = Form(None),
@@ -868,59 +849,32 @@ class TestsetsRouter:
             ):
                 raise FORBIDDEN_EXCEPTION
 
-        if file_type is None or file_type not in ["CSV", "JSON"]:
+        if file_type is None or file_type not in ["CSV", "JSON", "JSONL"]:
             raise HTTPException(
                 status_code=400,
-                detail="Invalid file type. Supported types are 'CSV' and 'JSON'.",
+                detail="Invalid file type. Supported types are 'CSV', 'JSON' and 'JSONL'.",
             )
 
         if file.size > TESTSETS_SIZE_LIMIT:  # Preemptively check file size
             raise TESTSETS_SIZE_EXCEPTION
 
-        testcases = []
-
-        if file_type == "JSON":
-            try:
-                testcases = json_file_to_json_array(file)
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to read JSON file: {e}",
-                ) from e
-
-        elif file_type == "CSV":
-            try:
-                testcases = csv_file_to_json_array(file)
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to read CSV file: {e}",
-                ) from e
-
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Supported types are 'csv' and 'json'.",
-            )
-
-        testset_request = TestsetRequest(
-            testset=Testset(
-                slug=testset_slug,
-                #
-                metadata=testset_metadata,
-                name=testset_name,
-                description=testset_description,
-                testcases=testcases,
-            )
+        testset_header = Testset(
+            slug=testset_slug,
+            #
+            metadata=testset_metadata,
+            name=testset_name,
+            description=testset_description,
         )
 
-        return await self.create_testset(
+        testset_response = await self._create_testset(
             request=request,
-            testset_request=testset_request,
+            testset_header=testset_header,
+            file=file,
+            file_type=file_type,
         )
 
+        return testset_response
+
     @handle_exceptions()
     async def update_testset_from_file(
         self,
@@ -928,7 +882,7 @@ class TestsetsRouter:
         request: Request,
         testset_id: Union[UUID, str],
         file: UploadFile = File(...),
-        file_type: Literal["CSV", "JSON"] = Form(None),
+        file_type: Literal["CSV", "JSON", "JSONL"] = Form(None),
     ) -> TestsetResponse:
         if is_ee():
             if not await check_action_access(
@@ -938,93 +892,15 @@ class TestsetsRouter:
             ):
                 raise FORBIDDEN_EXCEPTION
 
-        if file_type is None or file_type not in ["CSV", "JSON"]:
+        if file_type is None or file_type not in ["CSV", "JSON", "JSONL"]:
             raise HTTPException(
                 status_code=400,
-                detail="Invalid file type. Supported types are 'CSV' and 'JSON'.",
+                detail="Invalid file type. Supported types are 'CSV', 'JSON' and 'JSONL'.",
             )
 
         if file.size > TESTSETS_SIZE_LIMIT:  # Preemptively check file size
             raise TESTSETS_SIZE_EXCEPTION
 
-        testcases = []
-
-        if file_type == "JSON":
-            try:
-                testcases = json_file_to_json_array(file)
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to read JSON file: {e}",
-                ) from e
-
-        elif file_type == "CSV":
-            try:
-                testcases = csv_file_to_json_array(file)
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to read CSV file: {e}",
-                ) from e
-
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Supported types are 'csv' and 'json'.",
-            )
-
-        testset_response = await self.fetch_testset(
-            request=request,
-            testset_id=testset_id,
-        )
-
-        if testset_response.testset is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Testset not found. Please check the testset_id and try again.",
-            )
-
-        testset_request = TestsetRequest(
-            testset=Testset(
-                id=testset_id,
-                #
-                metadata=testset_response.testset.metadata,
-                name=testset_response.testset.name,
-                description=testset_response.testset.description,
-                testcases=testcases,
-            )
-        )
-
-        return await self.edit_testset(
-            request=request,
-            testset_id=testset_id,
-            testset_request=testset_request,
-        )
-
-    @handle_exceptions()
-    async def fetch_testset_to_file(
-        self,
-        *,
-        request: Request,
-        testset_id: Union[UUID, str],
-        file_type: Literal["CSV", "JSON"] = Query(None),
-    ) -> ...:
-        if is_ee():
-            if not await check_action_access(
-                user_uid=request.state.user_id,
-                project_id=request.state.project_id,
-                permission=Permission.VIEW_TESTSETS,
-            ):
-                raise FORBIDDEN_EXCEPTION
-
-        if file_type is None or file_type not in ["CSV", "JSON"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Supported types are 'CSV' and 'JSON'.",
-            )
-
         testset_artifact_ref = Reference(
             id=testset_id,
         )
@@ -1040,7 +916,7 @@ class TestsetsRouter:
         if testset_artifact is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Basic testset not found. Please check the ID and try again.",
+                detail="Testset not found. Please check the testset_id and try again.",
             )
 
         testset_variant: Optional[
@@ -1054,53 +930,652 @@ class TestsetsRouter:
         if testset_variant is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Basic testset not found. Please check the ID and try again.",
+                detail="Testset not found. Please check the testset_id and try again.",
             )
 
-        testset_variant_ref = Reference(
-            id=testset_variant.id,
+        testcase_ids = await self._save_testcases_from_file(
+            request=request,
+            testset_id=testset_artifact.id,
+            file=file,
+            file_type=file_type,
         )
 
+        testset_revision_slug = uuid4().hex
+
         testset_revision: Optional[
             TestsetRevision
-        ] = await self.testsets_service.fetch_revision(
+        ] = await self.testsets_service.commit_revision(
             project_id=UUID(request.state.project_id),
+            user_id=UUID(request.state.user_id),
             #
-            variant_ref=testset_variant_ref,
+            variant_id=testset_variant.id,
+            #
+            revision_slug=testset_revision_slug,
+            #
+            revision_flags=self.TESTCASES_FLAGS,
+            revision_metadata=testset_artifact.metadata,
+            revision_data=TestsetData(
+                testcase_ids=testcase_ids,
+            ),
         )
 
         if testset_revision is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Basic testset not found. Please check the ID and try again.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to edit testset. Please try again or contact support.",
             )
 
-        filename = f"testset_{testset_id}.{file_type.lower()}"
-        testcases = testset_revision.data.testcases
-
-        with TemporaryDirectory() as tmpdir:
-            output_path = os_path.join(tmpdir, filename)
+        testset = Testset(
+            id=testset_artifact.id,
+            slug=testset_artifact.slug,
+            #
+            created_at=testset_artifact.created_at,
+            updated_at=testset_artifact.updated_at,
+            deleted_at=testset_artifact.deleted_at,
+            created_by_id=testset_artifact.created_by_id,
+            updated_by_id=testset_artifact.updated_by_id,
+            deleted_by_id=testset_artifact.deleted_by_id,
+            #
+            metadata=testset_artifact.metadata,
+            name=testset_artifact.name,
+            description=testset_artifact.description,
+            revision_id=testset_revision.id,
+            testcases=(
+                testset_revision.data.testcases if testset_revision.data else None
+            ),
+        )
 
-            if file_type == "JSON":
-                json_array_to_json_file(output_path, testcases)
+        testset_response = TestsetResponse(
+            count=1,
+            testset=testset,
+        )
 
-                return FileResponse(
-                    output_path,
-                    media_type="application/json",
-                    filename=filename,
-                )
+        return testset_response
 
-            elif file_type == "CSV":
-                json_array_to_csv_file(testcases, output_path)
+    async def _create_testset(
+        self,
+        *,
+        request: Request,
+        testset_header: Testset,
+        testset_revision_data: Optional[TestsetData] = None,
+        file: Optional[UploadFile] = None,
+        file_type: Optional[Literal["CSV", "JSON", "JSONL"]] = None,
+    ) -> TestsetResponse:
+        # Bad uploads are rejected before anything is created
+        if file is not None:
+            await self._validate_file(file=file, file_type=file_type)
+
+        testset_artifact: Optional[
+            TestsetArtifact
+        ] = await self.testsets_service.create_artifact(
+            project_id=UUID(request.state.project_id),
+            user_id=UUID(request.state.user_id),
+            #
+            artifact_slug=testset_header.slug,
+            #
+            artifact_flags=self.TESTCASES_FLAGS,
+            artifact_metadata=testset_header.metadata,
+            artifact_name=testset_header.name,
+            artifact_description=testset_header.description,
+        )
+
+        if testset_artifact is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create testset. Please try again or contact support.",
+            )
 
-                return FileResponse(
-                    output_path,
-                    media_type="text/csv",
-                    filename=filename,
+        if file is not None:
+            try:
+                testcase_ids = await self._save_testcases_from_file(
+                    request=request,
+                    testset_id=testset_artifact.id,
+                    file=file,
+                    file_type=file_type,
+                )
+
+            except Exception:
+                # e.g. failed writes, as the file itself was validated up front
+                await self.testsets_service.archive_artifact(
+                    project_id=UUID(request.state.project_id),
+                    user_id=UUID(request.state.user_id),
+                    #
+                    artifact_id=testset_artifact.id,
                 )
 
-            else:
-                raise HTTPException(status_code=400, detail="Invalid file type.")
+                raise
+
+            testset_revision_data = TestsetData(
+                testcase_ids=testcase_ids,
+            )
+
+        testset_variant_slug = uuid4().hex
+
+        testset_variant: Optional[
+            TestsetVariant
+        ] = await self.testsets_service.create_variant(
+            project_id=UUID(request.state.project_id),
+            user_id=UUID(request.state.user_id),
+            #
+            artifact_id=testset_artifact.id,
+            #
+            variant_slug=testset_variant_slug,
+            #
+            variant_flags=self.TESTCASES_FLAGS,
+            variant_metadata=testset_header.metadata,
+        )
+
+        if testset_variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create testset. Please try again or contact support.",
+            )
+
+        testset_revision_slug = uuid4().hex
+
+        testset_revision: Optional[
+            TestsetRevision
+        ] = await self.testsets_service.create_revision(
+            project_id=UUID(request.state.project_id),
+            user_id=UUID(request.state.user_id),
+            #
+            variant_id=testset_variant.id,
+            #
+            revision_slug=testset_revision_slug,
+            #
+            revision_flags=self.TESTCASES_FLAGS,
+            revision_metadata=testset_header.metadata,
+        )
+
+        if testset_revision is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create testset. Please try again or contact support.",
+            )
+
+        testset_revision_slug = uuid4().hex
+
+        testset_revision: Optional[
+            TestsetRevision
+        ] = await self.testsets_service.commit_revision(
+            project_id=UUID(request.state.project_id),
+            user_id=UUID(request.state.user_id),
+            #
+            variant_id=testset_variant.id,
+            #
+            revision_slug=testset_revision_slug,
+            #
+            revision_flags=self.TESTCASES_FLAGS,
+            revision_metadata=testset_header.metadata,
+            revision_data=testset_revision_data,
+        )
+
+        if testset_revision is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create testset. Please try again or contact support.",
+            )
+
+        testset = Testset(
+            id=testset_artifact.id,
+            slug=testset_artifact.slug,
+            #
+            created_at=testset_artifact.created_at,
+            updated_at=testset_artifact.updated_at,
+            deleted_at=testset_artifact.deleted_at,
+            created_by_id=testset_artifact.created_by_id,
+            updated_by_id=testset_artifact.updated_by_id,
+            deleted_by_id=testset_artifact.deleted_by_id,
+            #
+            metadata=testset_artifact.metadata,
+            name=testset_artifact.name,
+            description=testset_artifact.description,
+            revision_id=testset_revision.id,
+            testcases=(
+                testset_revision.data.testcases if testset_revision.data else None
+            ),
+        )
+
+        testset_response = TestsetResponse(
+            count=1,
+            testset=testset,
+        )
+
+        return testset_response
+
+    def _read_testcases_from_file(
+        self,
+        file: UploadFile,
+        file_type: Literal["CSV", "JSON", "JSONL"],
+    ) -> Iterator[Dict[str, Any]]:
+        if file_type == "CSV":
+            rows = csv_file_to_json_rows(file.file)
+        elif file_type == "JSON":
+            rows = json_file_to_json_rows(file.file)
+        else:
+            rows = jsonl_file_to_json_rows(file.file)
+
+        return json_rows_to_testcases(rows)
+
+    async def _validate_file(
+        self,
+        *,
+        file: UploadFile,
+        file_type: Literal["CSV", "JSON", "JSONL"],
+    ) -> None:
+        # A full pass over the upload, keeping nothing, then back to its start
+        try:
+            for _ in self._read_testcases_from_file(file, file_type):
+                pass
+
+        except Exception as e:
+            await file.close()
+
+            if isinstance(e, HTTPException):
+                raise
+
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to read {file_type} file: {e}",
+            ) from e
+
+        await file.seek(0)
+
+    async def _save_testcases_from_file(
+        self,
+        *,
+        request: Request,
+        testset_id: UUID,
+        file: UploadFile,
+        file_type: Literal["CSV", "JSON", "JSONL"],
+    ) -> List[UUID]:
+        # Rows are parsed lazily from the upload stream, limits are enforced as they come,
+        # and testcases are written to blobs chunk by chunk, so memory stays flat.
+        try:
+            testcase_ids = await self.testsets_service.save_testcases_in_chunks(
+                project_id=UUID(request.state.project_id),
+                #
+                testset_id=testset_id,
+                #
+                testcases=self._read_testcases_from_file(file, file_type),
+            )
+
+        except HTTPException:
+            raise
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to read {file_type} file: {e}",
+            ) from e
+
+        finally:
+            # Release the spooled upload whether or not it was fully consumed
+            await file.close()
+
+        if testcase_ids is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save testcases. Please try again or contact support.",
+            )
+
+        return testcase_ids
+
+    @handle_exceptions()
+    async def fetch_testset_to_file(
+        self,
+        *,
+        request: Request,
+        testset_id: Union[UUID, str],
+        file_type: Literal["CSV", "JSON", "JSONL"] = Query(None),
+    ) -> StreamingResponse:
+        if is_ee():
+            if not await check_action_access(
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_TESTSETS,
+            ):
+                raise FORBIDDEN_EXCEPTION
+
+        if file_type is None or file_type not in ["CSV", "JSON", "JSONL"]:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid file type. Supported types are 'CSV', 'JSON' and 'JSONL'.",
+            )
+
+        testset_artifact_ref = Reference(
+            id=testset_id,
+        )
+
+        testset_artifact: Optional[
+            TestsetArtifact
+        ] = await self.testsets_service.fetch_artifact(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ref=testset_artifact_ref,
+        )
+
+        if testset_artifact is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testset_variant: Optional[
+            TestsetVariant
+        ] = await self.testsets_service.fetch_variant(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ref=testset_artifact_ref,
+        )
+
+        if testset_variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testset_variant_ref = Reference(
+            id=testset_variant.id,
+        )
+
+        testset_revision: Optional[
+            TestsetRevision
+        ] = await self.testsets_service.fetch_revision(
+            project_id=UUID(request.state.project_id),
+            #
+            variant_ref=testset_variant_ref,
+            #
+            include_testcases=False,
+        )
+
+        if testset_revision is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        filename = f"testset_{testset_id}.{file_type.lower()}"
+
+        testcase_ids = (
+            testset_revision.data.testcase_ids if testset_revision.data else None
+        ) or []
+
+        columns = None
+
+        if file_type == "CSV":
+            # Columns are discovered up front, server-side, without loading testcases
+            testcase_keys = await self.testsets_service.fetch_testcase_keys(
+                project_id=UUID(request.state.project_id),
+                #
+                testcase_ids=testcase_ids,
+            )
+
+            columns = ["testcase_id"] + [
+                key for key in testcase_keys if key != "testcase_id"
+            ]
+
+        testcases = self.testsets_service.stream_testcases(
+            project_id=UUID(request.state.project_id),
+            #
+            testcase_ids=testcase_ids,
+        )
+
+        return StreamingResponse(
+            testcases_to_file_stream(
+                testcases,
+                file_type=file_type,
+                columns=columns,
+            ),
+            media_type=TESTSETS_MEDIA_TYPES[file_type],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    @handle_exceptions()
+    async def fetch_testset_testcases(
+        self,
+        *,
+        request: Request,
+        testset_id: Union[UUID, str],
+        revision_id: Optional[UUID] = Query(None),
+        offset: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=TESTCASES_PAGE_LIMIT),
+        fields: Optional[List[str]] = Query(None),
+    ) -> TestcasesResponse:
+        if is_ee():
+            if not await check_action_access(
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_TESTSETS,
+            ):
+                raise FORBIDDEN_EXCEPTION
+
+        testset_artifact_ref = Reference(
+            id=testset_id,
+        )
+
+        testset_variant: Optional[
+            TestsetVariant
+        ] = await self.testsets_service.fetch_variant(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ref=testset_artifact_ref,
+        )
+
+        if testset_variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testset_variant_ref = Reference(
+            id=testset_variant.id,
+        )
+
+        testset_revision_ref = Reference(
+            id=revision_id,
+        )
+
+        testset_revision: Optional[
+            TestsetRevision
+        ] = await self.testsets_service.fetch_revision(
+            project_id=UUID(request.state.project_id),
+            #
+            variant_ref=testset_variant_ref if revision_id is None else None,
+            revision_ref=testset_revision_ref if revision_id is not None else None,
+            #
+            include_testcases=False,
+        )
+
+        if (
+            testset_revision is None
+            or testset_revision.variant_id != testset_variant.id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testcase_ids = (
+            testset_revision.data.testcase_ids if testset_revision.data else None
+        ) or []
+
+        # Only the requested window of testcases is loaded, in revision order
+        testcases = await self.testsets_service.fetch_testcases(
+            project_id=UUID(request.state.project_id),
+            #
+            testcase_ids=testcase_ids,
+            #
+            offset=offset,
+            limit=limit,
+            fields=fields,
+        )
+
+        testcases_response = TestcasesResponse(
+            count=len(testcases),
+            testcases=testcases,
+        )
+
+        return testcases_response
+
+    @handle_exceptions()
+    async def sample_testset_testcases(
+        self,
+        *,
+        request: Request,
+        testset_id: Union[UUID, str],
+        revision_id: Optional[UUID] = Query(None),
+        method: SamplingMethod = Query(SamplingMethod.RANDOM),
+        size: int = Query(..., ge=1, le=TESTCASES_PAGE_LIMIT),
+        seed: Optional[int] = Query(None),
+        column: Optional[str] = Query(None),
+    ) -> TestcasesResponse:
+        if is_ee():
+            if not await check_action_access(
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_TESTSETS,
+            ):
+                raise FORBIDDEN_EXCEPTION
+
+        if method == SamplingMethod.STRATIFIED and not column:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Stratified sampling requires a column.",
+            )
+
+        testset_artifact_ref = Reference(
+            id=testset_id,
+        )
+
+        testset_variant: Optional[
+            TestsetVariant
+        ] = await self.testsets_service.fetch_variant(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ref=testset_artifact_ref,
+        )
+
+        if testset_variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testset_variant_ref = Reference(
+            id=testset_variant.id,
+        )
+
+        testset_revision_ref = Reference(
+            id=revision_id,
+        )
+
+        testset_revision: Optional[
+            TestsetRevision
+        ] = await self.testsets_service.fetch_revision(
+            project_id=UUID(request.state.project_id),
+            #
+            variant_ref=testset_variant_ref if revision_id is None else None,
+            revision_ref=testset_revision_ref if revision_id is not None else None,
+            #
+            include_testcases=False,
+        )
+
+        if (
+            testset_revision is None
+            or testset_revision.variant_id != testset_variant.id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        testcase_ids = (
+            testset_revision.data.testcase_ids if testset_revision.data else None
+        ) or []
+
+        # Only the sampled testcases are loaded, in revision order
+        testcases = await self.testsets_service.sample_testcases(
+            project_id=UUID(request.state.project_id),
+            #
+            testcase_ids=testcase_ids,
+            #
+            sampling=TestsetSampling(
+                method=method,
+                size=size,
+                seed=seed,
+                column=column,
+            ),
+        )
+
+        testcases_response = TestcasesResponse(
+            count=len(testcases),
+            testcases=testcases,
+        )
+
+        return testcases_response
+
+    @handle_exceptions()
+    async def diff_testset_revisions(
+        self,
+        *,
+        request: Request,
+        testset_id: Union[UUID, str],
+        base_revision_id: UUID = Query(...),
+        target_revision_id: Optional[UUID] = Query(None),
+        include_testcases: bool = Query(False),
+    ) -> TestsetDiffResponse:
+        if is_ee():
+            if not await check_action_access(
+                user_uid=request.state.user_id,
+                project_id=request.state.project_id,
+                permission=Permission.VIEW_TESTSETS,
+            ):
+                raise FORBIDDEN_EXCEPTION
+
+        testset_artifact_ref = Reference(
+            id=testset_id,
+        )
+
+        testset_variant: Optional[
+            TestsetVariant
+        ] = await self.testsets_service.fetch_variant(
+            project_id=UUID(request.state.project_id),
+            #
+            artifact_ref=testset_artifact_ref,
+        )
+
+        if testset_variant is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Basic testset not found. Please check the ID and try again.",
+            )
+
+        # Without a target revision, the latest revision is diffed against the base one
+        testset_diff = await self.testsets_service.diff_revisions(
+            project_id=UUID(request.state.project_id),
+            #
+            base_revision_ref=Reference(id=base_revision_id),
+            target_revision_ref=(
+                Reference(id=target_revision_id) if target_revision_id else None
+            ),
+            variant_ref=Reference(id=testset_variant.id),
+            #
+            include_testcases=include_testcases,
+        )
+
+        if testset_diff is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Testset revision not found. Please check the IDs and try again.",
+            )
+
+        testset_diff_response = TestsetDiffResponse(
+            count=1,
+            diff=testset_diff,
+        )
+
+        return testset_diff_response
 
     @handle_exceptions()
     async def fetch_testcase(
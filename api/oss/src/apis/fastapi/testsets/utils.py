@@ -1,6 +1,18 @@
-from typing import Optional, List, Dict, Any
-from json import loads, dumps
+from typing import (
+    Optional,
+    List,
+    Dict,
+    Any,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    AsyncIterable,
+    AsyncIterator,
+)
+from json import loads, dumps, JSONDecoder, JSONDecodeError
 from uuid import UUID, uuid4
+from io import TextIOWrapper, StringIO
+from csv import DictReader, DictWriter
 
 import orjson
 import dask
@@ -32,24 +44,51 @@ TESTSETS_COUNT_EXCEPTION = HTTPException(
 )
 
 
-def validate_testset_limits(rows: List[dict]) -> tuple[int, int]:
-    total_size = 2
-    for i, row in enumerate(rows):
-        row_str = dumps(row)
-        total_size += len(row_str.encode("utf-8"))
+TESTCASES_PAGE_LIMIT = 1_000  # testcases per page, at most
+
+TESTSETS_MEDIA_TYPES = {
+    "CSV": "text/csv",
+    "JSON": "application/json",
+    "JSONL": "application/x-ndjson",
+}
+
+TESTSETS_READ_SIZE = 64 * 1024  # characters read from an upload stream at a time
+
+
+class TestsetLimits:
+    """
+    Enforces the testset count and size limits incrementally, one row at a time.
+    The size is that of the rows, encoded as a JSON array.
+    """
 
-        if i > 0:
-            total_size += 1
+    def __init__(self):
+        self.count = 0
+        self.size = 2
 
-        if i + 1 > TESTSETS_COUNT_LIMIT:
+    def add(self, row: dict) -> None:
+        self.size += len(dumps(row).encode("utf-8"))
+
+        if self.count > 0:
+            self.size += 1
+
+        self.count += 1
+
+        if self.count > TESTSETS_COUNT_LIMIT:
             log.error(TESTSETS_COUNT_WARNING)
             raise TESTSETS_COUNT_EXCEPTION
 
-        if total_size > TESTSETS_SIZE_LIMIT:
+        if self.size > TESTSETS_SIZE_LIMIT:
             log.error(TESTSETS_SIZE_WARNING)
             raise TESTSETS_SIZE_EXCEPTION
 
-    return i + 1, total_size
+
+def validate_testset_limits(rows: List[dict]) -> tuple[int, int]:
+    limits = TestsetLimits()
+
+    for row in rows:
+        limits.add(row)
+
+    return limits.count, limits.size
 
 
 def format_validation_error(e, request_body=None):
@@ -377,6 +416,130 @@ def json_file_to_json_array(
         raise e
 
 
+def json_file_to_json_rows(
+    json_file: BinaryIO,
+    read_size: int = TESTSETS_READ_SIZE,
+) -> Iterator[Any]:
+    """
+    Parses a JSON array from a binary stream, one element at a time.
+    Only the current element, and what has been read past it, is held in memory.
+
+    Args:
+        json_file (BinaryIO): Binary stream holding a JSON array.
+        read_size (int, optional): Number of characters to read at a time.
+
+    Yields:
+        Any: The elements of the JSON array, in order.
+    """
+    decoder = JSONDecoder()
+    text = TextIOWrapper(json_file, encoding="utf-8-sig")
+
+    buffer = ""
+    eof = False
+
+    def _read(size: int) -> None:
+        nonlocal buffer, eof
+
+        chunk = text.read(size)
+
+        eof = not chunk
+        buffer += chunk
+
+    def _peek() -> str:
+        nonlocal buffer
+
+        while True:
+            buffer = buffer.lstrip()
+
+            if buffer or eof:
+                return buffer[:1]
+
+            _read(read_size)
+
+    try:
+        if _peek() != "[":
+            raise ValueError("Expected a JSON array.")
+
+        buffer = buffer[1:]
+
+        if _peek() == "]":
+            buffer = buffer[1:]
+
+        else:
+            while True:
+                if not _peek():
+                    raise ValueError("Unexpected end of JSON array.")
+
+                while True:
+                    try:
+                        row, end = decoder.raw_decode(buffer)
+
+                    except JSONDecodeError:
+                        if eof:
+                            raise
+
+                        # Grow geometrically, so that large elements are decoded in linear time
+                        _read(max(read_size, len(buffer)))
+
+                        continue
+
+                    # A value ending with the buffer may be cut short (e.g. a number)
+                    if end == len(buffer) and not eof:
+                        _read(read_size)
+
+                        continue
+
+                    break
+
+                buffer = buffer[end:]
+
+                yield row
+
+                separator = _peek()
+
+                if separator == ",":
+                    buffer = buffer[1:]
+
+                elif separator == "]":
+                    buffer = buffer[1:]
+
+                    break
+
+                else:
+                    raise ValueError("Expected ',' or ']' in JSON array.")
+
+        if _peek():
+            raise ValueError("Unexpected data after JSON array.")
+
+    finally:
+        text.detach()
+
+
+def jsonl_file_to_json_rows(
+    jsonl_file: BinaryIO,
+) -> Iterator[Any]:
+    """
+    Parses JSON Lines from a binary stream, one line at a time. Blank lines are skipped.
+
+    Args:
+        jsonl_file (BinaryIO): Binary stream holding one JSON value per line.
+
+    Yields:
+        Any: The JSON values, in order.
+    """
+    text = TextIOWrapper(jsonl_file, encoding="utf-8-sig")
+
+    try:
+        for line in text:
+            line = line.strip()
+
+            if line:
+                yield orjson.loads(line)
+
+    finally:
+        text.detach()
+
+
 def json_array_to_json_file(
     json_file,
     data,
@@ -488,6 +651,141 @@ def csv_file_to_json_array(
         raise e
 
 
+def csv_file_to_json_rows(
+    csv_file: BinaryIO,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parses a CSV file from a binary stream, one row at a time.
+    The first row holds the column names, and values are kept as strings.
+    Missing values and empty cells are None, as with read_csv().
+
+    Args:
+        csv_file (BinaryIO): Binary stream holding a CSV file.
+
+    Yields:
+        dict: The CSV rows, in order.
+    """
+    text = TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+
+    try:
+        reader = DictReader(text)
+
+        for row in reader:
+            if None in row:
+                raise ValueError(
+                    f"Too many fields in line {reader.line_num}: expected {len(reader.fieldnames)}."
+                )
+
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+
+    finally:
+        text.detach()
+
+
+def json_rows_to_testcases(
+    rows: Iterable[Any],
+    testcase_id_key="testcase_id",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turns parsed rows into testcases, as they come, enforcing the testset limits.
+    - Ignores non-dict rows.
+    - Removes `testcase_id` from the rows.
+
+    Args:
+        rows (Iterable): Parsed rows, e.g. from `csv_file_to_json_rows`.
+        testcase_id_key (str, optional): Key to remove from the rows. Defaults to "testcase_id".
+
+    Yields:
+        dict: The testcases, in order.
+    """
+    limits = TestsetLimits()
+
+    for row in rows:
+        if not isinstance(row, dict):
+            continue  # Ignore non-dict entries
+
+        row.pop(testcase_id_key, None)
+
+        limits.add(row)
+
+        yield row
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+
+    if isinstance(value, str):
+        return value
+
+    return orjson.dumps(value).decode("utf-8")
+
+
+async def testcases_to_file_stream(
+    testcases: AsyncIterable[List[Dict[str, Any]]],
+    file_type: str,
+    columns: Optional[List[str]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encodes batches of testcases as a CSV, JSON (array) or JSONL file, batch by batch.
+    Only one batch is held in memory at a time.
+
+    Args:
+        testcases (AsyncIterable): Batches of testcases, e.g. from a server-side cursor.
+        file_type (str): One of "CSV", "JSON" or "JSONL".
+        columns (list, optional): CSV columns, known up front. Other keys are ignored.
+
+    Yields:
+        bytes: The encoded file, one batch at a time.
+    """
+    if file_type == "CSV":
+        columns = columns or []
+
+        buffer = StringIO()
+        writer = DictWriter(
+            buffer,
+            fieldnames=columns,
+            extrasaction="ignore",
+            lineterminator="\n",
+        )
+
+        writer.writeheader()
+
+        async for batch in testcases:
+            for testcase in batch:
+                writer.writerow({key: _csv_value(testcase.get(key)) for key in columns})
+
+            yield buffer.getvalue().encode("utf-8")
+
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    elif file_type == "JSON":
+        first = True
+
+        async for batch in testcases:
+            if not batch:
+                continue
+
+            yield (b"[\n" if first else b",\n") + b",\n".join(
+                orjson.dumps(testcase) for testcase in batch
+            )
+
+            first = False
+
+        yield b"[]\n" if first else b"\n]\n"
+
+    elif file_type == "JSONL":
+        async for batch in testcases:
+            yield b"".join(orjson.dumps(testcase) + b"\n" for testcase in batch)
+
+    else:
+        raise ValueError(f"Invalid file type: {file_type}")
+
+
 def json_array_to_csv_file(
     json_array,
     output_csv_file,
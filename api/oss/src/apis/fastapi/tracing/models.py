@@ -10,6 +10,8 @@ from oss.src.core.tracing.dtos import (
     OTelFlatSpan,  # needed for annotations at the moment
     OTelFlatSpans,
     OTelTraceTree,
+    OTelTraceSummaries,
+    SpansExport,
 )
 
 
@@ -29,3 +31,14 @@ class OTelTracingResponse(VersionedModel):
     newest: Optional[datetime] = None
     spans: Optional[OTelFlatSpans] = None
     traces: Optional[OTelTraceTree] = None
+
+
+class OTelTraceSummariesResponse(VersionedModel):
+    count: int
+    oldest: Optional[datetime] = None
+    newest: Optional[datetime] = None
+    traces: Optional[OTelTraceSummaries] = None
+
+
+class SpansExportResponse(VersionedModel):
+    export: SpansExport
@@ -2,6 +2,7 @@ from typing import Union, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Request, Depends, status, HTTPException
+from fastapi.responses import StreamingResponse, FileResponse, RedirectResponse
 
 from oss.src.utils.logging import get_module_logger
 from oss.src.apis.fastapi.shared.utils import handle_exceptions
@@ -12,6 +13,7 @@ from oss.src.apis.fastapi.tracing.utils import (
     parse_trace_id_to_uuid,
     parse_spans_from_request,
     parse_spans_into_response,
+    spans_to_ndjson_stream,
 )
 from oss.src.apis.fastapi.tracing.models import (
     OTelLinksResponse,
@@ -19,9 +21,12 @@ from oss.src.apis.fastapi.tracing.models import (
     OTelTracingResponse,
     OTelTracingRequest,
     OTelTracingResponse,
+    OTelTraceSummariesResponse,
+    SpansExportResponse,
 )
 from oss.src.core.tracing.service import TracingService
 from oss.src.core.tracing.utils import FilteringException
+from oss.src.core.tracing.exports import get_export_path
 from oss.src.core.tracing.dtos import (
     OTelLinks,
     OTelSpan,
@@ -31,10 +36,13 @@ from oss.src.core.tracing.dtos import (
     Query,
     Focus,
     Format,
+    ExportStatus,
 )
 
 log = get_module_logger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 class TracingRouter:
     VERSION = "1.0.0"
@@ -89,6 +97,28 @@ class TracingRouter:
             response_model_exclude_none=True,
         )
 
+        ### RPC ON TRACES
+
+        self.router.add_api_route(
+            "/traces/",
+            self.query_traces,
+            methods=["GET"],
+            operation_id="query_traces",
+            status_code=status.HTTP_200_OK,
+            response_model=OTelTraceSummariesResponse,
+            response_model_exclude_none=True,
+        )
+
+        self.router.add_api_route(
+            "/traces/query",
+            self.query_traces,
+            methods=["POST"],
+            operation_id="query_traces_rpc",
+            status_code=status.HTTP_200_OK,
+            response_model=OTelTraceSummariesResponse,
+            response_model_exclude_none=True,
+        )
+
         ### RPC ON SPANS
 
         self.router.add_api_route(
@@ -131,6 +161,36 @@ class TracingRouter:
             response_model_exclude_none=True,
         )
 
+        ### EXPORTS ON SPANS
+
+        self.router.add_api_route(
+            "/spans/export",
+            self.export_spans,
+            methods=["POST"],
+            operation_id="export_spans",
+            status_code=status.HTTP_202_ACCEPTED,
+            response_model=SpansExportResponse,
+            response_model_exclude_none=True,
+        )
+
+        self.router.add_api_route(
+            "/spans/exports/{export_id}",
+            self.fetch_spans_export,
+            methods=["GET"],
+            operation_id="fetch_spans_export",
+            status_code=status.HTTP_200_OK,
+            response_model=SpansExportResponse,
+            response_model_exclude_none=True,
+        )
+
+        self.router.add_api_route(
+            "/spans/exports/{export_id}/file",
+            self.download_spans_export,
+            methods=["GET"],
+            operation_id="download_spans_export",
+            status_code=status.HTTP_200_OK,
+        )
+
     ### HELPERS
 
     async def _upsert(
@@ -385,6 +445,60 @@ class TracingRouter:
 
         return link_response
 
+    ### RPC ON TRACES
+
+    @handle_exceptions()
+    async def query_traces(  # QUERY
+        self,
+        request: Request,
+        query: Optional[Query] = Depends(parse_query_request),
+    ) -> OTelTraceSummariesResponse:
+        body_json = None
+        query_from_body = None
+
+        try:
+            body_json = await request.json()
+
+            if body_json:
+                query_from_body = parse_body_request(**body_json)
+
+        except:  # pylint: disable=bare-except
+            pass
+
+        merged_query = merge_queries(query, query_from_body)
+
+        # Summaries only, spans are fetched with fetch_trace once expanded
+        try:
+            trace_summary_dtos = await self.service.query_traces(
+                project_id=UUID(request.state.project_id),
+                query=merged_query,
+            )
+        except FilteringException as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e),
+            ) from e
+
+        oldest = None
+        newest = None
+
+        for trace in trace_summary_dtos:
+            if oldest is None or trace.start_time < oldest:
+                oldest = trace.start_time
+
+            if newest is None or trace.start_time > newest:
+                newest = trace.start_time
+
+        traces_response = OTelTraceSummariesResponse(
+            version=self.VERSION,
+            count=len(trace_summary_dtos),
+            oldest=oldest,
+            newest=newest,
+            traces=trace_summary_dtos,
+        )
+
+        return traces_response
+
     ### RPC ON SPANS
 
     @handle_exceptions()
@@ -414,7 +528,7 @@ class TracingRouter:
         self,
         request: Request,
         query: Optional[Query] = Depends(parse_query_request),
-    ) -> OTelTracingResponse:
+    ) -> Union[OTelTracingResponse, StreamingResponse]:
         body_json = None
         query_from_body = None
 
@@ -429,6 +543,28 @@ class TracingRouter:
 
         merged_query = merge_queries(query, query_from_body)
 
+        # Spans, or traces, as they are read, without holding them all in memory
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            try:
+                span_batches = self.service.stream(
+                    project_id=UUID(request.state.project_id),
+                    query=merged_query,
+                )
+            except FilteringException as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=str(e),
+                ) from e
+
+            return StreamingResponse(
+                spans_to_ndjson_stream(
+                    span_batches,
+                    focus=merged_query.formatting.focus,
+                    format=merged_query.formatting.format,
+                ),
+                media_type=NDJSON_MEDIA_TYPE,
+            )
+
         try:
             span_dtos = await self.service.query(
                 project_id=UUID(request.state.project_id),
@@ -482,3 +618,96 @@ class TracingRouter:
         )
 
         return spans_response
+
+    ### EXPORTS ON SPANS
+
+    @handle_exceptions()
+    async def export_spans(
+        self,
+        request: Request,
+        query: Optional[Query] = Depends(parse_query_request),
+    ) -> SpansExportResponse:
+        body_json = None
+        query_from_body = None
+
+        try:
+            body_json = await request.json()
+
+            if body_json:
+                query_from_body = parse_body_request(**body_json)
+
+        except:  # pylint: disable=bare-except
+            pass
+
+        merged_query = merge_queries(query, query_from_body)
+
+        # Whole spans, as Parquet, fetched with fetch_spans_export once ready
+        try:
+            export = await self.service.start_export(
+                project_id=UUID(request.state.project_id),
+                query=merged_query,
+            )
+        except FilteringException as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e),
+            ) from e
+
+        return SpansExportResponse(
+            version=self.VERSION,
+            export=export,
+        )
+
+    @handle_exceptions()
+    async def fetch_spans_export(
+        self,
+        request: Request,
+        export_id: UUID,
+    ) -> SpansExportResponse:
+        export = await self.service.fetch_export(
+            project_id=UUID(request.state.project_id),
+            export_id=export_id,
+        )
+
+        if export is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Export not found. It may have expired.",
+            )
+
+        # Served from local disk, unless already signed by object storage
+        if export.status == ExportStatus.READY and export.url is None:
+            export.url = str(
+                request.url_for("download_spans_export", export_id=export_id)
+            )
+
+        return SpansExportResponse(
+            version=self.VERSION,
+            export=export,
+        )
+
+    @handle_exceptions()
+    async def download_spans_export(
+        self,
+        request: Request,
+        export_id: UUID,
+    ) -> Union[FileResponse, RedirectResponse]:
+        export = await self.service.fetch_export(
+            project_id=UUID(request.state.project_id),
+            export_id=export_id,
+        )
+
+        if export is None or export.status != ExportStatus.READY:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Export not found or not ready yet.",
+            )
+
+        if export.url:
+            return RedirectResponse(export.url)
+
+        return FileResponse(
+            get_export_path(UUID(request.state.project_id), export_id),
+            media_type="application/vnd.apache.parquet",
+            filename=f"spans_{export_id}.parquet",
+        )
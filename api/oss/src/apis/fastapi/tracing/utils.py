@@ -1,16 +1,17 @@
-from typing import Optional, Union, Dict
+from typing import Optional, Union, Dict, List, AsyncIterable, AsyncIterator
 from json import loads
 
+import orjson
 from fastapi import Query as _Query
 
 from oss.src.utils.logging import get_module_logger
 
 from oss.src.core.tracing.dtos import (
-    OTelAttributes,
     OTelSpan,
     OTelNestedSpans,
     OTelFlatSpans,
     OTelTraceTree,
+    OTelSpansTree,
     Formatting,
     Windowing,
     Filtering,
@@ -80,10 +81,12 @@ def _parse_filtering(
 def _parse_formatting(
     focus: Optional[Focus] = Focus.TRACE,
     format: Optional[Format] = Format.AGENTA,  # pylint: disable=redefined-builtin
+    fields: Optional[List[str]] = None,
 ) -> Optional[Formatting]:
     _formatting = Formatting(
         focus=focus or Focus.SPAN,
         format=format or Format.AGENTA,
+        fields=fields or None,
     )
 
     return _formatting
@@ -93,6 +96,7 @@ def parse_query_request(
     # GROUPING
     focus: Optional[Focus] = _Query(None),
     format: Optional[Format] = _Query(None),  # pylint: disable=redefined-builtin
+    fields: Optional[List[str]] = _Query(None),
     # WINDOWING
     oldest: Optional[Union[str, int]] = _Query(None),
     newest: Optional[Union[str, int]] = _Query(None),
@@ -103,6 +107,7 @@ def parse_query_request(
     return parse_body_request(
         focus=focus,
         format=format,
+        fields=fields,
         oldest=oldest,
         newest=newest,
         limit=limit,
@@ -114,6 +119,7 @@ def parse_body_request(
     # GROUPING
     focus: Optional[Focus] = None,
     format: Optional[Format] = None,  # pylint: disable=redefined-builtin
+    fields: Optional[List[str]] = None,
     # WINDOWING
     oldest: Optional[Union[str, int]] = None,
     newest: Optional[Union[str, int]] = None,
@@ -123,7 +129,7 @@ def parse_body_request(
 ) -> Query:
     try:
         _query = Query(
-            formatting=_parse_formatting(focus=focus, format=format),
+            formatting=_parse_formatting(focus=focus, format=format, fields=fields),
             windowing=_parse_windowing(oldest=oldest, newest=newest, limit=limit),
             filtering=_parse_filtering(filter=filter),
         )
@@ -149,8 +155,13 @@ def merge_queries(
             query_body.filtering = Filtering()
         return query_body
 
+    formatting = query_param.formatting or query_body.formatting or Formatting()
+
+    if formatting.fields is None and query_body.formatting:
+        formatting.fields = query_body.formatting.fields
+
     return Query(
-        formatting=query_param.formatting or query_body.formatting or Formatting(),
+        formatting=formatting,
         windowing=query_param.windowing or query_body.windowing or Windowing(),
         filtering=query_param.filtering or query_body.filtering or Filtering(),
     )
@@ -250,7 +261,7 @@ def _parse_span_into_response(
     marshall: Optional[bool] = False,
 ) -> Optional[OTelSpan]:
     if not span_dto.attributes:
-        span_dto.attributes = OTelAttributes()
+        span_dto.attributes = {}
 
     # HANDLE IDs (TRACE, SPAN, PARENT, LINKS)
     span_dto.trace_id = parse_trace_id_from_uuid(span_dto.trace_id)
@@ -317,3 +328,76 @@ def parse_spans_into_response(
             spans: OTelFlatSpans = []
 
     return spans if spans else traces
+
+
+async def spans_to_ndjson_stream(
+    span_batches: AsyncIterable[OTelFlatSpans],
+    focus: Focus,
+    format: Format,  # pylint: disable=redefined-builtin
+) -> AsyncIterator[bytes]:
+    """
+    Encodes batches of spans as NDJSON, one span per line or, with focus=trace
+    and format=agenta, one trace (tree of spans) per line.
+    Only one batch, and one trace, is held in memory at a time.
+
+    Args:
+        span_batches (AsyncIterable): Batches of spans, e.g. from a server-side cursor,
+            with the spans of a trace one after the other.
+        focus (Focus): Either "span" or "trace".
+        format (Format): Either "agenta" or "opentelemetry".
+
+    Yields:
+        bytes: The encoded lines, one batch at a time.
+    """
+    if not (format == Format.AGENTA and focus == Focus.TRACE):
+        async for span_dtos in span_batches:
+            spans = parse_spans_into_response(span_dtos, focus=focus, format=format)
+
+            if spans:
+                yield b"".join(
+                    orjson.dumps(span.model_dump(mode="json", exclude_none=True))
+                    + b"\n"
+                    for span in spans
+                )
+
+        return
+
+    def _encode_trace(span_dtos: OTelFlatSpans) -> bytes:
+        traces = parse_spans_into_response(span_dtos, focus=focus, format=format)
+
+        return b"".join(
+            orjson.dumps(
+                {
+                    "trace_id": trace_id,
+                    **OTelSpansTree.model_validate(trace).model_dump(
+                        mode="json",
+                        exclude_none=True,
+                    ),
+                }
+            )
+            + b"\n"
+            for trace_id, trace in (traces or {}).items()
+        )
+
+    trace_spans: OTelFlatSpans = []
+
+    async for span_dtos in span_batches:
+        lines: List[bytes] = []
+
+        for span_dto in span_dtos:
+            # A trace is complete once the next one starts
+            if trace_spans and span_dto.trace_id != trace_spans[0].trace_id:
+                lines.append(_encode_trace(trace_spans))
+
+                trace_spans = []
+
+            trace_spans.append(span_dto)
+
+        if any(lines):
+            yield b"".join(lines)
+
+    # The last trace is complete once the batches run out
+    last = _encode_trace(trace_spans) if trace_spans else b""
+
+    if last:
+        yield last
@@ -757,6 +757,8 @@ class WorkflowsRouter:
                 variant_metadata=_query.metadata,
                 #
                 include_archived=_query.include_archived,
+                #
+                include=_query.include,
             )
 
         variants_response = WorkflowVariantsResponse(
@@ -1063,6 +1065,8 @@ class WorkflowsRouter:
                 revision_metadata=_query.metadata,
                 #
                 include_archived=_query.include_archived,
+                #
+                include=_query.include,
             )
 
         revisions_response = WorkflowRevisionsResponse(
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from json import loads
 
 from fastapi import Query
@@ -101,6 +101,10 @@ def parse_variant_query_request(
         None, description='JSON string of flags, e.g. {"key": value}'
     ),
     include_archived: Optional[bool] = Query(None),
+    include: Optional[List[str]] = Query(
+        None,
+        description='Relations to load along, e.g. "artifact" or "variant.artifact"',
+    ),
 ) -> WorkflowQuery:
     if workflow_ref:
         try:
@@ -142,6 +146,8 @@ def parse_variant_query_request(
         variant_metadata=variant_metadata,
         #
         include_archived=include_archived,
+        #
+        include=include,
     )
 
 
@@ -153,6 +159,8 @@ def parse_variant_body_request(
     variant_metadata: Optional[Tags] = None,
     #
     include_archived: Optional[bool] = None,
+    #
+    include: Optional[List[str]] = None,
 ) -> WorkflowQuery:
     _query = None
 
@@ -165,6 +173,8 @@ def parse_variant_body_request(
             metadata=variant_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
     except Exception as e:  # pylint: disable=broad-except
         log.warn("Error parsing variant body request: %s", e)
@@ -190,6 +200,10 @@ def parse_revision_query_request(
         None, description='JSON string of flags, e.g. {"key": value}'
     ),
     include_archived: Optional[bool] = Query(None),
+    include: Optional[List[str]] = Query(
+        None,
+        description='Relations to load along, e.g. "artifact" or "variant.artifact"',
+    ),
 ) -> WorkflowQuery:
     if variant_ref:
         try:
@@ -231,6 +245,8 @@ def parse_revision_query_request(
         revision_metadata=revision_metadata,
         #
         include_archived=include_archived,
+        #
+        include=include,
     )
 
 
@@ -242,6 +258,8 @@ def parse_revision_body_request(
     revision_metadata: Optional[Tags] = None,
     #
     include_archived: Optional[bool] = None,
+    #
+    include: Optional[List[str]] = None,
 ) -> WorkflowQuery:
     _query = None
 
@@ -254,6 +272,8 @@ def parse_revision_body_request(
             metadata=revision_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
     except Exception as e:  # pylint: disable=broad-except
         log.warn(e)
@@ -282,4 +302,6 @@ def merge_requests(
         metadata=query_body.metadata or query_param.metadata,
         #
         include_archived=query_body.include_archived or query_param.include_archived,
+        #
+        include=query_body.include or query_param.include,
     )
@@ -1,4 +1,4 @@
-from typing import Optional, List, TypeVar, Type
+from typing import Optional, List, Dict, TypeVar, Type, AsyncGenerator
 from uuid import UUID
 from abc import abstractmethod
 
@@ -84,4 +84,38 @@ class BlobDAOInterface:
     ) -> List[Blob]:
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_blobs(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+        #
+        batch_size: int = 1_000,
+    ) -> AsyncGenerator[List[Blob], None]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_blob_keys(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+    ) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_blob_values(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+        #
+        key: str,
+    ) -> Dict[UUID, Optional[str]]:
+        raise NotImplementedError
+
     ## -------------------------------------------------------------------------
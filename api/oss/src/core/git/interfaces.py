@@ -178,10 +178,14 @@ class GitDAOInterface:
         *,
         project_id: UUID,
         #
+        artifact_ids: Optional[List[UUID]] = None,
+        #
         variant_flags: Optional[Flags] = None,
         variant_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[Variant]:
         raise NotImplementedError
 
@@ -292,10 +296,14 @@ class GitDAOInterface:
         *,
         project_id: UUID,
         #
+        variant_ids: Optional[List[UUID]] = None,
+        #
         revision_flags: Optional[Flags] = None,
         revision_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[Revision]:
         raise NotImplementedError
 
@@ -334,4 +342,17 @@ class GitDAOInterface:
     ) -> List[Revision]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def log_variants_revisions(
+        self,
+        *,
+        project_id: UUID,
+        #
+        variant_ids: List[UUID],
+        depth: Optional[int] = None,
+        #
+        include: Optional[List[str]] = None,
+    ) -> List[Revision]:
+        raise NotImplementedError
+
     ## -------------------------------------------------------------------------
@@ -333,6 +333,8 @@ class QueryDTO(BaseModel):
     windowing: Optional[WindowingDTO] = None
     filtering: Optional[FilteringDTO] = None
     pagination: Optional[PaginationDTO] = None
+    # e.g. ["metrics", "data.outputs"], or None for whole nodes
+    fields: Optional[List[str]] = None
 
 
 class AnalyticsDTO(BaseModel):
@@ -83,3 +83,10 @@ class ObservabilityDAOInterface:
         node_ids: List[UUID],
     ) -> None:
         raise NotImplementedError
+
+    async def delete_project(
+        self,
+        *,
+        project_id: UUID,
+    ) -> int:
+        raise NotImplementedError
@@ -16,6 +16,7 @@ from oss.src.core.observability.utils import (
     cumulate_tokens,
     connect_children,
     parse_filtering,
+    parse_fields,
     parse_ingest,
 )
 
@@ -36,6 +37,9 @@ class ObservabilityService:
         if query_dto.filtering:
             parse_filtering(query_dto.filtering)
 
+        if query_dto.fields is not None:
+            parse_fields(query_dto.fields)
+
         span_dtos, count = await self.observability_dao.query(
             project_id=project_id,
             query_dto=query_dto,
@@ -149,3 +153,15 @@ class ObservabilityService:
                 project_id=project_id,
                 node_ids=node_ids,
             )
+
+    async def purge(
+        self,
+        *,
+        project_id: UUID,
+    ) -> int:
+        """
+        Deletes all nodes of a project, one bounded transaction at a time.
+        """
+        return await self.observability_dao.delete_project(
+            project_id=project_id,
+        )
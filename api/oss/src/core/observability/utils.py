@@ -35,6 +35,18 @@ _DATETIME_OPERATORS = _C_OPS + _N_OPS + _S_OPS + _L_OPS + _E_OPS
 _STRING_OPERATORS = _S_OPS + _E_OPS
 
 
+_PROJECTABLE_FIELDS = [
+    "data",
+    "metrics",
+    "meta",
+    "refs",
+    "exception",
+    "links",
+    "otel",
+]
+_PROJECTABLE_KEYS = ["data", "metrics", "meta", "refs"]
+
+
 class FilteringException(Exception):
     pass
 
@@ -139,6 +151,23 @@ def parse_condition(condition: ConditionDTO) -> None:
         pass
 
 
+def parse_fields(
+    fields: List[str],
+) -> None:
+    for field in fields:
+        column, _, key = field.partition(".")
+
+        if column not in _PROJECTABLE_FIELDS:
+            raise FilteringException(
+                f"Unsupported field '{field}', expected one of {_PROJECTABLE_FIELDS}."
+            )
+
+        if key and column not in _PROJECTABLE_KEYS:
+            raise FilteringException(
+                f"Unsupported field '{field}', only {_PROJECTABLE_KEYS} have keys."
+            )
+
+
 def parse_filtering(
     filtering: FilteringDTO,
 ) -> None:
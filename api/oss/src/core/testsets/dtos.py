@@ -1,5 +1,6 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
+from enum import Enum
 
 from pydantic import BaseModel
 
@@ -62,6 +63,31 @@ class TestsetRevision(Revision):
     variant: Optional[TestsetVariant] = None
 
 
+class TestsetRevisionDiff(BaseModel):
+    base_revision_id: Optional[UUID] = None
+    target_revision_id: Optional[UUID] = None
+
+    added_ids: List[UUID] = []
+    removed_ids: List[UUID] = []
+    unchanged_ids: List[UUID] = []
+
+    added: Optional[List[Data]] = None
+    removed: Optional[List[Data]] = None
+
+
+class SamplingMethod(str, Enum):
+    FIRST = "first"
+    RANDOM = "random"
+    STRATIFIED = "stratified"
+
+
+class TestsetSampling(BaseModel):
+    method: SamplingMethod = SamplingMethod.RANDOM
+    size: int
+    seed: Optional[int] = None
+    column: Optional[str] = None  # stratified only
+
+
 class TestsetQuery(BaseModel):
     artifact_ref: Optional[TestsetArtifact] = None
     variant_ref: Optional[TestsetVariant] = None
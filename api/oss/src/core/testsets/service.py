@@ -1,5 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable, AsyncGenerator
 from uuid import UUID
+from random import Random
+from itertools import islice
+from asyncio import to_thread
 
 from oss.src.utils.logging import get_module_logger
 from oss.src.core.git.interfaces import GitDAOInterface
@@ -12,11 +15,17 @@ from oss.src.core.testsets.dtos import (
     TestsetArtifact,
     TestsetVariant,
     TestsetRevision,
+    TestsetRevisionDiff,
+    TestsetSampling,
+    SamplingMethod,
 )
 
 log = get_module_logger(__name__)
 
 
+TESTCASES_CHUNK_SIZE = 1_000  # testcases written to blobs at a time
+
+
 class TestsetsService:
     def __init__(
         self,
@@ -323,18 +332,26 @@ class TestsetsService:
         *,
         project_id: UUID,
         #
+        artifact_ids: Optional[List[UUID]] = None,
+        #
         variant_flags: Optional[TestsetFlags] = None,
         variant_metadata: Optional[Tags] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[TestsetVariant]:
         variants = await self.git_dao.query_variants(
             project_id=project_id,
             #
+            artifact_ids=artifact_ids,
+            #
             variant_flags=(variant_flags.model_dump() if variant_flags else None),
             variant_metadata=variant_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
 
         variants = [TestsetVariant(**variant.model_dump()) for variant in variants]
@@ -444,6 +461,8 @@ class TestsetsService:
         #
         variant_ref: Optional[Reference] = None,
         revision_ref: Optional[Reference] = None,
+        #
+        include_testcases: bool = True,
     ) -> Optional[TestsetRevision]:
         revision = await self.git_dao.fetch_revision(
             project_id=project_id,
@@ -455,21 +474,16 @@ class TestsetsService:
         if not revision:
             return None
 
-        if revision.data:
-            testcase_ids = revision.data.get("testcase_ids")
-
-            testcases = await self.load_testcases(
-                project_id=project_id,
-                #
-                testcase_ids=testcase_ids,
-            )
-
-            revision.data = TestsetData(
-                testcases=testcases,
-            )
-
         revision = TestsetRevision(**revision.model_dump())
 
+        revision = await self._load_revision_testcases(
+            project_id=project_id,
+            #
+            revision=revision,
+            #
+            include_testcases=include_testcases,
+        )
+
         return revision
 
     async def edit_revision(
@@ -553,35 +567,38 @@ class TestsetsService:
         *,
         project_id: UUID,
         #
+        variant_ids: Optional[List[UUID]] = None,
+        #
         revision_flags: Optional[TestsetFlags] = None,
         revision_metadata: Optional[Tags] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
+        include_testcases: bool = True,
     ) -> List[TestsetRevision]:
         revisions = await self.git_dao.query_revisions(
             project_id=project_id,
             #
+            variant_ids=variant_ids,
             #
             revision_flags=(revision_flags.model_dump() if revision_flags else None),
             revision_metadata=revision_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
 
         revisions = [TestsetRevision(**revision.model_dump()) for revision in revisions]
 
-        for revision in revisions:
-            if revision.data:
-                testcase_ids = revision.data.get("testcase_ids")
-
-                testcases = await self.load_testcases(
-                    project_id=project_id,
-                    #
-                    testcase_ids=testcase_ids,
-                )
-                revision.data = TestsetData(
-                    testcases=testcases,
-                )
+        await self._load_revisions_testcases(
+            project_id=project_id,
+            #
+            revisions=revisions,
+            #
+            include_testcases=include_testcases,
+        )
 
         return revisions
 
@@ -604,6 +621,8 @@ class TestsetsService:
         revision_description: Optional[str] = None,
         revision_message: Optional[str] = None,
         revision_data: Optional[TestsetData] = None,
+        #
+        include_testcases: bool = True,
     ) -> Optional[TestsetRevision]:
         variant = await self.git_dao.fetch_variant(
             project_id=project_id,
@@ -631,6 +650,12 @@ class TestsetsService:
                 testcase_ids=testcase_ids,
             )
 
+        elif revision_data and revision_data.testcase_ids:
+            # Testcases already saved, e.g. with save_testcases_in_chunks()
+            testset_data = TestsetData(
+                testcase_ids=revision_data.testcase_ids,
+            )
+
         revision = await self.git_dao.commit_revision(
             project_id=project_id,
             user_id=user_id,
@@ -651,21 +676,16 @@ class TestsetsService:
         if not revision:
             return None
 
-        if revision.data:
-            testcase_ids = revision.data.get("testcase_ids")
-
-            testcases = await self.load_testcases(
-                project_id=project_id,
-                #
-                testcase_ids=testcase_ids,
-            )
-
-            revision.data = TestsetData(
-                testcases=testcases,
-            )
-
         revision = TestsetRevision(**revision.model_dump())
 
+        revision = await self._load_revision_testcases(
+            project_id=project_id,
+            #
+            revision=revision,
+            #
+            include_testcases=include_testcases,
+        )
+
         return revision
 
     async def log_revisions(
@@ -676,6 +696,8 @@ class TestsetsService:
         variant_ref: Optional[Reference] = None,
         revision_ref: Optional[Reference] = None,
         depth: Optional[int] = None,
+        #
+        include_testcases: bool = True,
     ) -> List[TestsetRevision]:
         revisions = await self.git_dao.log_revisions(
             project_id=project_id,
@@ -687,25 +709,203 @@ class TestsetsService:
 
         revisions = [TestsetRevision(**revision.model_dump()) for revision in revisions]
 
-        for revision in revisions:
-            if revision.data:
-                testcase_ids = revision.data.get("testcase_ids")
+        await self._load_revisions_testcases(
+            project_id=project_id,
+            #
+            revisions=revisions,
+            #
+            include_testcases=include_testcases,
+        )
+
+        return revisions
+
+    async def log_variants_revisions(
+        self,
+        *,
+        project_id: UUID,
+        #
+        variant_ids: List[UUID],
+        depth: Optional[int] = None,
+        #
+        include: Optional[List[str]] = None,
+        include_testcases: bool = False,
+    ) -> List[TestsetRevision]:
+        revisions = await self.git_dao.log_variants_revisions(
+            project_id=project_id,
+            #
+            variant_ids=variant_ids,
+            depth=depth,
+            #
+            include=include,
+        )
+
+        revisions = [TestsetRevision(**revision.model_dump()) for revision in revisions]
 
-                testcases = await self.load_testcases(
-                    project_id=project_id,
-                    #
-                    testcase_ids=testcase_ids,
-                )
-                revision.data = TestsetData(
-                    testcases=testcases,
-                )
+        await self._load_revisions_testcases(
+            project_id=project_id,
+            #
+            revisions=revisions,
+            #
+            include_testcases=include_testcases,
+        )
 
         return revisions
 
+    async def diff_revisions(
+        self,
+        *,
+        project_id: UUID,
+        #
+        base_revision_ref: Reference,
+        target_revision_ref: Optional[Reference] = None,
+        variant_ref: Optional[Reference] = None,
+        #
+        include_testcases: bool = False,
+    ) -> Optional[TestsetRevisionDiff]:
+        """
+        Diffs two revisions by their testcase ids. Testcase ids are content-addressed,
+        so an edited testcase shows up as removed (old content) and added (new content).
+        Ids are ordered as in the target revision (added, unchanged) or the base one (removed).
+        The target defaults to the latest revision of the variant. Given a variant,
+        both revisions must belong to it.
+        """
+        base_revision = await self.fetch_revision(
+            project_id=project_id,
+            #
+            revision_ref=base_revision_ref,
+            #
+            include_testcases=False,
+        )
+
+        target_revision = await self.fetch_revision(
+            project_id=project_id,
+            #
+            variant_ref=variant_ref if not target_revision_ref else None,
+            revision_ref=target_revision_ref,
+            #
+            include_testcases=False,
+        )
+
+        if not base_revision or not target_revision:
+            return None
+
+        if variant_ref and variant_ref.id:
+            if (
+                base_revision.variant_id != variant_ref.id
+                or target_revision.variant_id != variant_ref.id
+            ):
+                return None
+
+        base_ids = (
+            base_revision.data.testcase_ids if base_revision.data else None
+        ) or []
+        target_ids = (
+            target_revision.data.testcase_ids if target_revision.data else None
+        ) or []
+
+        base_set = set(base_ids)
+        target_set = set(target_ids)
+
+        diff = TestsetRevisionDiff(
+            base_revision_id=base_revision.id,
+            target_revision_id=target_revision.id,
+            #
+            added_ids=[_id for _id in target_ids if _id not in base_set],
+            removed_ids=[_id for _id in base_ids if _id not in target_set],
+            unchanged_ids=[_id for _id in target_ids if _id in base_set],
+        )
+
+        if include_testcases:
+            diff.added = await self.load_testcases(
+                project_id=project_id,
+                #
+                testcase_ids=diff.added_ids,
+            )
+
+            diff.removed = await self.load_testcases(
+                project_id=project_id,
+                #
+                testcase_ids=diff.removed_ids,
+            )
+
+        return diff
+
     ## -------------------------------------------------------------------------
 
     ## -- testcases ------------------------------------------------------------
 
+    async def _load_revision_testcases(
+        self,
+        *,
+        project_id: UUID,
+        #
+        revision: TestsetRevision,
+        #
+        include_testcases: bool = True,
+    ) -> TestsetRevision:
+        # Without testcases, data holds the testcase ids only
+        if not revision.data or not include_testcases:
+            return revision
+
+        testcases = await self.load_testcases(
+            project_id=project_id,
+            #
+            testcase_ids=revision.data.testcase_ids or [],
+        )
+
+        revision.data = TestsetData(
+            testcases=testcases,
+        )
+
+        return revision
+
+    async def _load_revisions_testcases(
+        self,
+        *,
+        project_id: UUID,
+        #
+        revisions: List[TestsetRevision],
+        #
+        include_testcases: bool = True,
+    ) -> List[TestsetRevision]:
+        # Testcases shared across revisions are loaded once, in a single pass
+        if not include_testcases:
+            return revisions
+
+        loaded = [revision for revision in revisions if revision.data]
+
+        testcase_ids = list(
+            {
+                testcase_id
+                for revision in loaded
+                for testcase_id in revision.data.testcase_ids or []
+            }
+        )
+
+        testcases = (
+            await self.load_testcases(
+                project_id=project_id,
+                #
+                testcase_ids=testcase_ids,
+            )
+            if testcase_ids
+            else []
+        )
+
+        testcases_by_id = {testcase["testcase_id"]: testcase for testcase in testcases}
+
+        for revision in loaded:
+            testcases = [
+                testcases_by_id.get(str(testcase_id))
+                for testcase_id in revision.data.testcase_ids or []
+            ]
+
+            revision.data = TestsetData(
+                testcases=[testcase for testcase in testcases if testcase is not None],
+            )
+
+        return revisions
+
     async def save_testcases(
         self,
         *,
@@ -736,6 +936,53 @@ class TestsetsService:
 
         return testcase_ids
 
+    async def save_testcases_in_chunks(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testset_id: UUID,
+        #
+        testcases: Iterable[Data],
+        #
+        chunk_size: int = TESTCASES_CHUNK_SIZE,
+    ) -> Optional[List[UUID]]:
+        """
+        Saves testcases from a (possibly lazy) iterable, chunk by chunk,
+        so that at most one chunk of testcases is held in memory.
+        The iterable is consumed off the event loop, as it may parse a file.
+        Returns the testcase ids, in order and without duplicates,
+        or None if a chunk could not be saved.
+        """
+        testcases = iter(testcases)
+
+        testcase_ids: List[UUID] = []
+        seen_ids = set()
+
+        while True:
+            chunk = await to_thread(lambda: list(islice(testcases, chunk_size)))
+
+            if not chunk:
+                break
+
+            chunk_ids = await self.save_testcases(
+                project_id=project_id,
+                #
+                testset_id=testset_id,
+                #
+                testcases=chunk,
+            )
+
+            if not chunk_ids:
+                return None
+
+            for testcase_id in chunk_ids:
+                if testcase_id not in seen_ids:
+                    seen_ids.add(testcase_id)
+                    testcase_ids.append(testcase_id)
+
+        return testcase_ids
+
     async def load_testcases(
         self,
         *,
@@ -743,23 +990,194 @@ class TestsetsService:
         #
         testcase_ids: List[UUID],
     ) -> List[Data]:
-        testcase_blobs = await self.blobs_dao.fetch_blobs(
+        """
+        Loads testcases, in testcase_ids order.
+        """
+        testcases: List[Data] = []
+
+        async for batch in self.stream_testcases(
+            project_id=project_id,
+            #
+            testcase_ids=testcase_ids,
+        ):
+            testcases.extend(batch)
+
+        return testcases
+
+    async def fetch_testcases(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testcase_ids: List[UUID],
+        #
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Data]:
+        """
+        Loads a window of testcases, by position in testcase_ids,
+        keeping only the given fields (and testcase_id), if any.
+        """
+        window = testcase_ids[offset : offset + limit if limit is not None else None]
+
+        testcases = await self.load_testcases(
+            project_id=project_id,
+            #
+            testcase_ids=window,
+        )
+
+        if fields:
+            fields = {"testcase_id", *fields}
+
+            testcases = [
+                {key: value for key, value in testcase.items() if key in fields}
+                for testcase in testcases
+            ]
+
+        return testcases
+
+    async def sample_testcase_ids(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testcase_ids: List[UUID],
+        #
+        sampling: TestsetSampling,
+    ) -> List[UUID]:
+        """
+        Samples testcase ids, in testcase_ids order, without loading the testcases.
+        Stratified sampling reads the sampling column only, and allocates the
+        sample across its values in proportion to their frequency.
+        """
+        size = max(sampling.size, 0)
+
+        if size >= len(testcase_ids):
+            return list(testcase_ids)
+
+        if sampling.method == SamplingMethod.FIRST:
+            return list(testcase_ids[:size])
+
+        rng = Random(sampling.seed)
+
+        if sampling.method == SamplingMethod.RANDOM:
+            positions = rng.sample(range(len(testcase_ids)), size)
+
+            return [testcase_ids[position] for position in sorted(positions)]
+
+        if not sampling.column:
+            raise ValueError("Stratified sampling requires a column.")
+
+        values = await self.blobs_dao.fetch_blob_values(
             project_id=project_id,
             #
             blob_ids=testcase_ids,
+            #
+            key=sampling.column,
         )
 
-        if not testcase_blobs:
-            return []
+        strata: Dict[Optional[str], List[int]] = {}
 
-        testcases = [
-            {
-                "testcase_id": str(testcase_blob.id),
-                **testcase_blob.data,
-            }
-            for testcase_blob in testcase_blobs
+        for position, testcase_id in enumerate(testcase_ids):
+            strata.setdefault(values.get(testcase_id), []).append(position)
+
+        # Largest remainder, so that the sizes of the strata add up to size
+        quotas = {
+            value: size * len(positions) / len(testcase_ids)
+            for value, positions in strata.items()
+        }
+        sizes = {value: int(quota) for value, quota in quotas.items()}
+
+        remainders = sorted(
+            quotas,
+            key=lambda value: quotas[value] - sizes[value],
+            reverse=True,
+        )
+
+        for value in remainders[: size - sum(sizes.values())]:
+            sizes[value] += 1
+
+        positions = [
+            position
+            for value, stratum in strata.items()
+            for position in rng.sample(stratum, sizes[value])
         ]
 
+        return [testcase_ids[position] for position in sorted(positions)]
+
+    async def sample_testcases(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testcase_ids: List[UUID],
+        #
+        sampling: TestsetSampling,
+    ) -> List[Data]:
+        """
+        Loads a sample of testcases, in testcase_ids order, e.g. as the
+        testset_data of a batch invocation.
+        """
+        sampled_ids = await self.sample_testcase_ids(
+            project_id=project_id,
+            #
+            testcase_ids=testcase_ids,
+            #
+            sampling=sampling,
+        )
+
+        testcases = await self.load_testcases(
+            project_id=project_id,
+            #
+            testcase_ids=sampled_ids,
+        )
+
         return testcases
 
+    async def stream_testcases(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testcase_ids: List[UUID],
+        #
+        batch_size: int = TESTCASES_CHUNK_SIZE,
+    ) -> AsyncGenerator[List[Data], None]:
+        """
+        Streams testcases in batches, in testcase_ids order, from a server-side cursor.
+        """
+        async for testcase_blobs in self.blobs_dao.stream_blobs(
+            project_id=project_id,
+            #
+            blob_ids=testcase_ids,
+            #
+            batch_size=batch_size,
+        ):
+            yield [
+                {
+                    "testcase_id": str(testcase_blob.id),
+                    **(testcase_blob.data or {}),
+                }
+                for testcase_blob in testcase_blobs
+            ]
+
+    async def fetch_testcase_keys(
+        self,
+        *,
+        project_id: UUID,
+        #
+        testcase_ids: List[UUID],
+    ) -> List[str]:
+        """
+        Returns the keys used across testcases, in order of first appearance.
+        """
+        keys = await self.blobs_dao.fetch_blob_keys(
+            project_id=project_id,
+            #
+            blob_ids=testcase_ids,
+        )
+
+        return keys or []
+
     ## -------------------------------------------------------------------------
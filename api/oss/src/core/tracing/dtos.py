@@ -68,13 +68,9 @@ class OTelEvent(BaseModel):
         return data
 
     def model_dump(self, *args, **kwargs) -> dict:
-        return self.encode(
-            super().model_dump(
-                *args,
-                **kwargs,
-                exclude_none=True,
-            )
-        )
+        kwargs.setdefault("exclude_none", True)
+
+        return self.encode(super().model_dump(*args, **kwargs))
 
 
 OTelEvents = List[OTelEvent]
@@ -108,13 +104,9 @@ class OTelLink(TraceID, SpanID):
         return data
 
     def model_dump(self, *args, **kwargs) -> dict:
-        return self.encode(
-            super().model_dump(
-                *args,
-                **kwargs,
-                exclude_none=True,
-            )
-        )
+        kwargs.setdefault("exclude_none", True)
+
+        return self.encode(super().model_dump(*args, **kwargs))
 
 
 OTelLinks = List[OTelLink]
@@ -168,13 +160,9 @@ class OTelFlatSpan(Lifecycle):
         return data
 
     def model_dump(self, *args, **kwargs) -> dict:
-        return self.encode(
-            super().model_dump(
-                *args,
-                **kwargs,
-                exclude_none=True,
-            )
-        )
+        kwargs.setdefault("exclude_none", True)
+
+        return self.encode(super().model_dump(*args, **kwargs))
 
     @model_validator(mode="after")
     def set_defaults(self):
@@ -207,6 +195,49 @@ OTelTraceTree = Dict[str, OTelSpansTree]
 OTelTraceTrees = List[OTelTraceTree]
 OTelSpans = List[OTelSpan]
 
+
+class OTelTraceSummary(BaseModel):
+    trace_id: str
+    span_id: str  # of the root span
+
+    span_kind: OTelSpanKind
+    span_name: str
+
+    start_time: datetime
+    end_time: datetime
+
+    status_code: OTelStatusCode
+    status_message: Optional[str] = None
+
+    attributes: Optional[OTelAttributes] = None
+
+    span_count: int
+    has_errors: bool
+
+    costs: Optional[float] = None
+    tokens: Optional[float] = None
+
+    references: Optional[List[Dict[str, Any]]] = None
+
+
+OTelTraceSummaries = List[OTelTraceSummary]
+
+
+class ExportStatus(str, Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class SpansExport(BaseModel):
+    export_id: UUID
+    status: ExportStatus
+    url: Optional[str] = None
+    count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+
 ## --- QUERY --- ##
 
 
@@ -224,6 +255,7 @@ class Fields(str, Enum):
     EVENTS = "events"
     LINKS = "links"
     REFERENCES = "references"
+    CONTENT = "content"
     CREATED_AT = "created_at"
     UPDATED_AT = "updated_at"
     DELETED_AT = "deleted_at"
@@ -278,6 +310,10 @@ class ExistenceOperator(str, Enum):
     NOT_EXISTS = "not_exists"
 
 
+class SearchOperator(str, Enum):
+    SEARCH = "search"
+
+
 class TextOptions(BaseModel):
     case_sensitive: Optional[bool] = False
     exact_match: Optional[bool] = False
@@ -299,6 +335,7 @@ class Condition(BaseModel):
             ListOperator,
             DictOperator,
             ExistenceOperator,
+            SearchOperator,
         ]
     ] = ComparisonOperator.IS
     options: Optional[Union[TextOptions, ListOptions]] = None
@@ -328,6 +365,8 @@ class Windowing(BaseModel):
 class Formatting(BaseModel):
     focus: Optional[Focus] = Focus.SPAN
     format: Optional[Format] = Format.AGENTA
+    # e.g. ["status_message", "attributes.ag.metrics"], or None for whole spans
+    fields: Optional[List[str]] = None
 
 
 class Query(BaseModel):
@@ -342,6 +381,7 @@ _S_OPS = list(StringOperator)
 _L_OPS = list(ListOperator)
 _D_OPS = list(DictOperator)
 _E_OPS = list(ExistenceOperator)
+_F_OPS = list(SearchOperator)
 
 
 class FilteringException(Exception):
@@ -0,0 +1,349 @@
+import os
+from asyncio import to_thread
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import orjson
+import aioboto3
+
+from oss.src.core.tracing.dtos import OTelFlatSpans, SpansExport
+from oss.src.core.tracing.utils import (
+    parse_trace_id_from_uuid,
+    parse_span_id_from_uuid,
+)
+
+# Exports are written to disk, then moved to object storage if a bucket is set.
+# Without a bucket, an export is only visible to the instances sharing that disk.
+TRACING_EXPORTS_DIR = os.environ.get(
+    "AGENTA_TRACING_EXPORTS_DIR", "/tmp/agenta/exports"
+)
+TRACING_EXPORTS_BUCKET = os.environ.get("AGENTA_TRACING_EXPORTS_BUCKET")
+TRACING_EXPORTS_URL_EXPIRATION = int(
+    os.environ.get("AGENTA_TRACING_EXPORTS_URL_EXPIRATION", "3600")
+)  # seconds
+TRACING_EXPORTS_TTL = int(
+    os.environ.get("AGENTA_TRACING_EXPORTS_TTL", "86400")
+)  # seconds, before exports are deleted
+TRACING_EXPORTS_TIMEOUT = int(
+    os.environ.get("AGENTA_TRACING_EXPORTS_TIMEOUT", "3600")
+)  # seconds, before pending exports are deemed failed (e.g. after a restart)
+
+EXPORT_BATCH_SIZE = 10_000  # spans per row group
+
+# Unit metrics of each span, as typed columns
+EXPORT_METRICS_PATHS = {
+    "costs": ("metrics", "unit", "costs", "total"),
+    "prompt_tokens": ("metrics", "unit", "tokens", "prompt"),
+    "completion_tokens": ("metrics", "unit", "tokens", "completion"),
+    "total_tokens": ("metrics", "unit", "tokens", "total"),
+}
+
+
+@lru_cache(maxsize=1)
+def get_spans_schema():
+    # pyarrow is only imported when exporting, so that the API boots without it
+    import pyarrow as pa
+
+    reference_type = pa.struct(
+        [
+            ("id", pa.string()),
+            ("slug", pa.string()),
+            ("version", pa.string()),
+            ("attributes", pa.string()),  # JSON
+        ]
+    )
+
+    return pa.schema(
+        [
+            ("trace_id", pa.string()),
+            ("span_id", pa.string()),
+            ("parent_id", pa.string()),
+            ("span_kind", pa.string()),
+            ("span_name", pa.string()),
+            ("start_time", pa.timestamp("us", tz="UTC")),
+            ("end_time", pa.timestamp("us", tz="UTC")),
+            ("duration_ms", pa.float64()),
+            ("status_code", pa.string()),
+            ("status_message", pa.string()),
+            *((name, pa.float64()) for name in EXPORT_METRICS_PATHS),
+            ("references", pa.list_(reference_type)),
+            ("attributes", pa.string()),  # JSON, without the references
+        ]
+    )
+
+
+def _metric(
+    attributes: Dict[str, Any],
+    path: Tuple[str, ...],
+) -> Optional[float]:
+    for namespace in ("ag", "agenta"):
+        value: Any = attributes.get(namespace)
+
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+
+    return None
+
+
+def _json(
+    value: Any,
+) -> Optional[str]:
+    return orjson.dumps(value, default=str).decode("utf-8") if value else None
+
+
+def map_spans_to_record_batch(
+    span_dtos: OTelFlatSpans,
+) -> "pyarrow.RecordBatch":
+    import pyarrow as pa
+
+    schema = get_spans_schema()
+
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+
+    for span_dto in span_dtos:
+        attributes = dict(span_dto.attributes or {})
+
+        references = None
+
+        if isinstance(attributes.get("agenta"), dict):
+            attributes["agenta"] = dict(attributes["agenta"])
+            references = attributes["agenta"].pop("references", None)
+
+            if not attributes["agenta"]:
+                del attributes["agenta"]
+
+        columns["trace_id"].append(parse_trace_id_from_uuid(span_dto.trace_id))
+        columns["span_id"].append(parse_span_id_from_uuid(span_dto.span_id))
+        columns["parent_id"].append(
+            parse_span_id_from_uuid(span_dto.parent_id) if span_dto.parent_id else None
+        )
+        columns["span_kind"].append(span_dto.span_kind.value)
+        columns["span_name"].append(span_dto.span_name)
+        columns["start_time"].append(span_dto.start_time)
+        columns["end_time"].append(span_dto.end_time)
+        columns["duration_ms"].append(
+            (span_dto.end_time - span_dto.start_time).total_seconds() * 1_000
+        )
+        columns["status_code"].append(span_dto.status_code.value)
+        columns["status_message"].append(span_dto.status_message)
+
+        for name, path in EXPORT_METRICS_PATHS.items():
+            columns[name].append(_metric(attributes, path))
+
+        columns["references"].append(
+            [
+                {
+                    "id": str(reference["id"]) if reference.get("id") else None,
+                    "slug": reference.get("slug"),
+                    "version": reference.get("version"),
+                    "attributes": _json(reference.get("attributes")),
+                }
+                for reference in references
+                if isinstance(reference, dict)
+            ]
+            if isinstance(references, list)
+            else None
+        )
+        columns["attributes"].append(_json(attributes))
+
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+async def write_spans_to_parquet(
+    span_batches: AsyncIterable[OTelFlatSpans],
+    path: str,
+) -> int:
+    """
+    Writes batches of spans to a Parquet file, one row group per batch.
+    Only one batch is held in memory at a time.
+
+    Args:
+        span_batches (AsyncIterable): Batches of spans, e.g. from a server-side cursor.
+        path (str): The file to write.
+
+    Returns:
+        int: The number of spans written.
+    """
+    import pyarrow.parquet as pq
+
+    count = 0
+
+    with pq.ParquetWriter(path, get_spans_schema(), compression="zstd") as writer:
+        async for span_dtos in span_batches:
+            if not span_dtos:
+                continue
+
+            record_batch = await to_thread(map_spans_to_record_batch, span_dtos)
+
+            await to_thread(writer.write_batch, record_batch)
+
+            count += len(span_dtos)
+
+    return count
+
+
+# STORAGE
+# Each export is a Parquet file and a JSON manifest holding its status, side by
+# side, on disk or in object storage.
+
+
+def get_export_path(
+    project_id: UUID,
+    export_id: UUID,
+) -> str:
+    return os.path.join(TRACING_EXPORTS_DIR, str(project_id), f"{export_id}.parquet")
+
+
+def get_export_key(
+    project_id: UUID,
+    export_id: UUID,
+) -> str:
+    return f"tracing/exports/{project_id}/{export_id}.parquet"
+
+
+def _get_manifest_path(
+    project_id: UUID,
+    export_id: UUID,
+) -> str:
+    return os.path.join(TRACING_EXPORTS_DIR, str(project_id), f"{export_id}.json")
+
+
+def _get_manifest_key(
+    project_id: UUID,
+    export_id: UUID,
+) -> str:
+    return f"tracing/exports/{project_id}/{export_id}.json"
+
+
+async def put_manifest(
+    project_id: UUID,
+    export: SpansExport,
+) -> None:
+    manifest = export.model_dump_json(exclude={"url"}).encode("utf-8")
+
+    if TRACING_EXPORTS_BUCKET:
+        async with aioboto3.Session().client("s3") as s3:
+            await s3.put_object(
+                Bucket=TRACING_EXPORTS_BUCKET,
+                Key=_get_manifest_key(project_id, export.export_id),
+                Body=manifest,
+                ContentType="application/json",
+            )
+
+        return
+
+    path = _get_manifest_path(project_id, export.export_id)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Written aside, then moved, so that readers never see a partial manifest
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(manifest)
+
+    os.replace(f"{path}.tmp", path)
+
+
+async def fetch_manifest(
+    project_id: UUID,
+    export_id: UUID,
+) -> Optional[SpansExport]:
+    if TRACING_EXPORTS_BUCKET:
+        async with aioboto3.Session().client("s3") as s3:
+            try:
+                response = await s3.get_object(
+                    Bucket=TRACING_EXPORTS_BUCKET,
+                    Key=_get_manifest_key(project_id, export_id),
+                )
+            except s3.exceptions.NoSuchKey:
+                return None
+
+            manifest = await response["Body"].read()
+
+    else:
+        try:
+            with open(_get_manifest_path(project_id, export_id), "rb") as f:
+                manifest = f.read()
+        except FileNotFoundError:
+            return None
+
+    return SpansExport.model_validate_json(manifest)
+
+
+async def upload_export(
+    path: str,
+    key: str,
+) -> None:
+    async with aioboto3.Session().client("s3") as s3:
+        await s3.upload_file(path, TRACING_EXPORTS_BUCKET, key)
+
+
+async def fetch_export_url(
+    key: str,
+) -> Optional[str]:
+    async with aioboto3.Session().client("s3") as s3:
+        try:
+            await s3.head_object(Bucket=TRACING_EXPORTS_BUCKET, Key=key)
+        except s3.exceptions.ClientError:
+            return None
+
+        return await s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": TRACING_EXPORTS_BUCKET, "Key": key},
+            ExpiresIn=TRACING_EXPORTS_URL_EXPIRATION,
+        )
+
+
+async def purge_exports(
+    project_id: UUID,
+    now: Optional[datetime] = None,
+    ttl: int = TRACING_EXPORTS_TTL,
+) -> int:
+    """
+    Deletes the files and manifests of a project's exports last written more than
+    ttl seconds ago, and returns how many files were deleted.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=ttl)
+
+    count = 0
+
+    if TRACING_EXPORTS_BUCKET:
+        async with aioboto3.Session().client("s3") as s3:
+            paginator = s3.get_paginator("list_objects_v2")
+
+            async for page in paginator.paginate(
+                Bucket=TRACING_EXPORTS_BUCKET,
+                Prefix=f"tracing/exports/{project_id}/",
+            ):
+                keys = [
+                    {"Key": item["Key"]}
+                    for item in page.get("Contents", [])
+                    if item["LastModified"] < cutoff
+                ]
+
+                if keys:
+                    await s3.delete_objects(
+                        Bucket=TRACING_EXPORTS_BUCKET,
+                        Delete={"Objects": keys, "Quiet": True},
+                    )
+
+                    count += len(keys)
+
+    # Files are also left on disk by exports still being written, or uploaded
+    directory = os.path.join(TRACING_EXPORTS_DIR, str(project_id))
+
+    if os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            modified = datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc)
+
+            if entry.is_file() and modified < cutoff:
+                os.remove(entry.path)
+
+                count += 1
+
+    return count
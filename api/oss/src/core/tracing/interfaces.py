@@ -1,11 +1,12 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, AsyncGenerator
 
 from oss.src.core.tracing.dtos import (
     OTelLink,
     OTelLinks,
     OTelFlatSpan,
     OTelFlatSpans,
+    OTelTraceSummaries,
     Query,
 )
 
@@ -122,6 +123,15 @@ class TracingDAOInterface:
     ) -> Optional[OTelLinks]:
         raise NotImplementedError
 
+    ### Purge on projects
+
+    async def delete_project(
+        self,
+        *,
+        project_id: UUID,
+    ) -> int:
+        raise NotImplementedError
+
     ### RPC
 
     async def query(
@@ -131,3 +141,20 @@ class TracingDAOInterface:
         query: Query,
     ) -> Optional[OTelFlatSpans]:
         raise NotImplementedError
+
+    def stream(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+        batch_size: int = 1_000,
+    ) -> AsyncGenerator[OTelFlatSpans, None]:
+        raise NotImplementedError
+
+    async def query_traces(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+    ) -> Optional[OTelTraceSummaries]:
+        raise NotImplementedError
@@ -1,5 +1,8 @@
-from uuid import UUID
-from typing import List, Optional
+import os
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, AsyncGenerator
+from asyncio import Task, create_task
 
 from oss.src.utils.logging import get_module_logger
 
@@ -9,12 +12,31 @@ from oss.src.core.tracing.dtos import (
     OTelLinks,
     OTelFlatSpan,
     OTelFlatSpans,
+    OTelTraceSummaries,
+    SpansExport,
+    ExportStatus,
+    Formatting,
+    Focus,
     Query,
 )
 from oss.src.core.tracing.utils import (
     parse_query,
     parse_ingest,
 )
+from oss.src.core.tracing.exports import (
+    TRACING_EXPORTS_BUCKET,
+    TRACING_EXPORTS_TTL,
+    TRACING_EXPORTS_TIMEOUT,
+    EXPORT_BATCH_SIZE,
+    write_spans_to_parquet,
+    get_export_path,
+    get_export_key,
+    put_manifest,
+    fetch_manifest,
+    upload_export,
+    fetch_export_url,
+    purge_exports,
+)
 
 log = get_module_logger(__name__)
 
@@ -26,6 +48,9 @@ class TracingService:
     ):
         self.tracing_dao = tracing_dao
 
+        self._purges: Set[Task] = set()
+        self._exports: Set[Task] = set()
+
     ### CRUD
 
     async def create(
@@ -175,6 +200,40 @@ class TracingService:
 
         return None
 
+    ### PURGE ON PROJECTS
+
+    async def purge(
+        self,
+        *,
+        project_id: UUID,
+    ) -> int:
+        """
+        Deletes all spans of a project, one bounded transaction at a time.
+        """
+        count = await self.tracing_dao.delete_project(
+            project_id=project_id,
+        )
+
+        log.info("Purged spans:", project_id=project_id, count=count)
+
+        return count
+
+    def start_purge(
+        self,
+        *,
+        project_id: UUID,
+    ) -> Task:
+        """
+        Purges a project in the background, e.g. once the project is deleted.
+        """
+        task = create_task(self.purge(project_id=project_id))
+
+        # Keep a reference, so that the task is not garbage-collected
+        self._purges.add(task)
+        task.add_done_callback(self._purges.discard)
+
+        return task
+
     ### RPC ON SPANS
 
     async def query(  # QUERY
@@ -191,3 +250,173 @@ class TracingService:
         )
 
         return span_dtos
+
+    def stream(  # QUERY
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+    ) -> AsyncGenerator[OTelFlatSpans, None]:
+        """
+        Streams spans in batches, from a server-side cursor. With focus=trace,
+        spans of a trace come one after the other.
+        """
+        parse_query(query)
+
+        return self.tracing_dao.stream(
+            project_id=project_id,
+            query=query,
+        )
+
+    ### EXPORTS ON SPANS
+
+    async def start_export(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+    ) -> SpansExport:
+        """
+        Exports the spans of a query to a Parquet file in the background.
+        """
+        parse_query(query)
+
+        now = datetime.now(timezone.utc)
+
+        export = SpansExport(
+            export_id=uuid4(),
+            status=ExportStatus.PENDING,
+            created_at=now,
+            expires_at=now + timedelta(seconds=TRACING_EXPORTS_TTL),
+        )
+
+        # Whole spans, in no particular grouping
+        span_batches = self.tracing_dao.stream(
+            project_id=project_id,
+            query=Query(
+                formatting=Formatting(focus=Focus.SPAN),
+                windowing=query.windowing,
+                filtering=query.filtering,
+            ),
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+
+        # Pending from now on, until written or failed
+        await put_manifest(project_id, export)
+
+        task = create_task(
+            self._export(
+                project_id=project_id,
+                export=export,
+                span_batches=span_batches,
+            )
+        )
+
+        # Keep a reference, so that the task is not garbage-collected
+        self._exports.add(task)
+        task.add_done_callback(self._exports.discard)
+
+        return export
+
+    async def _export(
+        self,
+        *,
+        project_id: UUID,
+        export: SpansExport,
+        span_batches: AsyncGenerator[OTelFlatSpans, None],
+    ) -> None:
+        export_id = export.export_id
+
+        path = get_export_path(project_id, export_id)
+        partial_path = f"{path}.partial"
+
+        try:
+            # Expired exports of the project go first, whether this one succeeds
+            await purge_exports(project_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.warn(f"Failed to purge span exports: {type(e).__name__}: {e}")
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            count = await write_spans_to_parquet(span_batches, partial_path)
+
+            if TRACING_EXPORTS_BUCKET:
+                await upload_export(partial_path, get_export_key(project_id, export_id))
+
+                os.remove(partial_path)
+            else:
+                os.replace(partial_path, path)
+
+            export.status = ExportStatus.READY
+            export.count = count
+
+            await put_manifest(project_id, export)
+
+            log.info("Exported spans:", export_id=export_id, count=count)
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.error(f"Failed to export spans: {type(e).__name__}: {e}")
+
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+            export.status = ExportStatus.FAILED
+
+            try:
+                await put_manifest(project_id, export)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass  # reported as failed anyway, once timed out
+
+    async def fetch_export(
+        self,
+        *,
+        project_id: UUID,
+        export_id: UUID,
+    ) -> Optional[SpansExport]:
+        """
+        Fetches the status of an export and, once ready in object storage, its URL.
+        Expired exports are not found, and are purged with the next export.
+        """
+        export = await fetch_manifest(project_id, export_id)
+
+        if export is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+
+        if export.expires_at and export.expires_at <= now:
+            return None
+
+        # e.g. the instance writing it restarted, or is gone
+        if (
+            export.status == ExportStatus.PENDING
+            and export.created_at
+            and export.created_at + timedelta(seconds=TRACING_EXPORTS_TIMEOUT) <= now
+        ):
+            export.status = ExportStatus.FAILED
+
+        if export.status == ExportStatus.READY and TRACING_EXPORTS_BUCKET:
+            export.url = await fetch_export_url(get_export_key(project_id, export_id))
+
+            if export.url is None:  # e.g. deleted by a bucket lifecycle rule
+                return None
+
+        return export
+
+    ### RPC ON TRACES
+
+    async def query_traces(  # QUERY
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+    ) -> Optional[OTelTraceSummaries]:
+        parse_query(query)
+
+        trace_summary_dtos = await self.tracing_dao.query_traces(
+            project_id=project_id,
+            query=query,
+        )
+
+        return trace_summary_dtos
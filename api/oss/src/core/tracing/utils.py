@@ -1,4 +1,4 @@
-from typing import Dict, Union, Any
+from typing import Dict, List, Optional, Union, Any
 from uuid import UUID
 from datetime import datetime
 from collections import OrderedDict
@@ -31,6 +31,7 @@ from oss.src.core.tracing.dtos import (
     _L_OPS,
     _D_OPS,
     _E_OPS,
+    _F_OPS,
 )
 
 from oss.src.core.tracing.dtos import OTelAttributes
@@ -38,6 +39,8 @@ from oss.src.core.tracing.dtos import OTelAttributes
 
 log = get_module_logger(__name__)
 
+MAX_SEARCH_LENGTH = 256  # characters in a full-text search
+
 # ATTRIBUTES
 
 
@@ -684,6 +687,28 @@ def _parse_timestamp_field_condition(condition: Condition) -> None:
         condition.value = parse_timestamp_to_datetime(condition.value)
 
 
+def _parse_content_condition(condition: Condition) -> None:
+    if condition.operator not in _F_OPS:
+        raise FilteringException(
+            "'content' only supports search operators.",
+        )
+
+    if condition.key is not None:
+        raise FilteringException(
+            "'content' key is not supported.",
+        )
+
+    if not isinstance(condition.value, str) or not condition.value.strip():
+        raise FilteringException(
+            "'content' value must be a non-empty string.",
+        )
+
+    if len(condition.value) > MAX_SEARCH_LENGTH:
+        raise FilteringException(
+            f"'content' value must be at most {MAX_SEARCH_LENGTH} characters.",
+        )
+
+
 def _parse_uuid_field_condition(condition: Condition) -> None:
     if condition.operator not in _C_OPS + _L_OPS + _E_OPS:
         raise FilteringException(
@@ -745,6 +770,8 @@ def parse_condition(condition: Condition) -> None:
         _parse_references_condition(condition)
     # elif condition.field == Fields.EVENTS:
     #     _parse_events_condition(condition)
+    elif condition.field == Fields.CONTENT:
+        _parse_content_condition(condition)
     elif condition.field == Fields.CREATED_AT:
         _parse_timestamp_field_condition(condition)
     elif condition.field == Fields.UPDATED_AT:
@@ -763,6 +790,37 @@ def parse_condition(condition: Condition) -> None:
         )
 
 
+# FORMATTING / FIELDS
+
+
+def parse_fields(fields: Optional[List[str]]) -> None:
+    if fields is None:
+        return
+
+    for field in fields:
+        if not isinstance(field, str) or not field:
+            raise FilteringException(
+                "'fields' must be a list of non-empty strings.",
+            )
+
+        column, _, path = field.partition(".")
+
+        if column not in list(Fields) or column == Fields.CONTENT:
+            raise FilteringException(
+                f"Unsupported field '{field}'.",
+            )
+
+        if path and column != Fields.ATTRIBUTES:
+            raise FilteringException(
+                f"'{column}' does not support sub-paths, only 'attributes' does.",
+            )
+
+        if path and not all(path.split(".")):
+            raise FilteringException(
+                f"'{field}' must be in dot notation.",
+            )
+
+
 # INGEST / QUERY
 
 
@@ -772,3 +830,6 @@ def parse_ingest(span_dtos: OTelFlatSpans) -> None:
 
 def parse_query(query: Query) -> None:
     parse_filtering(query.filtering)
+
+    if query.formatting:
+        parse_fields(query.formatting.fields)
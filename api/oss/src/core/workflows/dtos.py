@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from urllib.parse import urlparse
 from uuid import UUID
 
@@ -126,3 +126,5 @@ class WorkflowQuery(BaseModel):
     metadata: Optional[Tags] = None
 
     include_archived: Optional[bool] = None
+
+    include: Optional[List[str]] = None
@@ -319,18 +319,26 @@ class WorkflowsService:
         *,
         project_id: UUID,
         #
+        artifact_ids: Optional[List[UUID]] = None,
+        #
         variant_flags: Optional[WorkflowFlags] = None,
         variant_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[WorkflowVariant]:
         variants = await self.workflows_dao.query_variants(
             project_id=project_id,
             #
+            artifact_ids=artifact_ids,
+            #
             variant_flags=(variant_flags.model_dump() if variant_flags else None),
             variant_metadata=variant_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
 
         variants = [WorkflowVariant(**variant.model_dump()) for variant in variants]
@@ -538,19 +546,26 @@ class WorkflowsService:
         *,
         project_id: UUID,
         #
+        variant_ids: Optional[List[UUID]] = None,
+        #
         revision_flags: Optional[WorkflowFlags] = None,
         revision_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[WorkflowRevision]:
         revisions = await self.workflows_dao.query_revisions(
             project_id=project_id,
             #
+            variant_ids=variant_ids,
             #
             revision_flags=(revision_flags.model_dump() if revision_flags else None),
             revision_metadata=revision_metadata,
             #
             include_archived=include_archived,
+            #
+            include=include,
         )
 
         revisions = [
@@ -635,4 +650,29 @@ class WorkflowsService:
 
         return revisions
 
+    async def log_variants_revisions(
+        self,
+        *,
+        project_id: UUID,
+        #
+        variant_ids: List[UUID],
+        depth: Optional[int] = None,
+        #
+        include: Optional[List[str]] = None,
+    ) -> List[WorkflowRevision]:
+        revisions = await self.workflows_dao.log_variants_revisions(
+            project_id=project_id,
+            #
+            variant_ids=variant_ids,
+            depth=depth,
+            #
+            include=include,
+        )
+
+        revisions = [
+            WorkflowRevision(**revision.model_dump()) for revision in revisions
+        ]
+
+        return revisions
+
     ## -------------------------------------------------------------------------
@@ -1,9 +1,11 @@
-from typing import Optional, List, TypeVar, Type
+from typing import Optional, List, Dict, TypeVar, Type, AsyncGenerator
 from uuid import UUID, uuid4
 from json import dumps
 from hashlib import blake2b
+from asyncio import to_thread
 
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, func, bindparam, true
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 
 from oss.src.utils.logging import get_module_logger
 from oss.src.dbs.postgres.shared.utils import suppress_exceptions
@@ -23,6 +25,10 @@ log = get_module_logger(__name__)
 T = TypeVar("T")
 
 
+BLOBS_CHUNK_SIZE = 1_000  # rows per INSERT statement
+BLOBS_HASHING_THRESHOLD = 1_000  # blobs above which hashing runs off the event loop
+
+
 class BlobDAO(BlobDAOInterface):
     def __init__(
         self,
@@ -163,60 +169,84 @@ class BlobDAO(BlobDAOInterface):
         #
         blobs: List[Blob],
     ) -> List[Blob]:
-        for blob in blobs:
-            blob.id = self._blob_id(
-                blob_data=blob.data,
-                set_id=blob.set_id,
-            )
-            blob.slug = blob.slug or uuid4().hex
+        """
+        Adds blobs, content-addressed by set_id and data, skipping existing ones.
+        Returns the blobs in caller order, without duplicates.
+        """
+        if not blobs:
+            return []
 
-        blob_ids = [blob.id for blob in blobs]
+        if len(blobs) > BLOBS_HASHING_THRESHOLD:
+            blob_ids = await to_thread(self._blob_ids, blobs)
+        else:
+            blob_ids = self._blob_ids(blobs)
 
-        async with engine.core_session() as session:
-            stmt = select(self.BlobDBE).filter(
-                self.BlobDBE.project_id == project_id,
-                self.BlobDBE.id.in_(blob_ids),
-            )
+        unique_blobs: Dict[UUID, Blob] = {}
 
-            existing = await session.execute(stmt)
+        for blob, blob_id in zip(blobs, blob_ids):
+            if blob_id not in unique_blobs:
+                blob.id = blob_id
+                blob.slug = blob.slug or uuid4().hex
 
-            existing_dbes = existing.scalars().all()
+                unique_blobs[blob_id] = blob
 
-            existing_ids = {b.id for b in existing_dbes}
+        blobs = list(unique_blobs.values())
 
-            new_blobs = [blob for blob in blobs if blob.id not in existing_ids]
+        added_slugs: Dict[UUID, str] = {}
 
-            blob_dbes = [
-                map_dto_to_dbe(
-                    DBE=self.BlobDBE,  # type: ignore
-                    project_id=project_id,
-                    dto=blob,
+        async with engine.core_session() as session:
+            for offset in range(0, len(blobs), BLOBS_CHUNK_SIZE):
+                chunk = blobs[offset : offset + BLOBS_CHUNK_SIZE]
+
+                stmt = (
+                    insert(self.BlobDBE)
+                    .values(
+                        [
+                            {
+                                "project_id": project_id,
+                                "id": blob.id,
+                                "slug": blob.slug,
+                                "set_id": blob.set_id,
+                                "data": blob.data,
+                            }
+                            for blob in chunk
+                        ]
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=["project_id", "id"],
+                    )
+                    .returning(
+                        self.BlobDBE.id,
+                        self.BlobDBE.slug,
+                    )
                 )
-                for blob in new_blobs
-            ]
 
-            session.add_all(blob_dbes)
+                result = await session.execute(stmt)
 
-            await session.commit()
+                added_slugs.update({row.id: row.slug for row in result})
 
-            stmt = select(self.BlobDBE).filter(
-                self.BlobDBE.project_id == project_id,
-                self.BlobDBE.id.in_(blob_ids),
-            )
+            existing_ids = [blob.id for blob in blobs if blob.id not in added_slugs]
 
-            result = await session.execute(stmt)
+            # Existing blobs have the same data, by construction, but their own slugs
+            for offset in range(0, len(existing_ids), BLOBS_CHUNK_SIZE):
+                stmt = select(
+                    self.BlobDBE.id,
+                    self.BlobDBE.slug,
+                ).filter(
+                    self.BlobDBE.project_id == project_id,
+                    self.BlobDBE.id.in_(
+                        existing_ids[offset : offset + BLOBS_CHUNK_SIZE]
+                    ),
+                )
 
-            blob_dbes = result.scalars().all()
+                result = await session.execute(stmt)
 
-            blobs = [
-                map_dbe_to_dto(
-                    DTO=Blob,  # type: ignore
-                    dbe=dbe,
-                )
-                for dbe in blob_dbes
-            ]
+                added_slugs.update({row.id: row.slug for row in result})
 
-            return blobs
+        for blob in blobs:
+            blob.slug = added_slugs.get(blob.id, blob.slug)
+
+        return blobs
 
     @suppress_exceptions()
     async def fetch_blobs(
@@ -311,10 +341,149 @@ class BlobDAO(BlobDAOInterface):
 
             return blobs
 
+    async def stream_blobs(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+        #
+        batch_size: int = 1_000,
+    ) -> AsyncGenerator[List[Blob], None]:
+        if not blob_ids:
+            return
+
+        positions = self._blob_positions(blob_ids)
+
+        stmt = (
+            select(
+                self.BlobDBE.id,
+                self.BlobDBE.slug,
+                self.BlobDBE.set_id,
+                self.BlobDBE.data,
+            )
+            .join(positions, self.BlobDBE.id == positions.c.id)
+            .filter(self.BlobDBE.project_id == project_id)
+            .order_by(positions.c.position)
+            .execution_options(yield_per=batch_size)
+        )
+
+        # Server-side cursor, fetching batch_size rows at a time, in blob_ids order
+        async with engine.core_session() as session:
+            result = await session.stream(stmt)
+
+            async for rows in result.partitions():
+                yield [
+                    Blob(
+                        id=row.id,
+                        slug=row.slug,
+                        set_id=row.set_id,
+                        data=row.data,
+                    )
+                    for row in rows
+                ]
+
+    async def fetch_blob_keys(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+    ) -> List[str]:
+        if not blob_ids:
+            return []
+
+        positions = self._blob_positions(blob_ids)
+
+        keys = func.jsonb_object_keys(self.BlobDBE.data).table_valued("key")
+        keys = keys.render_derived()
+
+        # Keys in order of first appearance, without loading the blobs themselves
+        stmt = (
+            select(keys.c.key)
+            .select_from(self.BlobDBE)
+            .join(positions, self.BlobDBE.id == positions.c.id)
+            .join(keys, true())
+            .filter(
+                self.BlobDBE.project_id == project_id,
+                func.jsonb_typeof(self.BlobDBE.data) == "object",
+            )
+            .group_by(keys.c.key)
+            .order_by(func.min(positions.c.position), keys.c.key)
+        )
+
+        async with engine.core_session() as session:
+            result = await session.execute(stmt)
+
+            return list(result.scalars().all())
+
+    async def fetch_blob_values(
+        self,
+        *,
+        project_id: UUID,
+        #
+        blob_ids: List[UUID],
+        #
+        key: str,
+    ) -> Dict[UUID, Optional[str]]:
+        """
+        Returns data ->> key for each blob, as text, without loading the blobs.
+        """
+        if not blob_ids:
+            return {}
+
+        positions = self._blob_positions(blob_ids)
+
+        stmt = (
+            select(
+                self.BlobDBE.id,
+                self.BlobDBE.data[key].astext,
+            )
+            .select_from(self.BlobDBE)
+            .join(positions, self.BlobDBE.id == positions.c.id)
+            .filter(
+                self.BlobDBE.project_id == project_id,
+            )
+        )
+
+        async with engine.core_session() as session:
+            result = await session.execute(stmt)
+
+            return {blob_id: value for blob_id, value in result.all()}
+
     # ──────────────────────────────────────────────────────────────────────────
 
     # ─ helpers ────────────────────────────────────────────────────────────────
 
+    def _blob_positions(
+        self,
+        blob_ids: List[UUID],
+    ):
+        # unnest(:blob_ids) WITH ORDINALITY, as a single array parameter
+        return (
+            func.unnest(
+                bindparam(
+                    "blob_ids",
+                    value=list(blob_ids),
+                    type_=ARRAY(PG_UUID(as_uuid=True)),
+                )
+            )
+            .table_valued("id", with_ordinality="position")
+            .render_derived()
+        )
+
+    def _blob_ids(
+        self,
+        blobs: List[Blob],
+    ) -> List[UUID]:
+        return [
+            self._blob_id(
+                blob_data=blob.data,
+                set_id=blob.set_id,
+            )
+            for blob in blobs
+        ]
+
     def _blob_id(
         self,
         *,
@@ -1,8 +1,10 @@
-from typing import Optional, List, TypeVar, Type
+from typing import Optional, List, Tuple, TypeVar, Type
 from uuid import UUID
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func, update
+from sqlalchemy import select, update, func, cast, Integer
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from oss.src.utils.logging import get_module_logger
 from oss.src.dbs.postgres.shared.utils import suppress_exceptions
@@ -544,16 +546,29 @@ class GitDAO(GitDAOInterface):
         *,
         project_id: UUID,
         #
+        artifact_ids: Optional[List[UUID]] = None,
+        #
         variant_flags: Optional[Flags] = None,
         variant_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[Variant]:
+        """
+        include: relations to load along, in one query per level, among
+        "artifact".
+        """
         async with engine.core_session() as session:
             query = select(self.VariantDBE).filter(
                 self.VariantDBE.project_id == project_id,  # type: ignore
             )
 
+            if artifact_ids is not None:
+                query = query.filter(
+                    self.VariantDBE.artifact_id.in_(artifact_ids)  # type: ignore
+                )
+
             if variant_flags:
                 query = query.filter(
                     self.VariantDBE.flags.contains(variant_flags)  # type: ignore
@@ -571,18 +586,21 @@ class GitDAO(GitDAOInterface):
                     self.VariantDBE.deleted_at.is_(None)  # type: ignore
                 )
 
-            # query = query.options(
-            #     joinedload(self.VariantDBE.artifact),  # type: ignore
-            # )
+            include = set(include or [])
+
+            if "artifact" in include:
+                query = query.options(
+                    selectinload(self.VariantDBE.artifact),  # type: ignore
+                )
 
             result = await session.execute(query)
 
             variant_dbes = result.scalars().all()
 
             variant = [
-                map_dbe_to_dto(
-                    DTO=Variant,
+                self._map_variant(
                     dbe=variant_dbe,
+                    include=include,
                 )
                 for variant_dbe in variant_dbes
             ]
@@ -735,6 +753,16 @@ class GitDAO(GitDAOInterface):
         )
 
         async with engine.core_session() as session:
+            # Locks the variant until commit, so concurrent commits get distinct versions
+            revision_dbe.version = await self._next_version(
+                session=session,
+                project_id=project_id,
+                variant_id=variant_id,
+            )
+
+            if revision_dbe.version is None:
+                return None
+
             session.add(revision_dbe)
 
             await session.commit()
@@ -749,18 +777,6 @@ class GitDAO(GitDAOInterface):
                 dbe=revision_dbe,  # type: ignore
             )
 
-            revision.version = await self._get_version(
-                project_id=project_id,
-                variant_id=revision.variant_id,  # type: ignore
-                created_at=revision.created_at,  # type: ignore
-            )
-
-            await self._set_version(
-                project_id=project_id,
-                revision_id=revision.id,  # type: ignore
-                version=revision.version,
-            )
-
             return revision
 
     @suppress_exceptions()
@@ -792,7 +808,7 @@ class GitDAO(GitDAOInterface):
                 if revision_ref and revision_ref.version:
                     query = query.filter(self.RevisionDBE.version == revision_ref.version)  # type: ignore
                 else:
-                    query = query.order_by(self.RevisionDBE.created_at.desc())  # type: ignore
+                    query = query.order_by(self._version_key().desc())
                     query = query.offset(0)
 
             query = query.limit(1)
@@ -957,16 +973,29 @@ class GitDAO(GitDAOInterface):
         *,
         project_id: UUID,
         #
+        variant_ids: Optional[List[UUID]] = None,
+        #
         revision_flags: Optional[Flags] = None,
         revision_metadata: Optional[Metadata] = None,
         #
         include_archived: Optional[bool] = None,
+        #
+        include: Optional[List[str]] = None,
     ) -> List[Revision]:
+        """
+        include: relations to load along, in one query per level, among
+        "artifact", "variant" and "variant.artifact".
+        """
         async with engine.core_session() as session:
             query = select(self.RevisionDBE).filter(
                 self.RevisionDBE.project_id == project_id,  # type: ignore
             )
 
+            if variant_ids is not None:
+                query = query.filter(
+                    self.RevisionDBE.variant_id.in_(variant_ids)  # type: ignore
+                )
+
             if revision_flags:
                 query = query.filter(
                     self.RevisionDBE.flags.contains(revision_flags)  # type: ignore
@@ -984,26 +1013,22 @@ class GitDAO(GitDAOInterface):
                     self.RevisionDBE.deleted_at.is_(None),  # type: ignore
                 )
 
-            # query = query.options(
-            #     joinedload(self.RevisionDBE.variant),  # type: ignore
-            # )
+            include = set(include or [])
+
+            query = query.options(*self._revision_loaders(include=include))
 
             result = await session.execute(query)
 
             revision_dbes = result.scalars().all()
 
             revisions = [
-                map_dbe_to_dto(
-                    DTO=Revision,
-                    dbe=revision_dbe,  # type: ignore
+                self._map_revision(
+                    dbe=revision_dbe,
+                    include=include,
                 )
                 for revision_dbe in revision_dbes
             ]
 
-            # TODO: improve map_dbe_to_dto to include relationships from dbe
-            # for revision_dbe, revision in zip(revision_dbes, revisions):
-            #     revision.variant = self._map_variant_relationship(dbe=revision_dbe)
-
             return revisions
 
     # --------------------------------------------------------------------------
@@ -1055,6 +1080,16 @@ class GitDAO(GitDAOInterface):
         )
 
         async with engine.core_session() as session:
+            # Locks the variant until commit, so concurrent commits get distinct versions
+            revision_dbe.version = await self._next_version(
+                session=session,
+                project_id=project_id,
+                variant_id=variant_id,
+            )
+
+            if revision_dbe.version is None:
+                return None
+
             session.add(revision_dbe)
 
             await session.commit()
@@ -1069,18 +1104,6 @@ class GitDAO(GitDAOInterface):
                 dbe=revision_dbe,  # type: ignore
             )
 
-            revision.version = await self._get_version(
-                project_id=project_id,
-                variant_id=revision.variant_id,  # type: ignore
-                created_at=revision.created_at,  # type: ignore
-            )
-
-            await self._set_version(
-                project_id=project_id,
-                revision_id=revision.id,  # type: ignore
-                version=revision.version,
-            )
-
             return revision
 
     @suppress_exceptions(default=[])
@@ -1093,15 +1116,13 @@ class GitDAO(GitDAOInterface):
         revision_ref: Optional[Reference] = None,
         depth: Optional[int] = None,
     ) -> List[Revision]:
-        revision = await self.fetch_revision(  # type: ignore
-            project_id=project_id,
-            variant_ref=variant_ref,
-            revision_ref=revision_ref,
-        )
-
-        if not revision:
-            return []
-
+        """
+        Returns the history of a variant up to a revision (latest by default),
+        oldest first, limited to the last `depth` revisions.
+        Traverses the (project_id, variant_id, version) index, without offsets.
+        To page further back, log again with revision_ref=Reference(version=...)
+        set to the version before the oldest revision returned.
+        """
         if depth is not None:
             if not isinstance(depth, int):
                 return []
@@ -1109,35 +1130,41 @@ class GitDAO(GitDAOInterface):
             if depth < 1:
                 return []
 
-        offset = None
-        limit = None
-        order_by = self.RevisionDBE.created_at.desc()  # type: ignore
+        variant_id = variant_ref.id if variant_ref else None
+        version = None
+
+        if revision_ref and revision_ref.version:
+            version = revision_ref.version
+
+        elif revision_ref and (revision_ref.id or revision_ref.slug):
+            head = await self._fetch_revision_key(
+                project_id=project_id,
+                revision_ref=revision_ref,
+            )
+
+            if not head:
+                return []
+
+            variant_id, version = head
 
-        if depth is None:
-            offset = 0
-            limit = revision.version + 1
-            order_by = self.RevisionDBE.created_at.asc()  # type: ignore
-        elif depth is not None:
-            offset = max(revision.version - depth + 1, 0)
-            limit = min(depth, revision.version + 1)
-            order_by = self.RevisionDBE.created_at.asc()  # type: ignore
+        if not variant_id:
+            return []
+
+        version_key = self._version_key()
 
         async with engine.core_session() as session:
             query = select(self.RevisionDBE).filter(
                 self.RevisionDBE.project_id == project_id,  # type: ignore
+                self.RevisionDBE.variant_id == variant_id,  # type: ignore
             )
 
-            query = query.filter(
-                self.RevisionDBE.variant_id == revision.variant_id,  # type: ignore
-            )
+            if version is not None:
+                query = query.filter(version_key <= int(version))
 
-            query = query.order_by(order_by)
-            query = query.offset(offset)
-            query = query.limit(limit)
+            query = query.order_by(version_key.desc())
 
-            # query = query.options(
-            #     joinedload(self.RevisionDBE.variant),  # type: ignore
-            # )
+            if depth is not None:
+                query = query.limit(depth)
 
             result = await session.execute(query)
 
@@ -1151,12 +1178,93 @@ class GitDAO(GitDAOInterface):
                     DTO=Revision,
                     dbe=revision_dbe,  # type: ignore
                 )
+                for revision_dbe in reversed(revision_dbes)
+            ]
+
+            return revisions
+
+    @suppress_exceptions(default=[])
+    async def log_variants_revisions(
+        self,
+        *,
+        project_id: UUID,
+        #
+        variant_ids: List[UUID],
+        depth: Optional[int] = None,
+        #
+        include: Optional[List[str]] = None,
+    ) -> List[Revision]:
+        """
+        Returns the latest `depth` revisions of each variant, in a single query,
+        grouped by variant (in variant_ids order) and oldest first within a variant.
+        """
+        if not variant_ids:
+            return []
+
+        if depth is not None:
+            if not isinstance(depth, int):
+                return []
+
+            if depth < 1:
+                return []
+
+        version_key = self._version_key()
+
+        revision_entity = self.RevisionDBE
+
+        async with engine.core_session() as session:
+            query = select(self.RevisionDBE).filter(
+                self.RevisionDBE.project_id == project_id,  # type: ignore
+                self.RevisionDBE.variant_id.in_(variant_ids),  # type: ignore
+            )
+
+            if depth is not None:
+                position = (
+                    func.row_number()  # pylint: disable=not-callable
+                    .over(
+                        partition_by=self.RevisionDBE.variant_id,  # type: ignore
+                        order_by=version_key.desc(),
+                    )
+                    .label("position")
+                )
+
+                ranked = query.add_columns(position).subquery()
+
+                revision_alias = aliased(self.RevisionDBE, ranked)  # type: ignore
+
+                query = select(revision_alias).filter(ranked.c.position <= depth)
+
+                version_key = cast(revision_alias.version, Integer)  # type: ignore
+
+                revision_entity = revision_alias
+
+            query = query.order_by(version_key.asc())
+
+            include = set(include or [])
+
+            query = query.options(
+                *self._revision_loaders(
+                    include=include,
+                    entity=revision_entity,
+                )
+            )
+
+            result = await session.execute(query)
+
+            revision_dbes = result.scalars().all()
+
+            revisions = [
+                self._map_revision(
+                    dbe=revision_dbe,
+                    include=include,
+                )
                 for revision_dbe in revision_dbes
             ]
 
-            # TODO: improve map_dbe_to_dto to include relationships from dbe
-            # for revision_dbe, revision in zip(revision_dbes, revisions):
-            #     revision.variant = self._map_variant_relationship(dbe=revision_dbe)
+            positions = {variant_id: i for i, variant_id in enumerate(variant_ids)}
+
+            # Stable, so versions stay in order within each variant
+            revisions.sort(key=lambda revision: positions.get(revision.variant_id, 0))
 
             return revisions
 
@@ -1164,48 +1272,134 @@ class GitDAO(GitDAOInterface):
 
     # ─ helpers ────────────────────────────────────────────────────────────────
 
-    async def _get_version(
+    def _revision_loaders(
         self,
         *,
-        project_id: UUID,
-        variant_id: UUID,
-        created_at: datetime,
-    ) -> str:
-        async with engine.core_session() as session:
-            stmt = (
-                select(func.count())  # pylint: disable=not-callable
-                .select_from(self.RevisionDBE)  # type: ignore
-                .where(
-                    self.RevisionDBE.project_id == project_id,  # type: ignore
-                    self.RevisionDBE.variant_id == variant_id,  # type: ignore
-                    self.RevisionDBE.created_at < created_at,  # type: ignore
+        include: set,
+        entity=None,
+    ) -> list:
+        # One SELECT ... WHERE (project_id, id) IN (...) per level, whatever
+        # the number of revisions, rather than one per revision
+        entity = entity or self.RevisionDBE
+
+        loaders = []
+
+        if "artifact" in include:
+            loaders.append(selectinload(entity.artifact))
+
+        if "variant.artifact" in include:
+            loaders.append(
+                selectinload(entity.variant).selectinload(
+                    self.VariantDBE.artifact  # type: ignore
                 )
             )
+        elif "variant" in include:
+            loaders.append(selectinload(entity.variant))
+
+        return loaders
+
+    def _map_variant(
+        self,
+        *,
+        dbe,
+        include: set,
+    ) -> Variant:
+        variant = map_dbe_to_dto(
+            DTO=Variant,
+            dbe=dbe,
+        )
+
+        if "artifact" in include and dbe.artifact is not None:
+            variant.artifact = map_dbe_to_dto(
+                DTO=Artifact,
+                dbe=dbe.artifact,
+            )
 
-            result = await session.execute(stmt)
+        return variant
+
+    def _map_revision(
+        self,
+        *,
+        dbe,
+        include: set,
+    ) -> Revision:
+        revision = map_dbe_to_dto(
+            DTO=Revision,
+            dbe=dbe,
+        )
+
+        if "artifact" in include and dbe.artifact is not None:
+            revision.artifact = map_dbe_to_dto(
+                DTO=Artifact,
+                dbe=dbe.artifact,
+            )
+
+        if ("variant" in include or "variant.artifact" in include) and (
+            dbe.variant is not None
+        ):
+            revision.variant = self._map_variant(
+                dbe=dbe.variant,
+                include={"artifact"} if "variant.artifact" in include else set(),
+            )
 
-            position = result.scalar_one()
+        return revision
 
-            return str(position)
+    def _version_key(self):
+        # Versions are stored as strings, but ordered (and indexed) as integers
+        return cast(self.RevisionDBE.version, Integer)  # type: ignore
 
-    async def _set_version(
+    async def _fetch_revision_key(
         self,
         *,
         project_id: UUID,
-        revision_id: UUID,
-        version: str,
-    ) -> None:
+        revision_ref: Reference,
+    ) -> Optional[Tuple[UUID, str]]:
         async with engine.core_session() as session:
-            query = update(self.RevisionDBE).filter(
+            query = select(
+                self.RevisionDBE.variant_id,  # type: ignore
+                self.RevisionDBE.version,  # type: ignore
+            ).filter(
                 self.RevisionDBE.project_id == project_id,  # type: ignore
             )
 
-            query = query.filter(self.RevisionDBE.id == revision_id)  # type: ignore
+            if revision_ref.id:
+                query = query.filter(self.RevisionDBE.id == revision_ref.id)  # type: ignore
+            else:
+                query = query.filter(self.RevisionDBE.slug == revision_ref.slug)  # type: ignore
 
-            query = query.values(version=version)  # type: ignore
+            result = await session.execute(query.limit(1))
 
-            await session.execute(query)
+            row = result.first()
 
-            await session.commit()
+            if not row:
+                return None
+
+            return row.variant_id, row.version
+
+    async def _next_version(
+        self,
+        *,
+        session: AsyncSession,
+        project_id: UUID,
+        variant_id: UUID,
+    ) -> Optional[str]:
+        stmt = (
+            update(self.VariantDBE)
+            .where(
+                self.VariantDBE.project_id == project_id,  # type: ignore
+                self.VariantDBE.id == variant_id,  # type: ignore
+            )
+            .values(next_version=self.VariantDBE.next_version + 1)  # type: ignore
+            .returning(self.VariantDBE.next_version)  # type: ignore
+        )
+
+        result = await session.execute(stmt)
+
+        next_version = result.scalar_one_or_none()
+
+        if next_version is None:
+            return None
+
+        return str(next_version - 1)
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, UUID
+from sqlalchemy import Column, UUID, Integer
 
 from oss.src.dbs.postgres.shared.dbas import (
     IdentifierDBA,
@@ -39,6 +39,13 @@ class VariantDBA(
         nullable=False,
     )
 
+    # Version of the next revision, incremented atomically on each commit
+    next_version = Column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+
 
 class RevisionDBA(
     IdentifierDBA,
@@ -1,10 +1,10 @@
-from typing import Optional, List, Tuple, Union
+from typing import Optional, List, Tuple, Union, Dict, Any
 from datetime import datetime, timedelta, time, timezone
 from traceback import print_exc
 from uuid import UUID
 
-from sqlalchemy import and_, or_, not_, distinct, Column, func, cast, text
-from sqlalchemy import TIMESTAMP, Enum, UUID as SQLUUID, Integer, Numeric
+from sqlalchemy import and_, or_, not_, distinct, Column, func, cast, text, delete
+from sqlalchemy import TIMESTAMP, Enum, UUID as SQLUUID, Integer, Numeric, Row
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.future import select
 from sqlalchemy.dialects import postgresql
@@ -57,6 +57,7 @@ _SUGGESTED_BUCKETS_LIST = [
     (720, "12 hours"),
     (1440, "1 day"),
 ]
+_DELETE_CHUNK_SIZE = 10_000  # nodes deleted per statement (and transaction)
 
 
 class ObservabilityDAO(ObservabilityDAOInterface):
@@ -71,9 +72,15 @@ class ObservabilityDAO(ObservabilityDAOInterface):
         query_dto: QueryDTO,
     ) -> Tuple[List[SpanDTO], Optional[int]]:
         try:
+            # PROJECTION
+            columns = _project(query_dto.fields)
+
+            entity = select(NodesDBE) if columns is None else select(*columns)
+            # ----------
+
             async with engine.tracing_session() as session:
                 # BASE (SUB-)QUERY
-                query = select(NodesDBE)
+                query = entity
                 # ----------------
 
                 # GROUPING
@@ -152,7 +159,7 @@ class ObservabilityDAO(ObservabilityDAOInterface):
                 if grouping and grouping_column:
                     subquery = query.subquery()
 
-                    query = select(NodesDBE)
+                    query = entity
                     query = query.filter(
                         grouping_column.in_(select(subquery.c["grouping_key"]))
                     )
@@ -184,7 +191,10 @@ class ObservabilityDAO(ObservabilityDAOInterface):
                 # ---------
 
                 # QUERY EXECUTION
-                spans = (await session.execute(query)).scalars().all()
+                if columns is None:
+                    spans = (await session.execute(query)).scalars().all()
+                else:
+                    spans = [_unproject(row) for row in await session.execute(query)]
                 # ---------------
 
             return [map_span_dbe_to_span_dto(span) for span in spans], count
@@ -573,62 +583,150 @@ class ObservabilityDAO(ObservabilityDAOInterface):
         project_id: UUID,
         node_id: UUID,
     ) -> None:
-        span_dbe = await self.read_one(
+        await self.delete_many(
             project_id=project_id,
-            node_id=node_id,
-            to_dto=False,
+            node_ids=[node_id],
         )
 
-        if span_dbe:
-            # COULD BE REPLACED WITH A CASCADE
-            children_dbes = await self.read_children(
-                project_id=project_id,
-                parent_id=node_id,
-                to_dto=False,
-            )
-
-            if children_dbes:
-                await self.delete_many(
-                    project_id=project_id,
-                    node_ids=[child_dbe.node_id for child_dbe in children_dbes],
-                )
-            # --------------------------------
-
-            async with engine.tracing_session() as session:
-                await session.delete(span_dbe)
-                await session.commit()
-
     async def delete_many(
         self,
         *,
         project_id: UUID,
         node_ids: List[UUID],
     ) -> None:
-        span_dbes = await self.read_many(
-            project_id=project_id,
-            node_ids=node_ids,
-            to_dto=False,
+        if not node_ids:
+            return
+
+        # Nodes and their descendants, by id only, resolved before any delete so
+        # that deleting a chunk does not orphan the descendants of the next one
+        subtree = (
+            select(NodesDBE.node_id)
+            .filter(
+                NodesDBE.project_id == project_id,
+                NodesDBE.node_id.in_(node_ids),
+            )
+            .cte("subtree", recursive=True)
         )
 
-        if span_dbes:
-            for span_dbe in span_dbes:
-                # COULD BE REPLACED WITH A CASCADE
-                children_dbes = await self.read_children(
-                    project_id=project_id,
-                    parent_id=span_dbe.node_id,
-                    to_dto=False,
+        subtree = subtree.union(
+            select(NodesDBE.node_id)
+            .join(subtree, NodesDBE.parent_id == subtree.c.node_id)
+            .filter(NodesDBE.project_id == project_id)
+        )
+
+        async with engine.tracing_session() as session:
+            subtree_ids = (
+                (await session.execute(select(subtree.c.node_id))).scalars().all()
+            )
+
+        for i in range(0, len(subtree_ids), _DELETE_CHUNK_SIZE):
+            chunk_ids = subtree_ids[i : i + _DELETE_CHUNK_SIZE]
+
+            async with engine.tracing_session() as session:
+                await session.execute(
+                    delete(NodesDBE)
+                    .where(
+                        NodesDBE.project_id == project_id,
+                        NodesDBE.node_id.in_(chunk_ids),
+                    )
+                    .execution_options(synchronize_session=False)
                 )
 
-                if children_dbes:
-                    await self.delete_many(
-                        project_id=project_id,
-                        node_ids=[child_dbe.node_id for child_dbe in children_dbes],
+    async def delete_project(
+        self,
+        *,
+        project_id: UUID,
+        chunk_size: int = _DELETE_CHUNK_SIZE,
+    ) -> int:
+        """
+        Deletes all nodes of a project, one chunk per transaction, and returns
+        how many were deleted. Meant to run as a background job.
+        """
+        count = 0
+
+        while True:
+            chunk = (
+                select(NodesDBE.node_id)
+                .filter(NodesDBE.project_id == project_id)
+                .limit(chunk_size)
+            )
+
+            async with engine.tracing_session() as session:
+                rows = (
+                    await session.execute(
+                        delete(NodesDBE)
+                        .where(
+                            NodesDBE.project_id == project_id,
+                            NodesDBE.node_id.in_(chunk),
+                        )
+                        .returning(NodesDBE.node_id)
+                        .execution_options(synchronize_session=False)
                     )
-                # --------------------------------
+                ).all()
+
+            count += len(rows)
+
+            if len(rows) < chunk_size:
+                break
+
+        return count
+
+
+# Always selected, as needed to build nodes (and trees of nodes)
+_NODE_KEYS = [
+    "project_id",
+    "created_at",
+    "updated_at",
+    "updated_by_id",
+    "root_id",
+    "tree_id",
+    "tree_type",
+    "node_id",
+    "node_name",
+    "node_type",
+    "parent_id",
+    "time_start",
+    "time_end",
+    "status",
+]
+
+
+def _project(
+    fields: Optional[List[str]] = None,
+) -> Optional[List[Column]]:
+    # Whole columns (e.g. 'metrics') or top-level keys (e.g. 'data.outputs')
+    if fields is None:
+        return None
+
+    names = [*_NODE_KEYS, *(field for field in fields if "." not in field)]
+
+    columns = {name: getattr(NodesDBE, name) for name in names}
+
+    for field in fields:
+        column, _, key = field.partition(".")
+
+        # Keys are left out when their whole column is selected
+        if key and column not in columns:
+            columns[field] = getattr(NodesDBE, column)[key].label(field)
+
+    return list(columns.values())
+
+
+def _unproject(
+    row: Row,
+) -> NodesDBE:
+    values: Dict[str, Any] = {}
+
+    for name, value in row._mapping.items():
+        column, _, key = name.partition(".")
+
+        if not key:
+            values[column] = value
+
+        elif value is not None:
+            values.setdefault(column, {})[key] = value
 
-                async with engine.tracing_session() as session:
-                    await session.delete(span_dbe)
-                    await session.commit()
+    return NodesDBE(**values)
 
 
 def _chunk(
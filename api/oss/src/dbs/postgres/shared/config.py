@@ -2,3 +2,17 @@ import os
 
 POSTGRES_URI_CORE = os.environ.get("POSTGRES_URI_CORE")
 POSTGRES_URI_TRACING = os.environ.get("POSTGRES_URI_TRACING")
+
+# Tracing tables (spans, nodes) are range-partitioned by start time
+TRACING_PARTITION_INTERVAL = os.environ.get(
+    "AGENTA_TRACING_PARTITION_INTERVAL", "day"
+)  # "day" or "week"
+TRACING_PARTITIONS_AHEAD = int(os.environ.get("AGENTA_TRACING_PARTITIONS_AHEAD", "7"))
+TRACING_PARTITIONS_CHECK_INTERVAL = int(
+    os.environ.get("AGENTA_TRACING_PARTITIONS_CHECK_INTERVAL", "3600")
+)  # seconds
+TRACING_RETENTION_DAYS = (
+    int(os.environ["AGENTA_TRACING_RETENTION_DAYS"])
+    if os.environ.get("AGENTA_TRACING_RETENTION_DAYS")
+    else None
+)  # None keeps everything
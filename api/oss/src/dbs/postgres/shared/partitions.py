@@ -0,0 +1,404 @@
+import re
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from asyncio import sleep, CancelledError
+from itertools import groupby
+from operator import itemgetter
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from oss.src.utils.logging import get_module_logger
+from oss.src.dbs.postgres.shared.engine import engine
+from oss.src.dbs.postgres.tracing.dao import refresh_traces
+from oss.src.dbs.postgres.shared.config import (
+    TRACING_PARTITION_INTERVAL,
+    TRACING_PARTITIONS_AHEAD,
+    TRACING_PARTITIONS_CHECK_INTERVAL,
+    TRACING_RETENTION_DAYS,
+)
+
+log = get_module_logger(__name__)
+
+
+PARTITIONED_TABLES = ("spans", "nodes")  # range-partitioned by start time
+PARTITION_KEYS = {"spans": "start_time", "nodes": "time_start"}
+PARTITIONS_LOCK_KEY = 0x7472616365  # one maintainer at a time, across workers
+REFRESH_CHUNK_SIZE = 1_000  # trace summaries recomputed per statement
+
+INTERVALS = {
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+_BOUND = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def period_start(
+    moment: datetime,
+    interval: str,
+) -> datetime:
+    """Start of the (UTC) day or week, from monday, holding moment."""
+    start = moment.astimezone(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+    if interval == "week":
+        start -= timedelta(days=start.weekday())
+
+    return start
+
+
+def partition_name(
+    table: str,
+    start: datetime,
+) -> str:
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _parse_bound(
+    value: str,
+) -> Optional[datetime]:
+    # MINVALUE / MAXVALUE are open bounds
+    if not value.startswith("'"):
+        return None
+
+    bound = datetime.fromisoformat(value.strip("'"))
+
+    # Bounds on timestamps without time zone (e.g. nodes) are in UTC
+    return bound if bound.tzinfo else bound.replace(tzinfo=timezone.utc)
+
+
+async def fetch_partitions(
+    session: AsyncSession,
+    *,
+    table: str,
+) -> List[Tuple[str, Optional[datetime], Optional[datetime]]]:
+    """
+    Returns (name, lower, upper) for each range partition of table, by lower bound,
+    with None for open bounds. The default partition, if any, is left out.
+    """
+    result = await session.execute(
+        text(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": table},
+    )
+
+    partitions = []
+
+    for name, bound in result.all():
+        match = _BOUND.search(bound or "")
+
+        if not match:  # DEFAULT
+            continue
+
+        partitions.append(
+            (name, _parse_bound(match.group(1)), _parse_bound(match.group(2)))
+        )
+
+    partitions.sort(key=lambda partition: partition[1] or _MIN)
+
+    return partitions
+
+
+async def create_partitions(
+    session: AsyncSession,
+    *,
+    table: str,
+    now: datetime,
+    interval: str = TRACING_PARTITION_INTERVAL,
+    ahead: int = TRACING_PARTITIONS_AHEAD,
+) -> List[str]:
+    """
+    Creates the partitions of table, from the end of the last one (or the current
+    period) up to `ahead` periods after the current one, and returns their names.
+    Rows of the default partition falling in a new partition are moved into it.
+    """
+    step = INTERVALS[interval]
+
+    current = period_start(now, interval)
+    horizon = current + step * (ahead + 1)
+
+    partitions = await fetch_partitions(session, table=table)
+
+    uppers = [upper for _, _, upper in partitions]
+
+    if None in uppers:  # up to MAXVALUE, nothing left to create
+        return []
+
+    # Older gaps are left to the default partition
+    cursor = max([current, *uppers])
+
+    created = []
+
+    while cursor < horizon:
+        # The first partition may be partial, if the interval was changed
+        end = period_start(cursor, interval) + step
+
+        name = partition_name(table, cursor)
+
+        # e.g. spans sent with a start time further ahead than the partitions
+        if await _default_overlaps(session, table=table, lower=cursor, upper=end):
+            await _move_from_default(
+                session, table=table, name=name, lower=cursor, upper=end
+            )
+        else:
+            await session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{cursor.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+
+        created.append(name)
+
+        cursor = end
+
+    return created
+
+
+async def _default_overlaps(
+    session: AsyncSession,
+    *,
+    table: str,
+    lower: datetime,
+    upper: datetime,
+) -> bool:
+    default = f"{table}_default"
+    key = PARTITION_KEYS[table]
+
+    result = await session.execute(
+        text(
+            f"""
+            SELECT EXISTS (
+                SELECT 1 FROM {default}
+                WHERE {key} >= '{lower.isoformat()}' AND {key} < '{upper.isoformat()}'
+            )
+            """
+        )
+    )
+
+    return bool(result.scalar())
+
+
+async def _move_from_default(
+    session: AsyncSession,
+    *,
+    table: str,
+    name: str,
+    lower: datetime,
+    upper: datetime,
+) -> None:
+    # A partition cannot be created over rows of the default partition, so it is
+    # filled as a standalone table, then attached (which checks the default again)
+    default = f"{table}_default"
+    key = PARTITION_KEYS[table]
+
+    await session.execute(
+        text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+    )
+    await session.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {default}
+                WHERE {key} >= '{lower.isoformat()}' AND {key} < '{upper.isoformat()}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        )
+    )
+    await session.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+
+
+async def drop_partitions(
+    session: AsyncSession,
+    *,
+    table: str,
+    now: datetime,
+    retention_days: Optional[int] = TRACING_RETENTION_DAYS,
+) -> List[str]:
+    """
+    Drops the partitions of table that hold nothing newer than the retention
+    period, and returns their names. Rows are never deleted one by one.
+    """
+    if retention_days is None:
+        return []
+
+    cutoff = now - timedelta(days=retention_days)
+
+    partitions = await fetch_partitions(session, table=table)
+
+    dropped = []
+
+    for name, _, upper in partitions:
+        if upper is None or upper > cutoff:
+            continue
+
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+        dropped.append(name)
+
+    return dropped
+
+
+async def refresh_expired_traces(
+    session: AsyncSession,
+    *,
+    now: datetime,
+    retention_days: Optional[int] = TRACING_RETENTION_DAYS,
+    chunk_size: int = REFRESH_CHUNK_SIZE,
+) -> int:
+    """
+    Drops the trace summaries left without spans once their partitions are gone,
+    and recomputes those of traces that still have spans in newer partitions.
+    Returns how many were dropped.
+    """
+    if retention_days is None:
+        return 0
+
+    cutoff = now - timedelta(days=retention_days)
+
+    # Spans older than the oldest partition left are gone (the default one aside)
+    partitions = await fetch_partitions(session, table="spans")
+
+    horizon = (partitions[0][1] if partitions else None) or cutoff
+
+    result = await session.execute(
+        text(
+            """
+            DELETE FROM traces
+            WHERE traces.start_time < :horizon
+            AND NOT EXISTS (
+                SELECT 1 FROM spans
+                WHERE spans.project_id = traces.project_id
+                AND spans.trace_id = traces.trace_id
+            )
+            """
+        ),
+        {"horizon": horizon},
+    )
+
+    # Traces across the horizon lost their older spans only
+    remaining = await session.execute(
+        text(
+            """
+            SELECT project_id, trace_id FROM traces
+            WHERE traces.start_time < :horizon
+            ORDER BY project_id, trace_id
+            """
+        ),
+        {"horizon": horizon},
+    )
+
+    for project_id, rows in groupby(remaining.all(), key=itemgetter(0)):
+        trace_ids = [trace_id for _, trace_id in rows]
+
+        for offset in range(0, len(trace_ids), chunk_size):
+            await refresh_traces(
+                session,
+                project_id=project_id,
+                trace_ids=trace_ids[offset : offset + chunk_size],
+            )
+
+    return result.rowcount
+
+
+async def drop_orphan_references(
+    session: AsyncSession,
+    *,
+    now: datetime,
+    retention_days: Optional[int] = TRACING_RETENTION_DAYS,
+) -> int:
+    """
+    Drops the span references left without spans once their partitions are gone,
+    and returns how many were dropped.
+    """
+    if retention_days is None:
+        return 0
+
+    cutoff = now - timedelta(days=retention_days)
+
+    result = await session.execute(
+        text(
+            """
+            DELETE FROM span_references
+            WHERE span_references.start_time < :cutoff
+            AND NOT EXISTS (
+                SELECT 1 FROM spans
+                WHERE spans.project_id = span_references.project_id
+                AND spans.trace_id = span_references.trace_id
+                AND spans.span_id = span_references.span_id
+            )
+            """
+        ),
+        {"cutoff": cutoff},
+    )
+
+    return result.rowcount
+
+
+async def maintain_partitions(
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Creates upcoming partitions and drops expired ones, for all partitioned tables.
+    Skips if another worker is already at it.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    for table in PARTITIONED_TABLES:
+        try:
+            async with engine.tracing_session() as session:
+                result = await session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": PARTITIONS_LOCK_KEY},
+                )
+
+                if not result.scalar():
+                    return
+
+                created = await create_partitions(session, table=table, now=now)
+                dropped = await drop_partitions(session, table=table, now=now)
+
+                if table == "spans" and dropped:
+                    await refresh_expired_traces(session, now=now)
+                    await drop_orphan_references(session, now=now)
+
+            if created or dropped:
+                log.info(
+                    "Maintained partitions:",
+                    table=table,
+                    created=created,
+                    dropped=dropped,
+                )
+
+        except Exception as e:  # pylint: disable=broad-except
+            log.error("Failed to maintain partitions of %s: %s", table, e)
+
+
+async def run_partitions_maintenance(
+    check_interval: int = TRACING_PARTITIONS_CHECK_INTERVAL,
+) -> None:
+    while True:
+        try:
+            await maintain_partitions()
+
+            await sleep(check_interval)
+
+        except CancelledError:
+            break
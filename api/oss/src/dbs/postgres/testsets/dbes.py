@@ -4,6 +4,7 @@ from sqlalchemy import (
     PrimaryKeyConstraint,
     Index,
     UniqueConstraint,
+    text,
 )
 
 from oss.src.dbs.postgres.shared.base import Base
@@ -124,6 +125,13 @@ class TestsetRevisionDBE(Base, ProjectScopeDBA, RevisionDBA):
             "project_id",
             "variant_id",
         ),
+        Index(
+            "ix_testset_revisions_project_id_variant_id_version",
+            "project_id",
+            "variant_id",
+            text("CAST(version AS INTEGER)"),
+            unique=True,
+        ),
     )
 
     artifact = relationship(
@@ -1,21 +1,24 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union, AsyncGenerator
 from uuid import UUID
 from traceback import format_exc
 
-from sqlalchemy import distinct, Column
-from sqlalchemy import Select
-from sqlalchemy.dialects.postgresql import dialect
+from sqlalchemy import distinct, Column, delete, tuple_, and_, or_
+from sqlalchemy import Select, Float, Integer, case, cast, exists, func, literal
+from sqlalchemy import true, literal_column, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB, dialect, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from oss.src.utils.logging import get_module_logger
+from oss.src.utils.logging import get_module_logger, SQL_TRACE_ENABLED
 
 from oss.src.dbs.postgres.shared.engine import engine
-from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE, TraceDBE, SpanReferenceDBE
 from oss.src.dbs.postgres.tracing.mappings import (
     map_span_dbe_to_link_dto,
     map_span_dbe_to_span_dbe,
     map_span_dto_to_span_dbe,
     map_span_dbe_to_span_dto,
+    map_trace_dbe_to_trace_summary_dto,
 )
 
 from oss.src.core.tracing.interfaces import TracingDAOInterface
@@ -24,16 +27,242 @@ from oss.src.core.tracing.dtos import (
     OTelLinks,
     OTelFlatSpan,
     OTelFlatSpans,
+    OTelStatusCode,
+    OTelTraceSummaries,
     Query,
     Focus,
 )
 
-from oss.src.dbs.postgres.tracing.utils import combine, filter
+from oss.src.dbs.postgres.tracing.utils import (
+    plan,
+    project,
+    unproject,
+)
 
 log = get_module_logger(__name__)
 
 DEBUG_ARGS = {"dialect": dialect(), "compile_kwargs": {"literal_binds": True}}
 
+DELETE_CHUNK_SIZE = 10_000  # spans deleted per statement (and transaction)
+STREAM_BATCH_SIZE = 1_000  # spans fetched from the cursor at a time
+
+# Reference ids are free-form in span attributes, but indexed as UUIDs
+UUID_PATTERN = "^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$"
+
+# Unit metrics of each span, summed up into the trace summary
+TRACE_COSTS_PATHS = [
+    ("ag", "metrics", "unit", "costs", "total"),
+    ("agenta", "metrics", "unit", "costs", "total"),
+]
+TRACE_TOKENS_PATHS = [
+    ("ag", "metrics", "unit", "tokens", "total"),
+    ("agenta", "metrics", "unit", "tokens", "total"),
+]
+
+# Columns of the trace summary taken from the root span
+ROOT_COLUMNS = [
+    "span_id",
+    "parent_id",
+    "span_kind",
+    "span_name",
+    "status_code",
+    "status_message",
+    "attributes",
+]
+
+
+def _metric(
+    paths: List[tuple],
+) -> Column:
+    value = func.coalesce(
+        *(SpanDBE.attributes[path] for path in paths),
+        type_=JSONB,
+    )
+
+    # Anything but a number (e.g. a missing metric) is left out of the sum
+    return case(
+        (func.jsonb_typeof(value) == "number", cast(value, Float)),
+        else_=None,
+    )
+
+
+def _summarize(
+    project_id: UUID,
+    scope: list,
+) -> Select:
+    # Summaries of the spans in scope, by trace, in trace order (for row locks)
+
+    # ROOT SPAN (or the oldest span, if the root is missing)
+    roots = (
+        select(
+            SpanDBE.trace_id,
+            SpanDBE.span_id,
+            SpanDBE.parent_id,
+            SpanDBE.span_kind,
+            SpanDBE.span_name,
+            SpanDBE.status_code,
+            SpanDBE.status_message,
+            SpanDBE.attributes,
+        )
+        .filter(*scope)
+        .distinct(SpanDBE.trace_id)
+        .order_by(
+            SpanDBE.trace_id,
+            SpanDBE.parent_id.isnot(None),
+            SpanDBE.start_time,
+        )
+        .subquery("roots")
+    )
+
+    # ALL SPANS
+    stats = (
+        select(
+            SpanDBE.trace_id,
+            func.min(SpanDBE.start_time).label("start_time"),
+            func.max(SpanDBE.end_time).label("end_time"),
+            func.count().label("span_count"),
+            func.bool_or(SpanDBE.status_code == OTelStatusCode.STATUS_CODE_ERROR).label(
+                "has_errors"
+            ),
+            func.sum(_metric(TRACE_COSTS_PATHS)).label("costs"),
+            func.sum(_metric(TRACE_TOKENS_PATHS)).label("tokens"),
+            func.min(SpanDBE.created_at).label("created_at"),
+        )
+        .filter(*scope)
+        .group_by(SpanDBE.trace_id)
+        .subquery("stats")
+    )
+
+    reference = func.jsonb_array_elements(SpanDBE.references).column_valued("reference")
+
+    references = (
+        select(
+            SpanDBE.trace_id,
+            func.jsonb_agg(distinct(reference)).label("references"),
+        )
+        .filter(*scope)
+        .group_by(SpanDBE.trace_id)
+        .subquery("refs")
+    )
+
+    return (
+        select(
+            literal(project_id, TraceDBE.project_id.type).label("project_id"),
+            stats.c.trace_id,
+            roots.c.span_id,
+            roots.c.parent_id,
+            roots.c.span_kind,
+            roots.c.span_name,
+            roots.c.status_code,
+            roots.c.status_message,
+            roots.c.attributes,
+            stats.c.start_time,
+            stats.c.end_time,
+            stats.c.span_count,
+            stats.c.has_errors,
+            stats.c.costs,
+            stats.c.tokens,
+            references.c.references,
+            stats.c.created_at,
+        )
+        .join(roots, roots.c.trace_id == stats.c.trace_id)
+        .outerjoin(references, references.c.trace_id == stats.c.trace_id)
+        .order_by(stats.c.trace_id)
+    )
+
+
+def _trace_window(
+    project_id: UUID,
+    trace_ids: Union[List[UUID], Select],
+) -> Column:
+    # Bounds the spans of the given traces by their summaries, so that only the
+    # partitions holding them are scanned (or all of them, without a summary)
+    scope = [
+        TraceDBE.project_id == project_id,
+        TraceDBE.trace_id.in_(trace_ids),
+    ]
+
+    lower = select(func.min(TraceDBE.start_time)).filter(*scope).scalar_subquery()
+    upper = select(func.max(TraceDBE.end_time)).filter(*scope).scalar_subquery()
+
+    return SpanDBE.start_time.between(
+        func.coalesce(
+            lower, cast(literal_column("'-infinity'"), TIMESTAMP(timezone=True))
+        ),
+        func.coalesce(
+            upper, cast(literal_column("'infinity'"), TIMESTAMP(timezone=True))
+        ),
+    )
+
+
+async def refresh_traces(
+    session: AsyncSession,
+    *,
+    project_id: UUID,
+    trace_ids: List[UUID],
+) -> None:
+    """
+    Recomputes the summaries of the given traces from all their spans, within
+    the session's transaction, and drops those without spans left. Meant for
+    updates, deletes and retention, as new spans are merged instead (see
+    TracingDAO._merge_traces).
+    """
+    trace_ids = sorted(set(trace_ids))
+
+    if not trace_ids:
+        return
+
+    # Waits for concurrent merges into the same summaries to commit, so that
+    # their spans are seen, and makes later merges apply on top of this one
+    await session.execute(
+        select(TraceDBE.trace_id)
+        .filter(
+            TraceDBE.project_id == project_id,
+            TraceDBE.trace_id.in_(trace_ids),
+        )
+        .order_by(TraceDBE.trace_id)
+        .with_for_update()
+    )
+
+    summaries = _summarize(
+        project_id,
+        [
+            SpanDBE.project_id == project_id,
+            SpanDBE.trace_id.in_(trace_ids),
+        ],
+    )
+
+    columns = [column.name for column in summaries.selected_columns]
+
+    stmt = insert(TraceDBE).from_select(columns, summaries)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TraceDBE.project_id, TraceDBE.trace_id],
+        set_={
+            **{
+                column: stmt.excluded[column]
+                for column in columns
+                if column not in ("project_id", "trace_id")
+            },
+            "updated_at": func.now(),
+        },
+    )
+
+    await session.execute(stmt)
+
+    await session.execute(
+        delete(TraceDBE)
+        .where(
+            TraceDBE.project_id == project_id,
+            TraceDBE.trace_id.in_(trace_ids),
+            ~exists().where(
+                SpanDBE.project_id == TraceDBE.project_id,
+                SpanDBE.trace_id == TraceDBE.trace_id,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
 
 class TracingDAO(TracingDAOInterface):
     def __init__(self):
@@ -58,6 +287,20 @@ class TracingDAO(TracingDAOInterface):
         async with engine.tracing_session() as session:
             try:
                 session.add(span_dbe)
+                await session.flush()
+
+                await self._merge_traces(
+                    session,
+                    project_id=project_id,
+                    span_dbes=[span_dbe],
+                )
+
+                await self._refresh_references(
+                    session,
+                    project_id=project_id,
+                    span_keys=[(span_dbe.trace_id, span_dbe.span_id)],
+                )
+
                 await session.commit()
 
                 link_dto = map_span_dbe_to_link_dto(
@@ -91,6 +334,22 @@ class TracingDAO(TracingDAOInterface):
         async with engine.tracing_session() as session:
             try:
                 session.add_all(span_dbes)
+                await session.flush()
+
+                await self._merge_traces(
+                    session,
+                    project_id=project_id,
+                    span_dbes=span_dbes,
+                )
+
+                await self._refresh_references(
+                    session,
+                    project_id=project_id,
+                    span_keys=[
+                        (span_dbe.trace_id, span_dbe.span_id) for span_dbe in span_dbes
+                    ],
+                )
+
                 await session.commit()
 
                 link_dtos = [
@@ -182,6 +441,20 @@ class TracingDAO(TracingDAOInterface):
                 user_id=user_id,
             )
 
+            await session.flush()
+
+            await refresh_traces(
+                session,
+                project_id=project_id,
+                trace_ids=[existing_span_dbe.trace_id],
+            )
+
+            await self._refresh_references(
+                session,
+                project_id=project_id,
+                span_keys=[(existing_span_dbe.trace_id, existing_span_dbe.span_id)],
+            )
+
             await session.commit()
 
         link_dto = map_span_dbe_to_link_dto(
@@ -206,16 +479,33 @@ class TracingDAO(TracingDAOInterface):
             for span_dto in span_dtos
         ]
 
-        link_dtos: OTelLinks = []
+        if not new_span_dbes:
+            return []
+
         async with engine.tracing_session() as session:
+            # One round-trip to fetch all spans, instead of one per span
+            query = select(SpanDBE).filter(
+                SpanDBE.project_id == project_id,
+                tuple_(SpanDBE.trace_id, SpanDBE.span_id).in_(
+                    {
+                        (new_span_dbe.trace_id, new_span_dbe.span_id)
+                        for new_span_dbe in new_span_dbes
+                    }
+                ),
+            )
+
+            existing_span_dbes = {
+                (span_dbe.trace_id, span_dbe.span_id): span_dbe
+                for span_dbe in (await session.execute(query)).scalars().all()
+            }
+
+            link_dtos: OTelLinks = []
+
             for new_span_dbe in new_span_dbes:
-                query = select(SpanDBE).filter(
-                    SpanDBE.project_id == project_id,
-                    SpanDBE.span_id == new_span_dbe.span_id,
+                existing_span_dbe = existing_span_dbes.get(
+                    (new_span_dbe.trace_id, new_span_dbe.span_id)
                 )
 
-                existing_span_dbe = (await session.execute(query)).scalars().first()
-
                 if not existing_span_dbe:
                     continue
 
@@ -231,6 +521,24 @@ class TracingDAO(TracingDAOInterface):
 
                 link_dtos.append(link_dto)
 
+            # The flush batches the UPDATEs of all spans
+            await session.flush()
+
+            await refresh_traces(
+                session,
+                project_id=project_id,
+                trace_ids=[
+                    existing_span_dbe.trace_id
+                    for existing_span_dbe in existing_span_dbes.values()
+                ],
+            )
+
+            await self._refresh_references(
+                session,
+                project_id=project_id,
+                span_keys=list(existing_span_dbes.keys()),
+            )
+
             await session.commit()
 
         return link_dtos
@@ -242,26 +550,12 @@ class TracingDAO(TracingDAOInterface):
         span_id: UUID,
         user_id: Optional[UUID] = None,
     ) -> Optional[OTelLink]:
-        link_dto: Optional[OTelLink] = None
-        async with engine.tracing_session() as session:
-            query = select(SpanDBE).filter(
-                SpanDBE.project_id == project_id,
-                SpanDBE.span_id == span_id,
-            )
-
-            span_dbe = (await session.execute(query)).scalars().first()
-
-            if not span_dbe:
-                return None
-
-            link_dto = map_span_dbe_to_link_dto(
-                span_dbe=span_dbe,
-            )
-
-            await session.delete(span_dbe)
-            await session.commit()
+        link_dtos = await self._delete_spans(
+            project_id=project_id,
+            where=[SpanDBE.span_id == span_id],
+        )
 
-        return link_dto
+        return link_dtos[0] if link_dtos else None
 
     async def delete_spans(
         self,
@@ -270,30 +564,12 @@ class TracingDAO(TracingDAOInterface):
         span_ids: List[UUID],
         user_id: Optional[UUID] = None,
     ) -> Optional[OTelLinks]:
-        link_dtos: OTelLinks = []
-        async with engine.tracing_session() as session:
-            query = select(SpanDBE).filter(
-                SpanDBE.project_id == project_id,
-                SpanDBE.span_id.in_(span_ids),
-            )
-
-            span_dbes = (await session.execute(query)).scalars().all()
-
-            if not span_dbes:
-                return None
-
-            link_dtos = [
-                map_span_dbe_to_link_dto(
-                    span_dbe=span_dbe,
-                )
-                for span_dbe in span_dbes
-            ]
-
-            for span_dbe in span_dbes:
-                await session.delete(span_dbe)
-            await session.commit()
+        link_dtos = await self._delete_spans(
+            project_id=project_id,
+            where=[SpanDBE.span_id.in_(span_ids)],
+        )
 
-        return link_dtos
+        return link_dtos or None
 
     ### .R.D on traces
 
@@ -308,6 +584,7 @@ class TracingDAO(TracingDAOInterface):
             query = select(SpanDBE).filter(
                 SpanDBE.project_id == project_id,
                 SpanDBE.trace_id == trace_id,
+                _trace_window(project_id, [trace_id]),
             )
 
             span_dbes = (await session.execute(query)).scalars().all()
@@ -335,6 +612,7 @@ class TracingDAO(TracingDAOInterface):
             query = select(SpanDBE).filter(
                 SpanDBE.project_id == project_id,
                 SpanDBE.trace_id.in_(trace_ids),
+                _trace_window(project_id, trace_ids),
             )
 
             span_dbes = (await session.execute(query)).scalars().all()
@@ -358,62 +636,313 @@ class TracingDAO(TracingDAOInterface):
         trace_id: UUID,
         user_id: Optional[UUID] = None,
     ) -> Optional[OTelLinks]:
-        async with engine.tracing_session() as session:
-            query = select(SpanDBE).filter(
-                SpanDBE.project_id == project_id,
-                SpanDBE.trace_id == trace_id,
+        link_dtos = await self._delete_spans(
+            project_id=project_id,
+            where=[SpanDBE.trace_id == trace_id],
+        )
+
+        return link_dtos or None
+
+    async def delete_traces(
+        self,
+        *,
+        project_id: UUID,
+        trace_ids: List[UUID],
+        user_id: Optional[UUID] = None,
+    ) -> Optional[OTelLinks]:
+        link_dtos = await self._delete_spans(
+            project_id=project_id,
+            where=[SpanDBE.trace_id.in_(trace_ids)],
+        )
+
+        return link_dtos or None
+
+    ### Purge on projects
+
+    async def delete_project(
+        self,
+        *,
+        project_id: UUID,
+        chunk_size: int = DELETE_CHUNK_SIZE,
+    ) -> int:
+        """
+        Deletes all spans of a project, one chunk per transaction, and returns
+        how many were deleted. Meant to run as a background job.
+        """
+        count = 0
+
+        async for rows in self._delete_spans_in_chunks(
+            project_id=project_id,
+            where=[],
+            chunk_size=chunk_size,
+            refresh=False,
+        ):
+            count += len(rows)
+
+        # Trace summaries go last, as there is nothing left to summarize
+        while True:
+            chunk = (
+                select(TraceDBE.trace_id)
+                .filter(TraceDBE.project_id == project_id)
+                .limit(chunk_size)
             )
 
-            span_dbes = (await session.execute(query)).scalars().all()
+            stmt = (
+                delete(TraceDBE)
+                .where(
+                    TraceDBE.project_id == project_id,
+                    TraceDBE.trace_id.in_(chunk),
+                )
+                .execution_options(synchronize_session=False)
+            )
 
-            if not span_dbes:
-                return None
+            async with engine.tracing_session() as session:
+                result = await session.execute(stmt)
 
-            for span_dbe in span_dbes:
-                await session.delete(span_dbe)
+            if result.rowcount < chunk_size:
+                break
 
-            await session.commit()
+        return count
 
-        link_dtos = [
-            map_span_dbe_to_link_dto(
-                span_dbe=span_dbe,
+    ### Helpers
+
+    async def _delete_spans(
+        self,
+        *,
+        project_id: UUID,
+        where: list,
+        chunk_size: int = DELETE_CHUNK_SIZE,
+    ) -> OTelLinks:
+        link_dtos: OTelLinks = []
+
+        async for rows in self._delete_spans_in_chunks(
+            project_id=project_id,
+            where=where,
+            chunk_size=chunk_size,
+        ):
+            link_dtos.extend(
+                map_span_dbe_to_link_dto(
+                    span_dbe=row,  # type: ignore
+                )
+                for row in rows
             )
-            for span_dbe in span_dbes
-        ]
 
         return link_dtos
 
-    async def delete_traces(
+    async def _delete_spans_in_chunks(
         self,
         *,
         project_id: UUID,
-        trace_ids: List[UUID],
-        user_id: Optional[UUID] = None,
-    ) -> Optional[OTelLinks]:
-        async with engine.tracing_session() as session:
-            query = select(SpanDBE).filter(
-                SpanDBE.project_id == project_id,
-                SpanDBE.trace_id.in_(trace_ids),
+        where: list,
+        chunk_size: int = DELETE_CHUNK_SIZE,
+        refresh: bool = True,
+    ) -> AsyncGenerator[list, None]:
+        trace_ids = set()
+
+        # DELETE ... RETURNING, without loading the spans, in bounded transactions
+        while True:
+            chunk = (
+                select(SpanDBE.trace_id, SpanDBE.span_id)
+                .filter(
+                    SpanDBE.project_id == project_id,
+                    *where,
+                )
+                .limit(chunk_size)
             )
 
-            span_dbes = (await session.execute(query)).scalars().all()
+            stmt = (
+                delete(SpanDBE)
+                .where(
+                    SpanDBE.project_id == project_id,
+                    tuple_(SpanDBE.trace_id, SpanDBE.span_id).in_(chunk),
+                )
+                .returning(
+                    SpanDBE.project_id,
+                    SpanDBE.trace_id,
+                    SpanDBE.span_id,
+                )
+                .execution_options(synchronize_session=False)
+            )
 
-            if not span_dbes:
-                return None
+            async with engine.tracing_session() as session:
+                rows = (await session.execute(stmt)).all()
 
-            for span_dbe in span_dbes:
-                await session.delete(span_dbe)
+                # References are indexed by span, so they go with each chunk
+                await self._refresh_references(
+                    session,
+                    project_id=project_id,
+                    span_keys=[(row.trace_id, row.span_id) for row in rows],
+                )
 
-            await session.commit()
+            trace_ids.update(row.trace_id for row in rows)
 
-        link_dtos = [
-            map_span_dbe_to_link_dto(
-                span_dbe=span_dbe,
-            )
-            for span_dbe in span_dbes
+            if rows:
+                yield rows
+
+            if len(rows) < chunk_size:
+                break
+
+        if not refresh:
+            return
+
+        # Summaries are recomputed once, from the spans left, rather than per chunk
+        trace_ids = sorted(trace_ids)
+
+        for offset in range(0, len(trace_ids), chunk_size):
+            async with engine.tracing_session() as session:
+                await refresh_traces(
+                    session,
+                    project_id=project_id,
+                    trace_ids=trace_ids[offset : offset + chunk_size],
+                )
+
+    async def _merge_traces(
+        self,
+        session: AsyncSession,
+        *,
+        project_id: UUID,
+        span_dbes: List[SpanDBE],
+    ) -> None:
+        """
+        Merges the given (new) spans into the summaries of their traces, within
+        the session's transaction, without reading the spans already stored.
+        """
+        if not span_dbes:
+            return
+
+        # The new spans only, within the partitions they were written to
+        scope = [
+            SpanDBE.project_id == project_id,
+            tuple_(SpanDBE.trace_id, SpanDBE.span_id).in_(
+                {(span_dbe.trace_id, span_dbe.span_id) for span_dbe in span_dbes}
+            ),
+            SpanDBE.start_time.between(
+                min(span_dbe.start_time for span_dbe in span_dbes),
+                max(span_dbe.start_time for span_dbe in span_dbes),
+            ),
         ]
 
-        return link_dtos
+        summaries = _summarize(project_id, scope)
+
+        columns = [column.name for column in summaries.selected_columns]
+
+        stmt = insert(TraceDBE).from_select(columns, summaries)
+
+        new = stmt.excluded
+
+        # A root span replaces a stand-in (the oldest span), and an older stand-in
+        # replaces a newer one. Stand-ins are always the oldest span of the trace.
+        replace = and_(
+            TraceDBE.parent_id.isnot(None),
+            or_(
+                new.parent_id.is_(None),
+                new.start_time < TraceDBE.start_time,
+            ),
+        )
+
+        references = func.jsonb_array_elements(
+            func.coalesce(TraceDBE.references, func.jsonb_build_array()).op("||")(
+                new["references"]
+            )
+        ).column_valued("reference")
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TraceDBE.project_id, TraceDBE.trace_id],
+            set_={
+                **{
+                    column: case(
+                        (replace, new[column]), else_=getattr(TraceDBE, column)
+                    )
+                    for column in ROOT_COLUMNS
+                },
+                "start_time": func.least(TraceDBE.start_time, new.start_time),
+                "end_time": func.greatest(TraceDBE.end_time, new.end_time),
+                "span_count": TraceDBE.span_count + new.span_count,
+                "has_errors": or_(TraceDBE.has_errors, new.has_errors),
+                "costs": func.coalesce(
+                    TraceDBE.costs + new.costs, TraceDBE.costs, new.costs
+                ),
+                "tokens": func.coalesce(
+                    TraceDBE.tokens + new.tokens, TraceDBE.tokens, new.tokens
+                ),
+                "references": case(
+                    (new["references"].is_(None), TraceDBE.references),
+                    else_=select(
+                        func.jsonb_agg(distinct(references))
+                    ).scalar_subquery(),
+                ),
+                "created_at": func.least(TraceDBE.created_at, new.created_at),
+                "updated_at": func.now(),
+            },
+        )
+
+        await session.execute(stmt)
+
+    async def _refresh_references(
+        self,
+        session: AsyncSession,
+        *,
+        project_id: UUID,
+        span_keys: List[Tuple[UUID, UUID]],
+    ) -> None:
+        """
+        Re-indexes the references of the given spans, by (trace_id, span_id),
+        within the session's transaction, and drops those of deleted spans.
+        """
+        span_keys = sorted(set(span_keys))
+
+        if not span_keys:
+            return
+
+        await session.execute(
+            delete(SpanReferenceDBE)
+            .where(
+                SpanReferenceDBE.project_id == project_id,
+                tuple_(SpanReferenceDBE.trace_id, SpanReferenceDBE.span_id).in_(
+                    span_keys
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        reference = (
+            func.jsonb_array_elements(SpanDBE.references)
+            .table_valued("value", with_ordinality="ordinality")
+            .render_derived(name="reference")
+        )
+
+        ref_id = reference.c.value.op("->>")("id")
+
+        rows = (
+            select(
+                SpanDBE.project_id,
+                SpanDBE.trace_id,
+                SpanDBE.span_id,
+                cast(reference.c.ordinality, Integer).label("ref_index"),
+                reference.c.value.op("->>")("attributes.key").label("ref_type"),
+                case(
+                    (ref_id.op("~*")(UUID_PATTERN), cast(ref_id, SpanDBE.span_id.type)),
+                    else_=None,
+                ).label("ref_id"),
+                reference.c.value.op("->>")("slug").label("ref_slug"),
+                reference.c.value.op("->>")("version").label("ref_version"),
+                SpanDBE.start_time,
+                SpanDBE.created_at,
+            )
+            .select_from(SpanDBE)
+            .join(reference, true())
+            .filter(
+                SpanDBE.project_id == project_id,
+                tuple_(SpanDBE.trace_id, SpanDBE.span_id).in_(span_keys),
+                func.jsonb_typeof(reference.c.value) == "object",
+            )
+        )
+
+        columns = [column.name for column in rows.selected_columns]
+
+        await session.execute(
+            insert(SpanReferenceDBE).from_select(columns, rows).on_conflict_do_nothing()
+        )
 
     ### RPC
 
@@ -423,6 +952,81 @@ class TracingDAO(TracingDAOInterface):
         project_id: UUID,
         query: Query,
     ) -> Optional[OTelFlatSpans]:
+        try:
+            stmt, columns = self._select_spans(
+                project_id=project_id,
+                query=query,
+            )
+
+            async with engine.tracing_session() as session:
+                # QUERY EXECUTION
+                if columns is None:
+                    dbes = (await session.execute(stmt)).scalars().all()
+                else:
+                    dbes = [unproject(row) for row in await session.execute(stmt)]
+                # ---------------
+
+            if not dbes:
+                return []
+
+            span_dtos = [map_span_dbe_to_span_dto(span_dbe=dbe) for dbe in dbes]
+
+            return span_dtos
+
+        except Exception as e:
+            log.error(f"{type(e).__name__}: {e}")
+            log.error(format_exc())
+            raise e
+
+    def stream(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncGenerator[OTelFlatSpans, None]:
+        # Built up front, so that filtering errors are raised before streaming
+        stmt, columns = self._select_spans(
+            project_id=project_id,
+            query=query,
+            contiguous=True,
+        )
+
+        return self._stream_spans(
+            stmt=stmt.execution_options(yield_per=batch_size),
+            columns=columns,
+        )
+
+    async def _stream_spans(
+        self,
+        *,
+        stmt: Select,
+        columns: Optional[List[Column]],
+    ) -> AsyncGenerator[OTelFlatSpans, None]:
+        # Server-side cursor, fetching batch_size rows at a time
+        async with engine.tracing_session() as session:
+            result = await session.stream(stmt)
+
+            if columns is None:
+                batches = result.scalars().partitions()
+            else:
+                batches = result.partitions()
+
+            async for batch in batches:
+                yield [
+                    map_span_dbe_to_span_dto(
+                        span_dbe=dbe if columns is None else unproject(dbe),
+                    )
+                    for dbe in batch
+                ]
+
+    def _select_spans(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+        contiguous: bool = False,
+    ) -> Tuple[Select, Optional[List[Column]]]:
         _query = query
 
         # DE-STRUCTURING ARGS
@@ -431,38 +1035,145 @@ class TracingDAO(TracingDAOInterface):
         filtering = _query.filtering
 
         focus = formatting.focus if formatting else None
+        fields = formatting.fields if formatting else None
 
         oldest = windowing.oldest if windowing else None
         newest = windowing.newest if windowing else None
         limit = windowing.limit if windowing else None
 
-        operator = filtering.operator if filtering else None
-        conditions = filtering.conditions if filtering else None
+        # Merged queries always hold a filtering, if only an empty one
+        filtered = bool(filtering and filtering.conditions)
+
+        where, relevance = plan(filtering) if filtered else (None, None)
         # -------------------
 
-        try:
-            async with engine.tracing_session() as session:
-                # BASE (SUB-)QUERY
-                query: Select = select(SpanDBE)
-                # ----------------
+        # PROJECTION
+        columns = project(fields)
 
-                # GROUPING
-                if focus == Focus.TRACE:
-                    distinct_ids = distinct(SpanDBE.trace_id).label("grouping_key")
+        entity = select(SpanDBE) if columns is None else select(*columns)
+        # ----------
 
-                    query = select(distinct_ids, SpanDBE.start_time)
-                # --------
+        # BASE (SUB-)QUERY
+        query: Select = entity
+        # ----------------
+
+        # Without filtering, traces are picked from their summaries, while filters
+        # match any span of a trace, so they go through spans
+        summarized = focus == Focus.TRACE and not filtered
+
+        dbe = TraceDBE if summarized else SpanDBE
+
+        # GROUPING
+        if summarized:
+            query = select(TraceDBE.trace_id.label("grouping_key"))
+
+        elif focus == Focus.TRACE:
+            distinct_ids = distinct(SpanDBE.trace_id).label("grouping_key")
+
+            query = select(distinct_ids, SpanDBE.start_time)
+
+            if relevance is not None:
+                relevance = relevance.label("relevance")
+
+                query = query.add_columns(relevance)
+        # --------
+
+        # SCOPING
+        query = query.filter(dbe.project_id == project_id)
+        # -------
+
+        # WINDOWING
+        if oldest:
+            query = query.filter(dbe.start_time >= oldest)
+
+        if newest:
+            query = query.filter(dbe.start_time < newest)
+        # ---------
+
+        # DEBUGGING
+        log.trace(_query)
+        # ---------
+
+        # FILTERING
+        if filtered:
+            query = query.filter(where)
+        # ---------
+
+        # SORTING
+        if relevance is not None:  # most relevant first, when searching
+            query = query.order_by(relevance.desc())
+
+        query = query.order_by(dbe.start_time.desc())
+        # -------
+
+        # WINDOWING
+        if limit:
+            query = query.limit(limit)
+        # --------
+
+        # GROUPING
+        if focus == Focus.TRACE:
+            subquery = select(query.subquery().c["grouping_key"])
+
+            query = entity
+
+            query = query.filter(SpanDBE.trace_id.in_(subquery))
+
+            if summarized:  # only the partitions holding the traces
+                query = query.filter(
+                    SpanDBE.project_id == project_id,
+                    _trace_window(project_id, subquery),
+                )
+
+            # SORTING
+            if contiguous:  # spans of a trace one after the other, when streaming
+                query = query.order_by(SpanDBE.trace_id)
+
+            query = query.order_by(SpanDBE.start_time.asc())
+            # -------
+        # --------
+
+        # DEBUGGING
+        if SQL_TRACE_ENABLED:
+            log.trace(str(query.compile(**DEBUG_ARGS)).replace("\n", " "))
+        # ---------
+
+        return query, columns
+
+    async def query_traces(
+        self,
+        *,
+        project_id: UUID,
+        query: Query,
+    ) -> Optional[OTelTraceSummaries]:
+        _query = query
+
+        # DE-STRUCTURING ARGS
+        windowing = _query.windowing
+        filtering = _query.filtering
+
+        oldest = windowing.oldest if windowing else None
+        newest = windowing.newest if windowing else None
+        limit = windowing.limit if windowing else None
+
+        # -------------------
+
+        try:
+            async with engine.tracing_session() as session:
+                # BASE QUERY
+                query: Select = select(TraceDBE)
+                # ----------
 
                 # SCOPING
-                query = query.filter(SpanDBE.project_id == project_id)
+                query = query.filter(TraceDBE.project_id == project_id)
                 # -------
 
                 # WINDOWING
                 if oldest:
-                    query = query.filter(SpanDBE.start_time >= oldest)
+                    query = query.filter(TraceDBE.start_time >= oldest)
 
                 if newest:
-                    query = query.filter(SpanDBE.start_time < newest)
+                    query = query.filter(TraceDBE.start_time < newest)
                 # ---------
 
                 # DEBUGGING
@@ -470,12 +1181,14 @@ class TracingDAO(TracingDAOInterface):
                 # ---------
 
                 # FILTERING
-                if filtering:
-                    query = query.filter(combine(operator, filter(conditions)))
+                if filtering and filtering.conditions:
+                    where, _ = plan(filtering, TraceDBE)
+
+                    query = query.filter(where)
                 # ---------
 
                 # SORTING
-                query = query.order_by(SpanDBE.start_time.desc())
+                query = query.order_by(TraceDBE.start_time.desc())
                 # -------
 
                 # WINDOWING
@@ -483,21 +1196,9 @@ class TracingDAO(TracingDAOInterface):
                     query = query.limit(limit)
                 # --------
 
-                # GROUPING
-                if focus == Focus.TRACE:
-                    subquery = select(query.subquery().c["grouping_key"])
-
-                    query = select(SpanDBE)
-
-                    query = query.filter(SpanDBE.trace_id.in_(subquery))
-
-                    # SORTING
-                    query = query.order_by(SpanDBE.start_time.asc())
-                    # -------
-                # --------
-
                 # DEBUGGING
-                log.trace(str(query.compile(**DEBUG_ARGS)).replace("\n", " "))
+                if SQL_TRACE_ENABLED:
+                    log.trace(str(query.compile(**DEBUG_ARGS)).replace("\n", " "))
                 # ---------
 
                 # QUERY EXECUTION
@@ -507,9 +1208,11 @@ class TracingDAO(TracingDAOInterface):
             if not dbes:
                 return []
 
-            span_dtos = [map_span_dbe_to_span_dto(span_dbe=dbe) for dbe in dbes]
+            trace_summary_dtos = [
+                map_trace_dbe_to_trace_summary_dto(trace_dbe=dbe) for dbe in dbes
+            ]
 
-            return span_dtos
+            return trace_summary_dtos
 
         except Exception as e:
             log.error(f"{type(e).__name__}: {e}")
@@ -1,5 +1,7 @@
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy import Column, UUID, TIMESTAMP, Enum as ENUM, VARCHAR, func
+from sqlalchemy import Integer, Boolean, Float
+from sqlalchemy.orm import mapped_column
 
 from oss.src.core.tracing.dtos import OTelStatusCode as StatusCode
 from oss.src.core.tracing.dtos import OTelSpanKind as SpanKind
@@ -27,11 +29,71 @@ class SpanDBA:
     references = Column(JSONB(none_as_null=True), nullable=True)
 
 
-# class FullTextSearchDBA:
-#     content = Column(
-#         VARCHAR,
-#         nullable=True,
-#     )  # for full text search
+class TraceDBA:
+    __abstract__ = True
+
+    trace_id = Column(UUID, nullable=False)
+    span_id = Column(UUID, nullable=False)  # of the root span
+
+    # ROOT SPAN
+    parent_id = Column(UUID, nullable=True)  # if the root span is missing
+    span_kind = Column(ENUM(SpanKind), nullable=False)
+    span_name = Column(VARCHAR, nullable=False)
+
+    status_code = Column(ENUM(StatusCode), nullable=False)
+    status_message = Column(VARCHAR, nullable=True)
+
+    attributes = Column(JSONB(none_as_null=True), nullable=True)
+
+    # ALL SPANS
+    start_time = Column(TIMESTAMP(timezone=True), nullable=False)
+    end_time = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    span_count = Column(Integer, nullable=False)
+    has_errors = Column(Boolean, nullable=False)
+
+    costs = Column(Float, nullable=True)
+    tokens = Column(Float, nullable=True)
+
+    references = Column(JSONB(none_as_null=True), nullable=True)
+
+    # LIFECYCLE
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)  # of the spans
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class SpanReferenceDBA:
+    __abstract__ = True
+
+    trace_id = Column(UUID, nullable=False)
+    span_id = Column(UUID, nullable=False)
+    ref_index = Column(Integer, nullable=False)  # in the span's references
+
+    ref_type = Column(VARCHAR, nullable=True)  # e.g. "application", from attributes.key
+    ref_id = Column(UUID, nullable=True)
+    ref_slug = Column(VARCHAR, nullable=True)
+    ref_version = Column(VARCHAR, nullable=True)
+
+    # OF THE SPAN
+    start_time = Column(TIMESTAMP(timezone=True), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
+FTS_CONFIG = "simple"  # no stemming nor stop words, as content is multilingual
+
+
+class FullTextSearchDBA:
+    # Filled by a trigger, on insert and on update, from inputs and outputs
+    # (see the migration that adds it, which backfills it without a rewrite)
+    content = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        deferred=True,  # only needed to search, never to read
+    )  # for full text search
 
 
 class ProjectScopeDBA:
@@ -7,9 +7,11 @@ from sqlalchemy import (
 from oss.src.dbs.postgres.shared.base import Base
 from oss.src.dbs.postgres.tracing.dbas import (
     SpanDBA,
+    TraceDBA,
+    SpanReferenceDBA,
     ProjectScopeDBA,
     LifecycleDBA,
-    # FullTextSearchDBA,
+    FullTextSearchDBA,
 )
 
 
@@ -18,7 +20,7 @@ class SpanDBE(
     ProjectScopeDBA,
     SpanDBA,
     LifecycleDBA,
-    # FullTextSearchDBA,
+    FullTextSearchDBA,
 ):
     __tablename__ = "spans"
 
@@ -27,7 +29,8 @@ class SpanDBE(
             "project_id",
             "trace_id",
             "span_id",
-        ),  # for uniqueness
+            "start_time",
+        ),  # for uniqueness (including the partition key)
         # ForeignKeyConstraint(
         #     ["project_id"],
         #     ["projects.id"],
@@ -74,4 +77,82 @@ class SpanDBE(
             postgresql_using="gin",
             postgresql_ops={"references": "jsonb_path_ops"},
         ),  # for filtering
+        Index(
+            "ix_content_gin",
+            "content",
+            postgresql_using="gin",
+        ),  # for full text search
+        {
+            "postgresql_partition_by": "RANGE (start_time)",
+        },  # for retention (see shared/partitions.py)
+    )
+
+
+class TraceDBE(
+    Base,
+    ProjectScopeDBA,
+    TraceDBA,
+):
+    __tablename__ = "traces"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "trace_id",
+        ),  # for uniqueness
+        Index(
+            "ix_traces_project_id_start_time",
+            "project_id",
+            "start_time",
+        ),  # for sorting and scrolling
+        Index(
+            "ix_traces_start_time",
+            "start_time",
+        ),  # for retention
+        Index(
+            "ix_traces_attributes_gin",
+            "attributes",
+            postgresql_using="gin",
+        ),  # for filtering
+        Index(
+            "ix_traces_references_gin",
+            "references",
+            postgresql_using="gin",
+            postgresql_ops={"references": "jsonb_path_ops"},
+        ),  # for filtering
+    )
+
+
+class SpanReferenceDBE(
+    Base,
+    ProjectScopeDBA,
+    SpanReferenceDBA,
+):
+    __tablename__ = "span_references"
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "project_id",
+            "trace_id",
+            "span_id",
+            "ref_index",
+        ),  # for uniqueness (and maintenance, by span)
+        Index(
+            "ix_span_references_project_id_ref_id_start_time",
+            "project_id",
+            "ref_id",
+            "start_time",
+            postgresql_include=["trace_id", "span_id"],
+        ),  # for filtering (and sorting), by reference id
+        Index(
+            "ix_span_references_project_id_ref_slug_start_time",
+            "project_id",
+            "ref_slug",
+            "start_time",
+            postgresql_include=["trace_id", "span_id"],
+        ),  # for filtering (and sorting), by reference slug
+        Index(
+            "ix_span_references_start_time",
+            "start_time",
+        ),  # for retention
     )
@@ -3,12 +3,13 @@ from json import dumps
 from uuid import UUID
 
 from oss.src.utils.logging import get_module_logger
-from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE, TraceDBE
 from oss.src.core.tracing.dtos import (
     OTelLink,
     OTelSpan,
     OTelSpanKind,
     OTelStatusCode,
+    OTelTraceSummary,
     Link,
 )
 from oss.src.core.tracing.utils import marshall, unmarshall, parse_ref_id_to_uuid
@@ -49,9 +50,7 @@ def map_span_dbe_to_span_dbe(
     # LIFECYCLE
     existing_span_dbe.updated_by_id = user_id
     # FULL TEXT SEARCH
-    # existing_span_dbe.content = dumps(
-    #     map_span_dbe_to_span_dto(new_span_dbe).model_dump()
-    # )
+    # content is filled by a trigger
 
     return existing_span_dbe
 
@@ -134,7 +133,34 @@ def map_span_dto_to_span_dbe(
         # LIFECYCLE
         created_by_id=user_id,
         # FULL TEXT SEARCH
-        # content=dumps(span_dto.model_dump()),
+        # content is filled by a trigger
     )
 
     return span_dbe
+
+
+def map_trace_dbe_to_trace_summary_dto(
+    trace_dbe: TraceDBE,
+) -> OTelTraceSummary:
+    trace_summary_dto = OTelTraceSummary(
+        trace_id=str(trace_dbe.trace_id),
+        span_id=str(trace_dbe.span_id),
+        span_kind=OTelSpanKind(trace_dbe.span_kind),
+        span_name=trace_dbe.span_name,
+        start_time=trace_dbe.start_time,
+        end_time=trace_dbe.end_time,
+        status_code=OTelStatusCode(trace_dbe.status_code),
+        status_message=trace_dbe.status_message,
+        attributes=trace_dbe.attributes,
+        span_count=trace_dbe.span_count,
+        has_errors=trace_dbe.has_errors,
+        costs=trace_dbe.costs,
+        tokens=trace_dbe.tokens,
+        references=(
+            [unmarshall(reference) for reference in trace_dbe.references]
+            if trace_dbe.references
+            else None
+        ),
+    )
+
+    return trace_summary_dto
@@ -1,17 +1,23 @@
-from typing import Any, Optional, List, Dict, Union
+from typing import Any, Callable, Optional, List, Dict, Tuple, Union
+from collections import OrderedDict
+from contextvars import ContextVar
+from operator import itemgetter
 from datetime import datetime
 from hashlib import blake2b
 from json import dumps
+from uuid import UUID
 
-from sqlalchemy import and_, or_, not_, cast, Column, text, bindparam, Text
+from sqlalchemy import and_, or_, not_, cast, exists, Column, text, bindparam, Text, Row
 from sqlalchemy import TIMESTAMP, Enum, Integer, String, Boolean, Float
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.sql import false, func, ClauseElement, ColumnElement
+from sqlalchemy.sql import false, func, literal_column, ClauseElement, ColumnElement
+from sqlalchemy.sql.elements import BindParameter
 
 
 from oss.src.utils.logging import get_module_logger
 
-from oss.src.dbs.postgres.tracing.dbes import SpanDBE
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE, SpanReferenceDBE
+from oss.src.dbs.postgres.tracing.dbas import FTS_CONFIG
 
 from oss.src.core.tracing.dtos import (
     Filtering,
@@ -37,14 +43,104 @@ from oss.src.core.tracing.dtos import (
     StringOperator,
     ListOperator,
     ExistenceOperator,
+    SearchOperator,
 )
 from oss.src.core.shared.dtos import Reference
 
 log = get_module_logger(__name__)
 
+FILTER_PLANS_CACHE_SIZE = 1_024  # built filters, by shape of filtering (and table)
+
+# Values bound by the filter being built, as (name, path, get), see _bind()
+_Binds = List[Tuple[str, Tuple[int, ...], Optional[Callable[[Any], Any]]]]
+
+_FilterPlan = Tuple[ClauseElement, Optional[ColumnElement], _Binds]
+
+_filter_plans: "OrderedDict[str, _FilterPlan]" = OrderedDict()
+
+_plan_binds: ContextVar[Optional[_Binds]] = ContextVar("plan_binds", default=None)
+_plan_path: ContextVar[Tuple[int, ...]] = ContextVar("plan_path", default=())
+
 # UTILS
 
 
+def _bind(
+    value: Any,
+    get: Optional[Callable[[Any], Any]] = None,
+    type_: Optional[Any] = None,
+    compared_to: Optional[ColumnElement] = None,
+    expanding: bool = False,
+) -> BindParameter:
+    """
+    Binds the value of the condition being built, or get(value). While planning,
+    the parameter is named and recorded, so that plan() can bind the value of
+    another condition of the same shape to it. Without a type, it is typed as a
+    plain value compared to `compared_to` (or on its own) would be.
+    """
+    binds = _plan_binds.get()
+
+    name = None
+
+    if binds is not None:
+        name = f"filter_{len(binds)}"
+
+        binds.append((name, _plan_path.get(), get))
+
+    bound = get(value) if get else value
+
+    if type_ is None and compared_to is not None:
+        type_ = compared_to.type.coerce_compared_value(None, bound)
+
+    return bindparam(
+        name,
+        bound,
+        type_=type_,
+        expanding=expanding,
+    )
+
+
+def _bind_list(
+    attribute: ColumnElement,
+    value: List[Any],
+    index: Optional[int] = None,
+) -> BindParameter:
+    # All the values (or one of them) in a single parameter, as IN (...) does
+    return _bind(
+        value,
+        (lambda v: [v[index]]) if index is not None else None,
+        type_=attribute.type,
+        expanding=True,
+    )
+
+
+def _fingerprint(
+    value: Any,
+) -> Any:
+    # Types, lengths and keys of a value, and whether strings are empty
+    if isinstance(value, Filtering):
+        return [value.operator, [_fingerprint(item) for item in value.conditions]]
+
+    if isinstance(value, Condition):
+        return [
+            value.field,
+            value.key,
+            value.operator,
+            value.options.model_dump() if value.options else None,
+            _fingerprint(value.value),
+        ]
+
+    if isinstance(value, list):
+        return [_fingerprint(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _fingerprint(item) for key, item in value.items()}
+
+    if isinstance(value, str):
+        return "str" if value else ""
+
+    return type(value).__name__
+
+
 def _to_nested_value(
     key: str,
     value: Any,
@@ -63,6 +159,19 @@ def _to_nested_value(
     return value
 
 
+def _get_attribute(
+    dbe: type,
+    field: str,
+) -> Column:
+    # e.g. trace summaries only hold the fields of the root span
+    if not hasattr(dbe, field):
+        raise FilteringException(
+            f"Unsupported condition field for {dbe.__tablename__}: {field}",
+        )
+
+    return getattr(dbe, field)
+
+
 # OPERATORS
 
 
@@ -76,9 +185,7 @@ def _handle_comparison_operator(
     clauses = []
 
     if key is not None:
-        value = _to_nested_value(key, value)
-        value = dumps(value)
-        value = bindparam(None, value, type_=Text)
+        value = _bind(value, lambda v: dumps(_to_nested_value(key, v)), type_=Text)
         value = cast(value, JSONB)
 
         if operator == ComparisonOperator.IS:
@@ -91,12 +198,12 @@ def _handle_comparison_operator(
             if value is None:
                 clauses.append(attribute.is_(None))
             else:
-                clauses.append(attribute == value)
+                clauses.append(attribute == _bind(value, compared_to=attribute))
         elif operator == ComparisonOperator.IS_NOT:
             if value is None:
                 clauses.append(attribute.isnot(None))
             else:
-                clauses.append(attribute != value)
+                clauses.append(attribute != _bind(value, compared_to=attribute))
 
     return clauses
 
@@ -132,19 +239,24 @@ def _handle_numeric_operator(
             attribute = cast(attribute, String)
 
     if operator == NumericOperator.EQ:
-        clauses.append(attribute == value)
+        clauses.append(attribute == _bind(value, compared_to=attribute))
     elif operator == NumericOperator.NEQ:
-        clauses.append(attribute != value)
+        clauses.append(attribute != _bind(value, compared_to=attribute))
     elif operator == NumericOperator.GT:
-        clauses.append(attribute > value)
+        clauses.append(attribute > _bind(value, compared_to=attribute))
     elif operator == NumericOperator.LT:
-        clauses.append(attribute < value)
+        clauses.append(attribute < _bind(value, compared_to=attribute))
     elif operator == NumericOperator.GTE:
-        clauses.append(attribute >= value)
+        clauses.append(attribute >= _bind(value, compared_to=attribute))
     elif operator == NumericOperator.LTE:
-        clauses.append(attribute <= value)
+        clauses.append(attribute <= _bind(value, compared_to=attribute))
     elif operator == NumericOperator.BETWEEN:
-        clauses.append(attribute.between(value[0], value[1]))
+        clauses.append(
+            attribute.between(
+                _bind(value, itemgetter(0), compared_to=attribute),
+                _bind(value, itemgetter(1), compared_to=attribute),
+            )
+        )
 
     return clauses
 
@@ -172,42 +284,45 @@ def _handle_string_operator(
     case_sensitive = options.case_sensitive if options else False
     exact_match = options.exact_match if options else False
 
+    def _pattern(get: Optional[Callable[[str], str]] = None) -> BindParameter:
+        return _bind(value, get, compared_to=attribute)
+
     if operator == StringOperator.STARTSWITH:
         clauses.append(
-            attribute.startswith(value)  # --------
+            attribute.startswith(_pattern())  # --------
             if case_sensitive
-            else attribute.ilike(f"{value}%")
+            else attribute.ilike(_pattern(lambda v: f"{v}%"))
         )
     elif operator == StringOperator.ENDSWITH:
         clauses.append(
-            attribute.endswith(value)  # ----------
+            attribute.endswith(_pattern())  # ----------
             if case_sensitive
-            else attribute.ilike(f"%{value}")
+            else attribute.ilike(_pattern(lambda v: f"%{v}"))
         )
     elif operator == StringOperator.CONTAINS:
         clauses.append(
-            attribute.contains(value)  # ----------
+            attribute.contains(_pattern())  # ----------
             if case_sensitive
-            else attribute.ilike(f"%{value}%")
+            else attribute.ilike(_pattern(lambda v: f"%{v}%"))
         )
     elif operator == StringOperator.LIKE:
         clauses.append(
-            attribute.like(value)  # --------------
+            attribute.like(_pattern())  # --------------
             if case_sensitive
-            else attribute.ilike(value)
+            else attribute.ilike(_pattern())
         )
     elif operator == StringOperator.MATCHES:
         if exact_match:
             clauses.append(
-                attribute == value  # -------------
+                attribute == _pattern()  # -------------
                 if case_sensitive
-                else attribute.ilike(value)
+                else attribute.ilike(_pattern())
             )
         else:
             clauses.append(
-                attribute.like(f"%{value}%")  # ---
+                attribute.like(_pattern(lambda v: f"%{v}%"))  # ---
                 if case_sensitive
-                else attribute.ilike(f"%{value}%")
+                else attribute.ilike(_pattern(lambda v: f"%{v}%"))
             )
 
     return clauses
@@ -230,31 +345,32 @@ def _handle_list_operator(
 
     if key is not None and not marshalled:
         attribute = attribute[key]
-        for v in value:
-            bound = bindparam(None, f"[{v}]", type_=Text)
+        for i in range(len(value)):
+            bound = _bind(value, lambda v, i=i: f"[{v[i]}]", type_=Text)
             casted = cast(bound, JSONB)
             subclauses.append(attribute.contains(casted))
 
     elif marshalled:
-        for v in value:
-            bound = bindparam(None, dumps([v]), type_=Text)  # Wrap in array
+        for i in range(len(value)):
+            # Wrap in array
+            bound = _bind(value, lambda v, i=i: dumps([v[i]]), type_=Text)
             casted = cast(bound, JSONB)
             subclauses.append(attribute.contains(casted))
 
     else:
         if operator == ListOperator.IN:
             if options.all:
-                for v in value:
-                    clauses.append(attribute.in_([v]))
+                for i in range(len(value)):
+                    clauses.append(attribute.in_(_bind_list(attribute, value, i)))
             else:
-                clauses.append(attribute.in_(value))
+                clauses.append(attribute.in_(_bind_list(attribute, value)))
             return clauses
         elif operator == ListOperator.NOT_IN:
             if options.all:
-                for v in value:
-                    clauses.append(attribute.notin_([v]))
+                for i in range(len(value)):
+                    clauses.append(attribute.notin_(_bind_list(attribute, value, i)))
             else:
-                clauses.append(attribute.notin_(value))
+                clauses.append(attribute.notin_(_bind_list(attribute, value)))
             return clauses
 
     if operator == ListOperator.IN:
@@ -284,13 +400,12 @@ def _handle_dict_operator(
         attribute = attribute[key]
 
         if operator == DictOperator.HAS:
-            clauses.append(attribute == value)
+            clauses.append(attribute == _bind(value, compared_to=attribute))
         elif operator == DictOperator.HAS_NOT:
-            clauses.append(attribute != value)
+            clauses.append(attribute != _bind(value, compared_to=attribute))
 
     else:
-        value = [{key: value}]
-        value = bindparam(None, dumps(value), type_=Text)
+        value = _bind(value, lambda v: dumps([{key: v}]), type_=Text)
         value = cast(value, JSONB)
 
         if operator == DictOperator.HAS:
@@ -323,11 +438,36 @@ def _handle_existence_operator(
     return clauses
 
 
+def _handle_search_operator(
+    *,
+    attribute: ColumnElement,
+    operator: SearchOperator,
+    value: str,
+) -> List[ClauseElement]:
+    clauses = []
+
+    if operator == SearchOperator.SEARCH:
+        clauses.append(attribute.bool_op("@@")(_to_tsquery(_bind(value, type_=String))))
+
+    return clauses
+
+
+def _to_tsquery(
+    value: ColumnElement,
+) -> ColumnElement:
+    # e.g. 'paris "eiffel tower" -london', as in web search engines
+    return func.websearch_to_tsquery(
+        literal_column(f"'{FTS_CONFIG}'::regconfig"),
+        value,
+    )
+
+
 # FIELDS
 
 
 def _handle_attributes_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -335,7 +475,7 @@ def _handle_attributes_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute: Column = getattr(SpanDBE, field)
+    attribute: Column = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses = []
@@ -390,8 +530,84 @@ def _handle_attributes_field(
     return clauses
 
 
+def _handle_references_operator(
+    operator: ListOperator,
+    value: List[Dict[str, Any]],
+    options: Optional[ListOptions] = None,
+) -> List[ClauseElement]:
+    clauses: List[ClauseElement] = []
+
+    if not isinstance(options, ListOptions):
+        options = ListOptions()
+
+    subclauses: List[ClauseElement] = []
+
+    # A semi-join on the references index, by (project_id, ref_id | ref_slug),
+    # instead of a containment check on each span's references
+    for i, v in enumerate(value):
+        matches: List[ClauseElement] = []
+
+        if v.get("id"):
+            matches.append(
+                SpanReferenceDBE.ref_id
+                == _bind(
+                    value,
+                    lambda v, i=i: UUID(str(v[i]["id"])),
+                    compared_to=SpanReferenceDBE.ref_id,
+                )
+            )
+
+        if v.get("slug"):
+            matches.append(
+                SpanReferenceDBE.ref_slug
+                == _bind(
+                    value,
+                    lambda v, i=i: v[i]["slug"],
+                    compared_to=SpanReferenceDBE.ref_slug,
+                )
+            )
+
+        subclauses.append(
+            exists().where(
+                SpanReferenceDBE.project_id == SpanDBE.project_id,
+                SpanReferenceDBE.trace_id == SpanDBE.trace_id,
+                SpanReferenceDBE.span_id == SpanDBE.span_id,
+                *matches,
+            )
+        )
+
+    if operator == ListOperator.IN:
+        if options.all:
+            clauses.extend(subclauses)
+        else:
+            clauses.append(or_(*subclauses))
+    elif operator == ListOperator.NOT_IN:
+        if options.all:
+            clauses.extend([not_(sc) for sc in subclauses])
+        else:
+            clauses.append(not_(or_(*subclauses)))
+
+    return clauses
+
+
+def _handle_references_field(
+    condition: Condition,
+    dbe: type = SpanDBE,
+) -> List[ClauseElement]:
+    # Trace summaries are filtered on their (GIN-indexed) references instead
+    if dbe is not SpanDBE or not isinstance(condition.operator, ListOperator):
+        return _handle_list_field(condition, dbe)
+
+    return _handle_references_operator(
+        operator=condition.operator,
+        value=condition.value,
+        options=condition.options,
+    )
+
+
 def _handle_list_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -399,7 +615,7 @@ def _handle_list_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute = getattr(SpanDBE, field)
+    attribute = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses: List[ClauseElement] = []
@@ -445,6 +661,7 @@ def _handle_list_field(
 
 def _handle_enum_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -452,7 +669,7 @@ def _handle_enum_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute: Column = getattr(SpanDBE, field)
+    attribute: Column = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses = []
@@ -480,6 +697,7 @@ def _handle_enum_field(
 
 def _handle_string_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -487,7 +705,7 @@ def _handle_string_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute: Column = getattr(SpanDBE, field)
+    attribute: Column = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses = []
@@ -533,6 +751,7 @@ def _handle_string_field(
 
 def _handle_timestamp_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -540,7 +759,7 @@ def _handle_timestamp_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute: Column = getattr(SpanDBE, field)
+    attribute: Column = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses = []
@@ -583,8 +802,34 @@ def _handle_timestamp_field(
     return clauses
 
 
+def _handle_content_field(
+    condition: Condition,
+    dbe: type = SpanDBE,
+) -> List[ClauseElement]:
+    # ------------------------- #
+    field = condition.field
+    value = condition.value
+    operator = condition.operator
+    attribute: Column = _get_attribute(dbe, field)
+    # ------------------------- #
+
+    clauses = []
+
+    if isinstance(operator, SearchOperator):
+        clauses.extend(
+            _handle_search_operator(
+                attribute=attribute,
+                operator=operator,
+                value=value,
+            )
+        )
+
+    return clauses
+
+
 def _handle_uuid_field(
     condition: Condition,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     # ------------------------- #
     field = condition.field
@@ -592,7 +837,7 @@ def _handle_uuid_field(
     value = condition.value
     options = condition.options
     operator = condition.operator
-    attribute: Column = getattr(SpanDBE, field)
+    attribute: Column = _get_attribute(dbe, field)
     # ------------------------- #
 
     clauses = []
@@ -627,6 +872,73 @@ def _handle_uuid_field(
     return clauses
 
 
+# PROJECTION
+
+# Always selected, as needed to build spans (and trees of spans)
+_SPAN_KEYS = [
+    Fields.TRACE_ID,
+    Fields.SPAN_ID,
+    Fields.PARENT_ID,
+    Fields.SPAN_KIND,
+    Fields.SPAN_NAME,
+    Fields.START_TIME,
+    Fields.END_TIME,
+    Fields.STATUS_CODE,
+]
+
+
+def project(
+    fields: Optional[List[str]] = None,
+) -> Optional[List[ColumnElement]]:
+    """
+    Returns the columns to select for the given fields, i.e. whole columns or
+    attributes sub-paths (as 'attributes.ag.metrics'), or None for whole spans.
+    """
+    if fields is None:
+        return None
+
+    names = [*_SPAN_KEYS, *(field for field in fields if "." not in field)]
+
+    columns = {name: getattr(SpanDBE, name) for name in names}
+
+    for field in fields:
+        column, _, path = field.partition(".")
+
+        # Sub-paths are left out when their whole column is selected
+        if path and column not in columns:
+            columns[field] = SpanDBE.attributes[tuple(path.split("."))].label(field)
+
+    return list(columns.values())
+
+
+def unproject(
+    row: Row,
+) -> SpanDBE:
+    """
+    Builds a (transient) span from a row of projected columns, with attributes
+    sub-paths nested back into attributes.
+    """
+    values: Dict[str, Any] = {}
+
+    for key, value in row._mapping.items():
+        column, _, path = key.partition(".")
+
+        if not path:
+            values[column] = value
+
+        elif value is not None:
+            node = values.setdefault(column, {})
+
+            *parents, leaf = path.split(".")
+
+            for parent in parents:
+                node = node.setdefault(parent, {})
+
+            node[leaf] = value
+
+    return SpanDBE(**values)
+
+
 # COMBINE / FILTER
 
 
@@ -657,60 +969,166 @@ def combine(
 
 def filter(  # pylint:disable=redefined-builtin
     filtering: Filtering,
+    dbe: type = SpanDBE,
 ) -> List[ClauseElement]:
     clauses = []
 
-    for condition in filtering:
+    path = _plan_path.get()
+
+    for index, condition in enumerate(filtering):
+        # Where the values bound next come from, see _bind()
+        _plan_path.set((*path, index))
+
         if isinstance(condition, Filtering):
             operator = condition.operator
             conditions = condition.conditions
 
-            clauses.append(combine(operator, filter(conditions)))
+            clauses.append(combine(operator, filter(conditions, dbe)))
 
         elif isinstance(condition, Condition):
             field = condition.field
 
             if field == Fields.TRACE_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             elif field == Fields.SPAN_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             elif field == Fields.PARENT_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             elif field == Fields.SPAN_KIND:
-                clauses.extend(_handle_enum_field(condition))
+                clauses.extend(_handle_enum_field(condition, dbe))
             elif field == Fields.SPAN_NAME:
-                clauses.extend(_handle_string_field(condition))
+                clauses.extend(_handle_string_field(condition, dbe))
             elif field == Fields.START_TIME:
-                clauses.extend(_handle_timestamp_field(condition))
+                clauses.extend(_handle_timestamp_field(condition, dbe))
             elif field == Fields.END_TIME:
-                clauses.extend(_handle_timestamp_field(condition))
+                clauses.extend(_handle_timestamp_field(condition, dbe))
             elif field == Fields.STATUS_CODE:
-                clauses.extend(_handle_enum_field(condition))
+                clauses.extend(_handle_enum_field(condition, dbe))
             elif field == Fields.STATUS_MESSAGE:
-                clauses.extend(_handle_string_field(condition))
+                clauses.extend(_handle_string_field(condition, dbe))
             elif field == Fields.ATTRIBUTES:
-                clauses.extend(_handle_attributes_field(condition))
+                clauses.extend(_handle_attributes_field(condition, dbe))
             elif field == Fields.LINKS:
-                clauses.extend(_handle_list_field(condition))
+                clauses.extend(_handle_list_field(condition, dbe))
             elif field == Fields.REFERENCES:
-                clauses.extend(_handle_list_field(condition))
+                clauses.extend(_handle_references_field(condition, dbe))
             # elif field == Fields.EVENTS:
-            #     clauses.extend(_handle_events_field(condition))
+            #     clauses.extend(_handle_events_field(condition, dbe))
+            elif field == Fields.CONTENT:
+                clauses.extend(_handle_content_field(condition, dbe))
             elif field == Fields.CREATED_AT:
-                clauses.extend(_handle_timestamp_field(condition))
+                clauses.extend(_handle_timestamp_field(condition, dbe))
             elif field == Fields.UPDATED_AT:
-                clauses.extend(_handle_timestamp_field(condition))
+                clauses.extend(_handle_timestamp_field(condition, dbe))
             elif field == Fields.DELETED_AT:
-                clauses.extend(_handle_timestamp_field(condition))
+                clauses.extend(_handle_timestamp_field(condition, dbe))
             elif field == Fields.CREATED_BY_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             elif field == Fields.UPDATED_BY_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             elif field == Fields.DELETED_BY_ID:
-                clauses.extend(_handle_uuid_field(condition))
+                clauses.extend(_handle_uuid_field(condition, dbe))
             else:
                 raise FilteringException(
                     f"Unsupported condition field: {field}",
                 )
 
+    _plan_path.set(path)
+
     return clauses
+
+
+def rank(
+    filtering: Filtering,
+    dbe: type = SpanDBE,
+) -> Optional[ColumnElement]:
+    """
+    Returns the relevance of each row to the full-text searches in filtering, if
+    any, for sorting, with searches under a negation left out.
+    """
+    values = []
+
+    def _collect(filtering: Filtering, path: Tuple[int, ...]) -> None:
+        if filtering.operator not in (LogicalOperator.AND, LogicalOperator.OR):
+            return
+
+        for index, condition in enumerate(filtering.conditions):
+            if isinstance(condition, Filtering):
+                _collect(condition, (*path, index))
+
+            elif isinstance(condition, Condition):
+                if condition.field == Fields.CONTENT and isinstance(
+                    condition.operator, SearchOperator
+                ):
+                    values.append(((*path, index), condition.value))
+
+    _collect(filtering, ())
+
+    if not values:
+        return None
+
+    attribute: Column = _get_attribute(dbe, Fields.CONTENT)
+
+    ranks = []
+
+    for path, value in values:
+        _plan_path.set(path)
+
+        ranks.append(
+            func.ts_rank_cd(attribute, _to_tsquery(_bind(value, type_=String)))
+        )
+
+    return sum(ranks[1:], ranks[0])
+
+
+def plan(
+    filtering: Filtering,
+    dbe: type = SpanDBE,
+) -> Tuple[ClauseElement, Optional[ColumnElement]]:
+    """
+    Returns the filter and the relevance (see rank) of filtering. They are built
+    once per shape of filtering (fields, keys, operators, options and the types
+    of values) and reused while recently used, with the values of filtering bound
+    to their parameters, so filterings of the same shape share one statement.
+    """
+    key = f"{dbe.__tablename__}:{dumps(_fingerprint(filtering), default=str)}"
+
+    if key in _filter_plans:
+        _filter_plans.move_to_end(key)
+
+        where, relevance, binds = _filter_plans[key]
+
+        values = {}
+
+        for name, path, get in binds:
+            node = filtering
+
+            for index in path:
+                node = node.conditions[index]
+
+            values[name] = get(node.value) if get else node.value
+
+        return (
+            where.params(values),
+            relevance.params(values) if relevance is not None else None,
+        )
+
+    binds: _Binds = []
+
+    binds_token = _plan_binds.set(binds)
+    path_token = _plan_path.set(())
+
+    try:
+        where = combine(filtering.operator, filter(filtering.conditions, dbe))
+        relevance = rank(filtering, dbe) if dbe is SpanDBE else None
+
+    finally:
+        _plan_binds.reset(binds_token)
+        _plan_path.reset(path_token)
+
+    _filter_plans[key] = (where, relevance, binds)
+
+    if len(_filter_plans) > FILTER_PLANS_CACHE_SIZE:
+        _filter_plans.popitem(last=False)
+
+    return where, relevance
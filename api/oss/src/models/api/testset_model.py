@@ -1,4 +1,4 @@
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -46,6 +46,8 @@ class NewTestset(BaseModel):
 class TestSetOutputResponse(BaseModel):
     id: str = Field(..., alias="_id")
     name: str
+    count: Optional[int] = None
+    size: Optional[int] = None
     created_at: str
     updated_at: str
 
@@ -415,6 +415,9 @@ class TestSetDB(Base):
         UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE")
     )
     csvdata = Column(mutable_json_type(dbtype=JSONB, nested=True))
+    # kept alongside csvdata, so that listings can defer it
+    count = Column(Integer, nullable=True)
+    size = Column(Integer, nullable=True)
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
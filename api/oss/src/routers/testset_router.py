@@ -306,7 +306,9 @@ async def update_testset(
     str: The id of the test set updated.
     """
 
-    testset = await db_manager.fetch_testset_by_id(testset_id=testset_id)
+    testset = await db_manager.fetch_testset_by_id(
+        testset_id=testset_id, include_csvdata=False
+    )
     if testset is None:
         raise HTTPException(status_code=404, detail="testset not found")
 
@@ -382,6 +384,8 @@ async def get_testsets(
             TestSetOutputResponse(
                 _id=str(testset.id),  # type: ignore
                 name=testset.name,
+                count=testset.count,
+                size=testset.size,
                 created_at=str(testset.created_at),
                 updated_at=str(testset.updated_at),
             )
@@ -453,7 +457,9 @@ async def delete_testsets(
 
     if is_ee():
         for testset_id in payload.testset_ids:
-            testset = await db_manager.fetch_testset_by_id(testset_id=testset_id)
+            testset = await db_manager.fetch_testset_by_id(
+                testset_id=testset_id, include_csvdata=False
+            )
             has_permission = await check_action_access(
                 user_uid=request.state.user_id,
                 project_id=str(testset.project_id),
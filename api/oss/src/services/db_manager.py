@@ -7,10 +7,11 @@ from json import dumps
 
 from fastapi import HTTPException
 from sqlalchemy.future import select
-from sqlalchemy import func, or_, asc
+from sqlalchemy import func, or_, asc, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from supertokens_python.types import AccountInfo
-from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm import joinedload, load_only, selectinload, defer
 from sqlalchemy.exc import NoResultFound, MultipleResultsFound
 from supertokens_python.asyncio import list_users_by_account_info
 from supertokens_python.asyncio import delete_user as delete_user_from_supertokens
@@ -100,6 +101,7 @@ async def add_testset_to_app_variant(
                 testset = {
                     "name": f"{app_name}_testset",
                     "csvdata": csvdata,
+                    **_testset_stats(csvdata),
                 }
                 testset_db = TestSetDB(
                     **testset,
@@ -2400,7 +2402,11 @@ async def remove_testsets(testset_ids: List[str]):
     """
 
     async with engine.core_session() as session:
-        query = select(TestSetDB).where(TestSetDB.id.in_(testset_ids))
+        query = (
+            select(TestSetDB)
+            .where(TestSetDB.id.in_(testset_ids))
+            .options(defer(TestSetDB.csvdata, raiseload=True))
+        )
         result = await session.execute(query)
         testsets = result.scalars().all()
         for testset in testsets:
@@ -2548,10 +2554,13 @@ async def get_app_variant_instance_by_id(
         return app_variant_db
 
 
-async def fetch_testset_by_id(testset_id: str) -> Optional[TestSetDB]:
+async def fetch_testset_by_id(
+    testset_id: str, include_csvdata: bool = True
+) -> Optional[TestSetDB]:
     """Fetches a testset by its ID.
     Args:
         testset_id (str): The ID of the testset to fetch.
+        include_csvdata (bool): Whether to load the rows, or the metadata only.
     Returns:
         TestSetDB: The fetched testset, or None if no testset was found.
     """
@@ -2565,13 +2574,49 @@ async def fetch_testset_by_id(testset_id: str) -> Optional[TestSetDB]:
         raise ValueError(f"testset_id {testset_id} is not a valid UUID") from e
 
     async with engine.core_session() as session:
-        result = await session.execute(select(TestSetDB).filter_by(id=testset_uuid))
+        query = select(TestSetDB).filter_by(id=testset_uuid)
+        if not include_csvdata:
+            query = query.options(defer(TestSetDB.csvdata, raiseload=True))
+
+        result = await session.execute(query)
         testset = result.scalars().first()
         if not testset:
             raise NoResultFound(f"Testset with id {testset_id} not found")
         return testset
 
 
+async def fetch_testset_rows(testset_id: str) -> List[Dict[str, Any]]:
+    """Fetches the rows of a testset, as plain (non-mutable) JSON.
+
+    Meant for read-only consumers, like evaluations, which iterate over the
+    rows without the change-tracking proxies of TestSetDB.csvdata.
+
+    Args:
+        testset_id (str): The ID of the testset.
+
+    Returns:
+        List[Dict[str, Any]]: The rows of the testset.
+    """
+
+    async with engine.core_session() as session:
+        result = await session.execute(
+            select(type_coerce(TestSetDB.csvdata, JSONB)).filter_by(
+                id=uuid.UUID(testset_id)
+            )
+        )
+        csvdata = result.scalars().first()
+        if csvdata is None:
+            raise NoResultFound(f"Testset with id {testset_id} not found")
+        return csvdata
+
+
+def _testset_stats(csvdata: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {
+        "count": len(csvdata),
+        "size": len(dumps(csvdata).encode("utf-8")),
+    }
+
+
 async def create_testset(project_id: str, testset_data: Dict[str, Any]):
     """
     Creates a testset.
@@ -2586,14 +2631,18 @@ async def create_testset(project_id: str, testset_data: Dict[str, Any]):
     """
 
     async with engine.core_session() as session:
-        testset_db = TestSetDB(**testset_data, project_id=uuid.UUID(project_id))
+        testset_db = TestSetDB(
+            **testset_data,
+            **_testset_stats(testset_data["csvdata"]),
+            project_id=uuid.UUID(project_id),
+        )
 
         log.info(
             "Saving testset:",
             project_id=testset_db.project_id,
             testset_id=testset_db.id,
-            count=len(testset_db.csvdata),
-            size=len(dumps(testset_db.csvdata).encode("utf-8")),
+            count=testset_db.count,
+            size=testset_db.size,
         )
 
         session.add(testset_db)
@@ -2611,9 +2660,18 @@ async def update_testset(testset_id: str, values_to_update: dict) -> None:
         values_to_update (dict):  The values to update
     """
 
+    if "csvdata" in values_to_update:
+        values_to_update = {
+            **values_to_update,
+            **_testset_stats(values_to_update["csvdata"]),
+        }
+
     async with engine.core_session() as session:
+        # csvdata is replaced, if at all, so there is no need to load it
         result = await session.execute(
-            select(TestSetDB).filter_by(id=uuid.UUID(testset_id))
+            select(TestSetDB)
+            .filter_by(id=uuid.UUID(testset_id))
+            .options(defer(TestSetDB.csvdata))
         )
         testset = result.scalars().first()
 
@@ -2626,8 +2684,8 @@ async def update_testset(testset_id: str, values_to_update: dict) -> None:
             "Saving testset:",
             project_id=testset.project_id,
             testset_id=testset.id,
-            count=len(testset.csvdata),
-            size=len(dumps(testset.csvdata).encode("utf-8")),
+            count=testset.count,
+            size=testset.size,
         )
 
         await session.commit()
@@ -2641,12 +2699,14 @@ async def fetch_testsets_by_project_id(project_id: str):
         project_id (str): The ID of the project.
 
     Returns:
-        List[TestSetDB]: The fetched testsets.
+        List[TestSetDB]: The fetched testsets, without their rows (csvdata).
     """
 
     async with engine.core_session() as session:
         result = await session.execute(
-            select(TestSetDB).filter_by(project_id=uuid.UUID(project_id))
+            select(TestSetDB)
+            .filter_by(project_id=uuid.UUID(project_id))
+            .options(defer(TestSetDB.csvdata, raiseload=True))
         )
         testsets = result.scalars().all()
         return testsets
@@ -0,0 +1,127 @@
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+from asyncio import Future, Task, gather, get_running_loop
+
+from oss.src.utils.logging import get_module_logger
+
+log = get_module_logger(__name__)
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Coalesces the keys loaded within the same event-loop tick into one call to
+    batch_load, which returns one value (or None) per key, in keys order.
+
+    Keys are deduplicated and cached, so a loader should live as long as a
+    request (or a single service call), not longer.
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[List[Optional[V]]]],
+        *,
+        max_batch_size: Optional[int] = None,
+    ):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+
+        self._futures: Dict[K, Future] = {}
+        self._queue: List[K] = []
+        self._batches: Set[Task] = set()
+
+    async def load(
+        self,
+        key: K,
+    ) -> Optional[V]:
+        future = self._futures.get(key)
+
+        if future is None:
+            loop = get_running_loop()
+
+            future = loop.create_future()
+
+            self._futures[key] = future
+
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+
+            self._queue.append(key)
+
+        return await future
+
+    async def load_many(
+        self,
+        keys: Iterable[K],
+    ) -> List[Optional[V]]:
+        return list(await gather(*(self.load(key) for key in keys)))
+
+    def prime(
+        self,
+        key: K,
+        value: Optional[V],
+    ) -> None:
+        if key in self._futures:
+            return
+
+        future = get_running_loop().create_future()
+        future.set_result(value)
+
+        self._futures[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+
+        size = self.max_batch_size or len(keys) or 1
+
+        loop = get_running_loop()
+
+        for i in range(0, len(keys), size):
+            task = loop.create_task(self._load_batch(keys[i : i + size]))
+
+            # Keep a reference, so that the task is not garbage-collected
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _load_batch(
+        self,
+        keys: List[K],
+    ) -> None:
+        try:
+            values = await self.batch_load(keys)
+
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"batch_load returned {len(values)} values for {len(keys)} keys"
+                )
+
+        except Exception as e:  # pylint: disable=broad-except
+            log.error("Failed to load batch: %s", e)
+
+            for key in keys:
+                # Failed keys are not cached, so that they can be retried
+                future = self._futures.pop(key)
+
+                if not future.done():
+                    future.set_exception(e)
+
+            return
+
+        for key, value in zip(keys, values):
+            future = self._futures[key]
+
+            if not future.done():
+                future.set_result(value)
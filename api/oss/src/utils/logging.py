@@ -39,6 +39,7 @@ structlog.stdlib.BoundLogger.trace = bound_logger_trace
 # ENV VARS
 LOG_CONSOLE_ENABLED = os.getenv("LOG_CONSOLE_ENABLED", "true") == "true"
 LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "TRACE").upper()
+LOG_SQL_ENABLED = os.getenv("LOG_SQL_ENABLED", "false") == "true"
 
 # LOG_OTLP_ENABLED = os.getenv("LOG_OTLP_ENABLED", "false") == "true"
 # LOG_OTLP_LEVEL = os.getenv("LOG_OTLP_LEVEL", "INFO").upper()
@@ -202,6 +203,7 @@ if LOG_CONSOLE_ENABLED:
     h.setLevel(getattr(logging, LOG_CONSOLE_LEVEL, TRACE_LEVEL))
     h.setFormatter(logging.Formatter("%(message)s"))
     logging.getLogger("console").addHandler(h)
+    handlers.append(h)
     loggers.append(create_struct_logger([colored_console_renderer()], "console"))
 
 # if LOG_FILE_ENABLED:
@@ -223,6 +225,12 @@ if LOG_CONSOLE_ENABLED:
 #     logging.getLogger("otel").addHandler(h)
 #     loggers.append(create_struct_logger([json_renderer()], "otel"))
 
+# Lets callers skip compiling SQL with literal binds, which is costly, unless
+# asked for: the console logs at TRACE by default
+SQL_TRACE_ENABLED = LOG_SQL_ENABLED and any(
+    handler.level <= TRACE_LEVEL for handler in handlers
+)
+
 
 class MultiLogger:
     def __init__(self, *loggers: structlog.stdlib.BoundLogger):
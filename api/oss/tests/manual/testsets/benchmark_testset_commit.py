@@ -0,0 +1,82 @@
+import random
+import string
+import statistics
+import time
+
+import requests
+
+API_URL = "http://localhost:80/api/preview/testsets/"
+API_KEY = "ApiKey xxx.xxx"  # Replace with your actual key
+TESTCASES_COUNT = 10_000
+RUNS = 5
+
+
+def generate_testcase():
+    return {
+        "country": "".join(random.choices(string.ascii_letters, k=16)),
+        "correct_answer": "".join(random.choices(string.ascii_letters, k=64)),
+    }
+
+
+def commit_testset(testcases):
+    payload = {
+        "testset": {
+            "slug": "".join(random.choices(string.ascii_lowercase, k=12)),
+            "name": f"benchmark_{len(testcases)}",
+            "testcases": testcases,
+        }
+    }
+
+    start = time.perf_counter()
+    response = requests.post(
+        API_URL, json=payload, headers={"Authorization": API_KEY}, timeout=300
+    )
+    elapsed = time.perf_counter() - start
+
+    response.raise_for_status()
+
+    return response.json(), elapsed
+
+
+# New testcases: every blob is inserted
+timings = []
+for _ in range(RUNS):
+    testcases = [generate_testcase() for _ in range(TESTCASES_COUNT)]
+    _, elapsed = commit_testset(testcases)
+    timings.append(elapsed)
+
+print(
+    f"commit {TESTCASES_COUNT} new testcases → "
+    f"median {statistics.median(timings):.2f}s, min {min(timings):.2f}s"
+)
+
+# Edited testset: the same testcases, committed again on the same testset
+testcases = [generate_testcase() for _ in range(TESTCASES_COUNT)]
+body, _ = commit_testset(testcases)
+testset_id = body["testset"]["id"]
+
+timings = []
+for _ in range(RUNS):
+    payload = {
+        "testset": {
+            "id": testset_id,
+            "name": body["testset"]["name"],
+            "testcases": testcases,
+        }
+    }
+
+    start = time.perf_counter()
+    response = requests.put(
+        f"{API_URL}{testset_id}",
+        json=payload,
+        headers={"Authorization": API_KEY},
+        timeout=300,
+    )
+    timings.append(time.perf_counter() - start)
+
+    response.raise_for_status()
+
+print(
+    f"commit {TESTCASES_COUNT} existing testcases → "
+    f"median {statistics.median(timings):.2f}s, min {min(timings):.2f}s"
+)
@@ -0,0 +1,79 @@
+import random
+import statistics
+import time
+from uuid import uuid4
+
+import requests
+
+API_URL = "http://localhost:80/api/preview/tracing/traces/"
+API_KEY = "ApiKey xxx.xxx"  # Replace with your actual key
+SPANS_COUNTS = [10, 50, 200, 1_000]
+RUNS = 5
+
+
+def generate_trace(spans_count):
+    trace_id = uuid4().hex
+    root_id = uuid4().hex[:16]
+
+    spans = []
+    for i in range(spans_count):
+        span_id = root_id if i == 0 else uuid4().hex[:16]
+
+        spans.append(
+            {
+                "trace_id": trace_id,
+                "span_id": span_id,
+                "parent_id": None if i == 0 else root_id,
+                "span_name": f"span_{i}",
+                "span_kind": "SPAN_KIND_INTERNAL",
+                "start_time": 1670000000 + i,
+                "end_time": 1670000001 + i,
+                "status_code": "STATUS_CODE_OK",
+                "attributes": {
+                    "ag": {
+                        "type": {"node": "task"},
+                        "data": {"inputs": {"value": random.random()}},
+                    }
+                },
+            }
+        )
+
+    return spans
+
+
+def edit_trace(spans):
+    for span in spans:
+        span["attributes"]["ag"]["data"]["outputs"] = {"value": random.random()}
+
+    start = time.perf_counter()
+    response = requests.put(
+        API_URL,
+        json={"spans": spans},
+        headers={"Authorization": API_KEY},
+        timeout=300,
+    )
+    elapsed = time.perf_counter() - start
+
+    response.raise_for_status()
+
+    return elapsed
+
+
+# Edited trace: every span of the trace is updated, as the annotations flow does
+for spans_count in SPANS_COUNTS:
+    spans = generate_trace(spans_count)
+
+    response = requests.post(
+        API_URL,
+        json={"spans": spans},
+        headers={"Authorization": API_KEY},
+        timeout=300,
+    )
+    response.raise_for_status()
+
+    timings = [edit_trace(spans) for _ in range(RUNS)]
+
+    print(
+        f"edit trace with {spans_count} spans → "
+        f"median {statistics.median(timings):.2f}s, min {min(timings):.2f}s"
+    )
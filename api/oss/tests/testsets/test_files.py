@@ -0,0 +1,88 @@
+from io import BytesIO
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from oss.src.apis.fastapi.testsets.models import Testset
+from oss.src.apis.fastapi.testsets.router import TestsetsRouter
+from oss.src.apis.fastapi.testsets.utils import (
+    csv_file_to_json_rows,
+    jsonl_file_to_json_rows,
+    json_rows_to_testcases,
+)
+
+
+class TestCsvFileToJsonRows:
+    def test_empty_cells_are_none(self):
+        csv_file = BytesIO(b"name,age\nalice,\n,42\n")
+
+        rows = list(csv_file_to_json_rows(csv_file))
+
+        assert rows == [
+            {"name": "alice", "age": None},
+            {"name": None, "age": "42"},
+        ]
+
+    def test_missing_fields_are_none(self):
+        csv_file = BytesIO(b"name,age\nalice\n")
+
+        rows = list(csv_file_to_json_rows(csv_file))
+
+        assert rows == [{"name": "alice", "age": None}]
+
+    def test_too_many_fields_fail(self):
+        csv_file = BytesIO(b"name,age\nalice,42,extra\n")
+
+        with pytest.raises(ValueError):
+            list(csv_file_to_json_rows(csv_file))
+
+
+class TestJsonRowsToTestcases:
+    def test_testcase_ids_are_dropped(self):
+        jsonl_file = BytesIO(b'{"testcase_id": "x", "name": "alice"}\n[1, 2]\n')
+
+        testcases = list(json_rows_to_testcases(jsonl_file_to_json_rows(jsonl_file)))
+
+        assert testcases == [{"name": "alice"}]
+
+
+class TestsetsService:
+    def __init__(self):
+        self.created = []
+
+    async def create_artifact(self, **kwargs):
+        self.created.append(kwargs)
+
+
+class TestCreateTestsetFromFile:
+    @pytest.mark.asyncio
+    async def test_bad_files_are_rejected_before_creating_the_testset(self):
+        service = TestsetsService()
+        router = TestsetsRouter(testsets_service=service)
+        file = UploadFile(BytesIO(b"name,age\nalice,42,extra\n"))
+
+        with pytest.raises(HTTPException) as e:
+            await router._create_testset(
+                request=SimpleNamespace(
+                    state=SimpleNamespace(project_id=str(uuid4()), user_id=str(uuid4()))
+                ),
+                testset_header=Testset(name="testset"),
+                file=file,
+                file_type="CSV",
+            )
+
+        assert e.value.status_code == 400
+        assert service.created == []
+
+    @pytest.mark.asyncio
+    async def test_good_files_are_read_again_from_the_start(self):
+        router = TestsetsRouter(testsets_service=TestsetsService())
+        file = UploadFile(BytesIO(b'[{"name": "alice"}]'))
+
+        await router._validate_file(file=file, file_type="JSON")
+
+        testcases = list(router._read_testcases_from_file(file, "JSON"))
+
+        assert testcases == [{"name": "alice"}]
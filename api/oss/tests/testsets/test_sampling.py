@@ -0,0 +1,117 @@
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.testsets.dtos import SamplingMethod, TestsetSampling
+from oss.src.core.testsets.service import TestsetsService
+
+
+class BlobsDAO:
+    def __init__(self, values):
+        self.values = values
+        self.calls = 0
+
+    async def fetch_blob_values(self, *, project_id, blob_ids, key):
+        self.calls += 1
+
+        return {blob_id: self.values[blob_id] for blob_id in blob_ids}
+
+
+def _service(values):
+    return TestsetsService(git_dao=None, blobs_dao=BlobsDAO(values))
+
+
+def _stratified(size, seed=7):
+    return TestsetSampling(
+        method=SamplingMethod.STRATIFIED,
+        size=size,
+        seed=seed,
+        column="label",
+    )
+
+
+class TestSampleTestcaseIds:
+    @pytest.mark.asyncio
+    async def test_allocates_in_proportion_to_frequency(self):
+        labels = ["a"] * 60 + ["b"] * 30 + ["c"] * 10
+        testcase_ids = [uuid4() for _ in labels]
+        values = dict(zip(testcase_ids, labels))
+
+        sample = await _service(values).sample_testcase_ids(
+            project_id=uuid4(),
+            testcase_ids=testcase_ids,
+            sampling=_stratified(10),
+        )
+
+        assert Counter(values[testcase_id] for testcase_id in sample) == {
+            "a": 6,
+            "b": 3,
+            "c": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_largest_remainders_fill_the_sample(self):
+        labels = ["a"] * 5 + ["b"] * 3 + ["c"] * 2 + [None] * 2
+        testcase_ids = [uuid4() for _ in labels]
+        values = dict(zip(testcase_ids, labels))
+
+        sample = await _service(values).sample_testcase_ids(
+            project_id=uuid4(),
+            testcase_ids=testcase_ids,
+            sampling=_stratified(5),
+        )
+
+        # quotas are 2.08, 1.25, 0.83 and 0.83: a and b floor to 3 of 5,
+        # then c and None take the two largest remainders
+        assert len(sample) == 5
+        assert Counter(values[testcase_id] for testcase_id in sample) == {
+            "a": 2,
+            "b": 1,
+            "c": 1,
+            None: 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_keeps_order_and_is_reproducible(self):
+        labels = ["a", "b"] * 20
+        testcase_ids = [uuid4() for _ in labels]
+        values = dict(zip(testcase_ids, labels))
+        service = _service(values)
+
+        first = await service.sample_testcase_ids(
+            project_id=uuid4(),
+            testcase_ids=testcase_ids,
+            sampling=_stratified(8),
+        )
+        second = await service.sample_testcase_ids(
+            project_id=uuid4(),
+            testcase_ids=testcase_ids,
+            sampling=_stratified(8),
+        )
+
+        assert first == second
+        assert first == sorted(first, key=testcase_ids.index)
+
+    @pytest.mark.asyncio
+    async def test_small_testsets_are_not_sampled(self):
+        testcase_ids = [uuid4() for _ in range(3)]
+        service = _service({})
+
+        sample = await service.sample_testcase_ids(
+            project_id=uuid4(),
+            testcase_ids=testcase_ids,
+            sampling=_stratified(5),
+        )
+
+        assert sample == testcase_ids
+        assert service.blobs_dao.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_requires_a_column(self):
+        with pytest.raises(ValueError):
+            await _service({}).sample_testcase_ids(
+                project_id=uuid4(),
+                testcase_ids=[uuid4() for _ in range(3)],
+                sampling=TestsetSampling(method=SamplingMethod.STRATIFIED, size=1),
+            )
@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+import pytest
+
+from oss.src.core.testsets.dtos import TestsetData, TestsetRevision
+from oss.src.core.testsets.service import TestsetsService
+
+
+class BlobsDAO:
+    def __init__(self):
+        self.calls = []
+
+    async def stream_blobs(self, *, project_id, blob_ids, batch_size):
+        self.calls.append(list(blob_ids))
+
+        yield [type("Blob", (), {"id": id, "data": {"n": 1}}) for id in blob_ids]
+
+
+class TestLoadRevisionsTestcases:
+    @pytest.mark.asyncio
+    async def test_shared_testcases_are_loaded_once(self):
+        blobs_dao = BlobsDAO()
+        service = TestsetsService(git_dao=None, blobs_dao=blobs_dao)
+        shared, first, second = uuid4(), uuid4(), uuid4()
+
+        revisions = await service._load_revisions_testcases(
+            project_id=uuid4(),
+            revisions=[
+                TestsetRevision(data=TestsetData(testcase_ids=[first, shared])),
+                TestsetRevision(data=TestsetData(testcase_ids=[shared, second])),
+                TestsetRevision(),
+            ],
+        )
+
+        (blob_ids,) = blobs_dao.calls
+
+        assert sorted(blob_ids) == sorted([shared, first, second])
+        assert [
+            [testcase["testcase_id"] for testcase in revision.data.testcases]
+            for revision in revisions[:2]
+        ] == [[str(first), str(shared)], [str(shared), str(second)]]
+        assert revisions[2].data is None
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_loaded_without_testcases(self):
+        blobs_dao = BlobsDAO()
+        service = TestsetsService(git_dao=None, blobs_dao=blobs_dao)
+
+        await service._load_revisions_testcases(
+            project_id=uuid4(),
+            revisions=[TestsetRevision(data=TestsetData(testcase_ids=[]))],
+        )
+
+        assert blobs_dao.calls == []
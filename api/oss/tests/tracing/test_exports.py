@@ -0,0 +1,168 @@
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from oss.src.core.tracing.dtos import (
+    OTelFlatSpan,
+    OTelSpanKind,
+    OTelStatusCode,
+    SpansExport,
+    ExportStatus,
+)
+from oss.src.core.tracing import exports
+from oss.src.core.tracing.exports import (
+    get_spans_schema,
+    map_spans_to_record_batch,
+    put_manifest,
+    fetch_manifest,
+    purge_exports,
+)
+
+
+START_TIME = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _span(**kwargs) -> OTelFlatSpan:
+    return OTelFlatSpan(
+        **{
+            "trace_id": "31d6cfe0-4b90-11ec-8001-42010a8000b0",
+            "span_id": "31d6cfe0-4b90-11ec-8001-42010a8000b1",
+            "span_kind": OTelSpanKind.SPAN_KIND_SERVER,
+            "span_name": "generate",
+            "start_time": START_TIME,
+            "end_time": START_TIME + timedelta(milliseconds=1500),
+            "status_code": OTelStatusCode.STATUS_CODE_OK,
+            **kwargs,
+        }
+    )
+
+
+class TestSpansRecordBatch:
+    def test_hot_fields_are_typed_columns(self):
+        batch = map_spans_to_record_batch(
+            [
+                _span(
+                    parent_id="31d6cfe0-4b90-11ec-8001-42010a8000b2",
+                    attributes={
+                        "ag": {
+                            "metrics": {
+                                "unit": {
+                                    "costs": {"total": 0.25},
+                                    "tokens": {"prompt": 10, "total": 30},
+                                }
+                            }
+                        }
+                    },
+                )
+            ]
+        )
+
+        assert batch.schema == get_spans_schema()
+
+        row = batch.to_pylist()[0]
+
+        assert row["trace_id"] == "31d6cfe04b9011ec800142010a8000b0"
+        assert row["span_id"] == "800142010a8000b1"
+        assert row["parent_id"] == "800142010a8000b2"
+        assert row["span_kind"] == "SPAN_KIND_SERVER"
+        assert row["status_code"] == "STATUS_CODE_OK"
+        assert row["start_time"] == START_TIME
+        assert row["duration_ms"] == 1500.0
+        assert row["costs"] == 0.25
+        assert row["prompt_tokens"] == 10.0
+        assert row["completion_tokens"] is None
+        assert row["total_tokens"] == 30.0
+
+    def test_references_are_structs_and_left_out_of_attributes(self):
+        application_id = uuid4()
+
+        batch = map_spans_to_record_batch(
+            [
+                _span(
+                    attributes={
+                        "agenta": {
+                            "references": [
+                                {
+                                    "id": str(application_id),
+                                    "slug": "app",
+                                    "attributes": {"key": "application"},
+                                },
+                                "not-a-reference",
+                            ]
+                        },
+                        "custom": {"key": "value"},
+                    },
+                )
+            ]
+        )
+
+        row = batch.to_pylist()[0]
+
+        assert row["references"] == [
+            {
+                "id": str(application_id),
+                "slug": "app",
+                "version": None,
+                "attributes": '{"key":"application"}',
+            }
+        ]
+        assert row["attributes"] == '{"custom":{"key":"value"}}'
+
+    def test_non_numeric_metrics_and_missing_attributes_are_null(self):
+        batch = map_spans_to_record_batch(
+            [
+                _span(
+                    attributes={
+                        "ag": {"metrics": {"unit": {"costs": {"total": True}}}},
+                    },
+                ),
+                _span(attributes=None),
+            ]
+        )
+
+        rows = batch.to_pylist()
+
+        assert rows[0]["costs"] is None
+        assert rows[1]["costs"] is None
+        assert rows[1]["references"] is None
+        assert rows[1]["attributes"] is None
+
+
+class TestExportsStorage:
+    @pytest.fixture(autouse=True)
+    def _local(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(exports, "TRACING_EXPORTS_DIR", str(tmp_path))
+        monkeypatch.setattr(exports, "TRACING_EXPORTS_BUCKET", None)
+
+    @pytest.mark.asyncio
+    async def test_manifest_round_trip(self):
+        project_id = uuid4()
+        export = SpansExport(
+            export_id=uuid4(),
+            status=ExportStatus.FAILED,
+            created_at=START_TIME,
+        )
+
+        assert await fetch_manifest(project_id, export.export_id) is None
+
+        await put_manifest(project_id, export)
+
+        assert await fetch_manifest(project_id, export.export_id) == export
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_expired_exports_only(self):
+        project_id = uuid4()
+        export = SpansExport(export_id=uuid4(), status=ExportStatus.READY)
+
+        await put_manifest(project_id, export)
+
+        now = datetime.now(timezone.utc)
+
+        assert await purge_exports(project_id, now=now, ttl=3600) == 0
+        assert await fetch_manifest(project_id, export.export_id) is not None
+
+        later = now + timedelta(hours=2)
+
+        assert await purge_exports(project_id, now=later, ttl=3600) == 1
+        assert await fetch_manifest(project_id, export.export_id) is None
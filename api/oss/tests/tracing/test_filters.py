@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from oss.src.core.tracing.dtos import Condition, Filtering
+from oss.src.dbs.postgres.tracing import utils
+from oss.src.dbs.postgres.tracing.dbes import SpanDBE, TraceDBE
+
+
+def _params(clause):
+    return clause.compile(dialect=postgresql.dialect()).params
+
+
+def _filtering(name, cost, tags):
+    return Filtering(
+        conditions=[
+            Condition(field="span_name", operator="contains", value=name),
+            Condition(
+                field="attributes",
+                key="ag.metrics.cost",
+                operator="btwn",
+                value=cost,
+            ),
+            Filtering(
+                operator="or",
+                conditions=[
+                    Condition(field="span_name", operator="in", value=tags),
+                    Condition(field="content", operator="search", value=name),
+                ],
+            ),
+        ]
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_filter_plans():
+    utils._filter_plans.clear()
+    yield
+    utils._filter_plans.clear()
+
+
+class TestPlan:
+    def test_same_shape_shares_plan(self):
+        utils.plan(_filtering("alpha", [1, 5], ["a", "b"]))
+        utils.plan(_filtering("gamma", [2, 9], ["c", "d"]))
+
+        assert len(utils._filter_plans) == 1
+
+    def test_cached_plan_binds_new_values(self):
+        where, relevance = utils.plan(_filtering("alpha", [1, 5], ["a", "b"]))
+        first = _params(where)
+
+        where, relevance = utils.plan(_filtering("gamma", [2, 9], ["c", "d"]))
+        params = _params(where)
+
+        assert sorted(first) == sorted(params)
+        assert "%alpha%" in first.values()
+        assert "%gamma%" in params.values()
+        assert "%alpha%" not in params.values()
+        assert 2 in params.values() and 9 in params.values()
+        assert ["c", "d"] in params.values()
+        assert "gamma" in _params(relevance).values()
+
+    def test_cached_plan_matches_fresh_plan(self):
+        utils.plan(_filtering("alpha", [1, 5], ["a", "b"]))
+        cached, _ = utils.plan(_filtering("gamma", [2, 9], ["c", "d"]))
+
+        utils._filter_plans.clear()
+        fresh, _ = utils.plan(_filtering("gamma", [2, 9], ["c", "d"]))
+
+        assert str(cached.compile(dialect=postgresql.dialect())) == str(
+            fresh.compile(dialect=postgresql.dialect())
+        )
+        assert _params(cached) == _params(fresh)
+
+    def test_different_shapes_get_own_plans(self):
+        utils.plan(_filtering("alpha", [1, 5], ["a", "b"]))
+        utils.plan(_filtering("alpha", [1, 5], ["a", "b", "c"]))
+
+        assert len(utils._filter_plans) == 2
+
+    def test_tables_get_own_plans(self):
+        filtering = Filtering(
+            conditions=[Condition(field="span_name", value="alpha")],
+        )
+
+        utils.plan(filtering, SpanDBE)
+        utils.plan(filtering, TraceDBE)
+
+        assert len(utils._filter_plans) == 2
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(utils, "FILTER_PLANS_CACHE_SIZE", 2)
+
+        for key in ("a", "b", "c"):
+            utils.plan(
+                Filtering(
+                    conditions=[
+                        Condition(field="attributes", key=key, value="x"),
+                    ]
+                ),
+                SpanDBE,
+            )
+
+        assert len(utils._filter_plans) == 2
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from oss.src.dbs.postgres.shared import partitions
+from oss.src.dbs.postgres.shared.partitions import create_partitions
+
+
+NOW = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+
+class Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class Session:
+    """Records statements, with rows in the default partition from `overlaps` on."""
+
+    def __init__(self, overlaps=None):
+        self.overlaps = overlaps
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+
+        self.statements.append(sql)
+
+        if sql.startswith("SELECT EXISTS"):
+            return Result(self.overlaps is not None and self.overlaps in sql)
+
+        return Result(None)
+
+
+@pytest.fixture(autouse=True)
+def no_partitions(monkeypatch):
+    async def fetch_partitions(session, *, table):
+        return []
+
+    monkeypatch.setattr(partitions, "fetch_partitions", fetch_partitions)
+
+
+class TestCreatePartitions:
+    @pytest.mark.asyncio
+    async def test_creates_partitions_ahead(self):
+        session = Session()
+
+        created = await create_partitions(
+            session, table="spans", now=NOW, interval="day", ahead=1
+        )
+
+        assert created == ["spans_p20250101", "spans_p20250102"]
+        assert [sql for sql in session.statements if "PARTITION OF" in sql] == [
+            "CREATE TABLE IF NOT EXISTS spans_p20250101 PARTITION OF spans "
+            "FOR VALUES FROM ('2025-01-01T00:00:00+00:00') "
+            "TO ('2025-01-02T00:00:00+00:00')",
+            "CREATE TABLE IF NOT EXISTS spans_p20250102 PARTITION OF spans "
+            "FOR VALUES FROM ('2025-01-02T00:00:00+00:00') "
+            "TO ('2025-01-03T00:00:00+00:00')",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_moves_rows_out_of_the_default_partition(self):
+        session = Session(overlaps="start_time >= '2025-01-02")
+
+        created = await create_partitions(
+            session, table="spans", now=NOW, interval="day", ahead=1
+        )
+
+        assert created == ["spans_p20250101", "spans_p20250102"]
+
+        statements = session.statements[
+            session.statements.index(
+                "CREATE TABLE spans_p20250102 (LIKE spans INCLUDING DEFAULTS)"
+            ) :
+        ]
+
+        assert statements[1].startswith(
+            "WITH moved AS ( DELETE FROM spans_default "
+            "WHERE start_time >= '2025-01-02T00:00:00+00:00' "
+            "AND start_time < '2025-01-03T00:00:00+00:00'"
+        )
+        assert statements[1].endswith("INSERT INTO spans_p20250102 SELECT * FROM moved")
+        assert statements[2] == (
+            "ALTER TABLE spans ATTACH PARTITION spans_p20250102 "
+            "FOR VALUES FROM ('2025-01-02T00:00:00+00:00') "
+            "TO ('2025-01-03T00:00:00+00:00')"
+        )
+        assert not any(
+            "spans_p20250102 PARTITION OF" in sql for sql in session.statements
+        )
+
+    @pytest.mark.asyncio
+    async def test_uses_the_partition_key_of_each_table(self):
+        session = Session(overlaps="time_start >= '2025-01-01")
+
+        await create_partitions(
+            session, table="nodes", now=NOW, interval="day", ahead=0
+        )
+
+        assert any(
+            sql.startswith("WITH moved AS ( DELETE FROM nodes_default")
+            for sql in session.statements
+        )
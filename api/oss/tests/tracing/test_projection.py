@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from oss.src.apis.fastapi.tracing.utils import parse_spans_into_response
+from oss.src.core.tracing.dtos import FilteringException, Focus, Format
+from oss.src.core.tracing.utils import parse_fields
+from oss.src.dbs.postgres.tracing.mappings import map_span_dbe_to_span_dto
+from oss.src.dbs.postgres.tracing.utils import project, unproject
+
+
+def _names(columns):
+    return [column.name for column in columns]
+
+
+class TestProject:
+    def test_whole_spans_without_fields(self):
+        assert project(None) is None
+
+    def test_keys_are_always_selected(self):
+        names = _names(project([]))
+
+        assert names == [
+            "trace_id",
+            "span_id",
+            "parent_id",
+            "span_kind",
+            "span_name",
+            "start_time",
+            "end_time",
+            "status_code",
+        ]
+
+    def test_columns_and_sub_paths(self):
+        names = _names(project(["events", "attributes.ag.metrics"]))
+
+        assert "events" in names
+        assert "attributes.ag.metrics" in names
+        assert "attributes" not in names
+
+    def test_sub_paths_of_selected_columns_are_left_out(self):
+        names = _names(project(["attributes.ag.metrics", "attributes"]))
+
+        assert "attributes" in names
+        assert "attributes.ag.metrics" not in names
+
+    def test_sub_paths_select_json_paths(self):
+        (column,) = [
+            column
+            for column in project(["attributes.ag.data.outputs"])
+            if column.name == "attributes.ag.data.outputs"
+        ]
+
+        compiled = column.element.compile(dialect=postgresql.dialect())
+
+        assert "#>" in str(compiled)
+        assert list(compiled.params.values()) == [("ag", "data", "outputs")]
+
+
+class TestUnproject:
+    def test_nests_sub_paths_into_attributes(self):
+        trace_id, span_id = uuid4(), uuid4()
+
+        span = unproject(
+            SimpleNamespace(
+                _mapping={
+                    "trace_id": trace_id,
+                    "span_id": span_id,
+                    "attributes.ag.metrics": {"costs": 1},
+                    "attributes.ag.data.outputs": "ok",
+                    "attributes.ag.data.inputs": None,
+                }
+            )
+        )
+
+        assert span.trace_id == trace_id
+        assert span.span_id == span_id
+        assert span.attributes == {
+            "ag": {
+                "metrics": {"costs": 1},
+                "data": {"outputs": "ok"},
+            }
+        }
+
+    def test_missing_sub_paths_leave_attributes_unset(self):
+        span = unproject(
+            SimpleNamespace(_mapping={"attributes.ag.metrics": None}),
+        )
+
+        assert span.attributes is None
+
+    def test_spans_without_attributes_are_returned(self):
+        span = unproject(
+            SimpleNamespace(
+                _mapping={
+                    "trace_id": uuid4(),
+                    "span_id": uuid4(),
+                    "span_kind": "SPAN_KIND_INTERNAL",
+                    "span_name": "span",
+                    "status_code": "STATUS_CODE_OK",
+                    "attributes.ag.metrics": None,
+                }
+            )
+        )
+
+        spans = parse_spans_into_response(
+            [map_span_dbe_to_span_dto(span)],
+            focus=Focus.SPAN,
+            format=Format.AGENTA,
+        )
+
+        assert len(spans) == 1
+        assert spans[0].attributes == {}
+
+
+class TestParseFields:
+    def test_accepts_columns_and_attributes_sub_paths(self):
+        parse_fields(None)
+        parse_fields(["events", "attributes.ag.metrics"])
+
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            [""],
+            ["unknown"],
+            ["content"],
+            ["events.name"],
+            ["attributes..ag"],
+        ],
+    )
+    def test_rejects_invalid_fields(self, fields):
+        with pytest.raises(FilteringException):
+            parse_fields(fields)
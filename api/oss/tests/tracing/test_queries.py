@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from oss.src.apis.fastapi.tracing.utils import merge_queries, parse_query_request
+from oss.src.core.tracing.dtos import Focus
+from oss.src.dbs.postgres.tracing.dao import TracingDAO
+
+
+def _select_spans(**kwargs):
+    query = merge_queries(parse_query_request(**kwargs), None)
+
+    stmt, _ = TracingDAO()._select_spans(project_id=uuid4(), query=query)
+
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _request(**kwargs):
+    return dict(
+        {
+            "focus": None,
+            "format": None,
+            "fields": None,
+            "oldest": None,
+            "newest": None,
+            "limit": None,
+            "filter": None,
+        },
+        **kwargs,
+    )
+
+
+class TestSelectSpans:
+    def test_unfiltered_traces_are_picked_from_summaries(self):
+        sql = _select_spans(**_request(focus=Focus.TRACE, limit=10))
+
+        assert "SELECT traces.trace_id AS grouping_key" in sql
+        assert "DISTINCT" not in sql
+
+    def test_filtered_traces_are_picked_from_spans(self):
+        sql = _select_spans(
+            **_request(
+                focus=Focus.TRACE,
+                limit=10,
+                filter='{"conditions": [{"field": "span_name", "value": "x"}]}',
+            )
+        )
+
+        assert "SELECT DISTINCT spans.trace_id AS grouping_key" in sql
+
+    def test_spans_are_picked_from_spans(self):
+        sql = _select_spans(**_request(focus=Focus.SPAN, limit=10))
+
+        assert "traces" not in sql
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from json import loads
+from uuid import uuid4
+
+import pytest
+
+from oss.src.apis.fastapi.tracing.utils import spans_to_ndjson_stream
+from oss.src.core.tracing.dtos import Focus, Format, OTelSpan
+from oss.src.core.tracing.utils import (
+    parse_span_id_from_uuid,
+    parse_trace_id_from_uuid,
+)
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _span(trace_id, span_id, parent_id=None, name="span", offset=0):
+    return OTelSpan(
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_id=parent_id,
+        span_name=name,
+        start_time=START + timedelta(seconds=offset),
+        end_time=START + timedelta(seconds=offset + 1),
+    )
+
+
+def _trace(name):
+    # As read from the database, with ids as UUIDs
+    trace_id = str(uuid4())
+    root_id = str(uuid4())
+
+    return [
+        _span(trace_id, root_id, name=name),
+        _span(trace_id, str(uuid4()), parent_id=root_id, name="child", offset=1),
+    ]
+
+
+def _trace_id(span):
+    return parse_trace_id_from_uuid(span.trace_id)
+
+
+def _span_id(span):
+    return parse_span_id_from_uuid(span.span_id)
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _lines(stream):
+    chunks = [chunk async for chunk in stream]
+
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+    return [loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+
+class TestSpansToNdjsonStream:
+    @pytest.mark.asyncio
+    async def test_one_span_per_line(self):
+        first, second = _trace("first"), _trace("second")
+        span_ids = [_span_id(span) for span in first + second]
+
+        lines = await _lines(
+            spans_to_ndjson_stream(
+                _batches(first, second),
+                focus=Focus.SPAN,
+                format=Format.AGENTA,
+            )
+        )
+
+        assert [line["span_id"] for line in lines] == span_ids
+        assert all(None not in line.values() for line in lines)
+        assert "parent_id" not in lines[0]
+
+    @pytest.mark.asyncio
+    async def test_one_trace_per_line_across_batches(self):
+        traces = [_trace("first"), _trace("second"), _trace("third")]
+        trace_ids = [_trace_id(trace[0]) for trace in traces]
+        span_ids = [[_span_id(span) for span in trace] for trace in traces]
+        first, second, third = traces
+
+        # Traces split across batches are only emitted once complete
+        lines = await _lines(
+            spans_to_ndjson_stream(
+                _batches(first[:1], first[1:] + second[:1], second[1:] + third),
+                focus=Focus.TRACE,
+                format=Format.AGENTA,
+            )
+        )
+
+        assert [line["trace_id"] for line in lines] == trace_ids
+
+        for line, (root_id, child_id) in zip(lines, span_ids):
+            (root,) = line["spans"].values()
+
+            assert root["span_id"] == root_id
+            assert [child["span_id"] for child in root["spans"].values()] == [child_id]
+
+    @pytest.mark.asyncio
+    async def test_empty_batches_yield_nothing(self):
+        for focus in (Focus.SPAN, Focus.TRACE):
+            lines = await _lines(
+                spans_to_ndjson_stream(
+                    _batches([], []),
+                    focus=focus,
+                    format=Format.AGENTA,
+                )
+            )
+
+            assert lines == []
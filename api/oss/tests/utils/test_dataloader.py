@@ -0,0 +1,76 @@
+from asyncio import gather
+
+import pytest
+
+from oss.src.utils.dataloader import DataLoader
+
+
+class Loader:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches = []
+
+    async def __call__(self, keys):
+        self.batches.append(list(keys))
+
+        if self.fail:
+            raise RuntimeError("boom")
+
+        return [key * 10 if key >= 0 else None for key in keys]
+
+
+class TestDataLoader:
+    @pytest.mark.asyncio
+    async def test_coalesces_keys_into_one_batch(self):
+        batch_load = Loader()
+        loader = DataLoader(batch_load)
+
+        values = await gather(loader.load(1), loader.load(2), loader.load(3))
+
+        assert values == [10, 20, 30]
+        assert batch_load.batches == [[1, 2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_and_caches_keys(self):
+        batch_load = Loader()
+        loader = DataLoader(batch_load)
+
+        values = await loader.load_many([1, 2, 1, -1])
+
+        assert values == [10, 20, 10, None]
+        assert await loader.load(2) == 20
+        assert batch_load.batches == [[1, 2, -1]]
+
+    @pytest.mark.asyncio
+    async def test_splits_batches_by_max_batch_size(self):
+        batch_load = Loader()
+        loader = DataLoader(batch_load, max_batch_size=2)
+
+        values = await loader.load_many([1, 2, 3, 4, 5])
+
+        assert values == [10, 20, 30, 40, 50]
+        assert batch_load.batches == [[1, 2], [3, 4], [5]]
+        assert not loader._batches
+
+    @pytest.mark.asyncio
+    async def test_primed_keys_are_not_loaded(self):
+        batch_load = Loader()
+        loader = DataLoader(batch_load)
+
+        loader.prime(1, 100)
+
+        assert await loader.load_many([1, 2]) == [100, 20]
+        assert batch_load.batches == [[2]]
+
+    @pytest.mark.asyncio
+    async def test_failed_keys_are_retried(self):
+        batch_load = Loader(fail=True)
+        loader = DataLoader(batch_load)
+
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+
+        batch_load.fail = False
+
+        assert await loader.load(1) == 10
+        assert batch_load.batches == [[1], [1]]
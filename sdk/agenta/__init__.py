@@ -24,6 +24,7 @@ from .sdk.utils.logging import get_module_logger
 from .sdk.tracing import Tracing, get_tracer
 from .sdk.decorators.tracing import instrument
 from .sdk.tracing.conventions import Reference
+from .sdk.tracing.sampling import Sampling
 from .sdk.decorators.routing import entrypoint, app, route
 from .sdk.agenta_init import Config, AgentaSingleton, init as _init
 from .sdk.utils.costs import calculate_token_usage
@@ -57,6 +58,7 @@ def init(
     redact_on_error: Optional[bool] = True,
     scope_type: Optional[str] = None,
     scope_id: Optional[str] = None,
+    sampling: Optional[Sampling] = None,
 ):
     global api, async_api, tracing, tracer  # pylint: disable=global-statement
 
@@ -68,6 +70,7 @@ def init(
         redact_on_error=redact_on_error,
         scope_type=scope_type,
         scope_id=scope_id,
+        sampling=sampling,
     )
 
     api = DEFAULT_AGENTA_SINGLETON_INSTANCE.api  # type: ignore
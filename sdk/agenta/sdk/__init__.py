@@ -23,6 +23,7 @@ from .types import (
 from .tracing import Tracing, get_tracer
 from .decorators.tracing import instrument
 from .tracing.conventions import Reference
+from .tracing.sampling import Sampling
 from .decorators.routing import entrypoint, app, route
 from .agenta_init import Config, AgentaSingleton, init as _init
 from .utils.costs import calculate_token_usage
@@ -54,6 +55,7 @@ def init(
     redact_on_error: Optional[bool] = True,
     scope_type: Optional[str] = None,
     scope_id: Optional[str] = None,
+    sampling: Optional[Sampling] = None,
 ):
     global api, async_api, tracing, tracer  # pylint: disable=global-statement
 
@@ -65,6 +67,7 @@ def init(
         redact_on_error=redact_on_error,
         scope_type=scope_type,
         scope_id=scope_id,
+        sampling=sampling,
     )
 
     api = DEFAULT_AGENTA_SINGLETON_INSTANCE.api  # type: ignore
@@ -8,6 +8,7 @@ from agenta.sdk.utils.globals import set_global
 from agenta.client.client import AgentaApi, AsyncAgentaApi
 
 from agenta.sdk.tracing import Tracing
+from agenta.sdk.tracing.sampling import Sampling
 from agenta.sdk.context.routing import routing_context
 
 
@@ -46,6 +47,7 @@ class AgentaSingleton:
         redact_on_error: Optional[bool] = True,
         scope_type: Optional[str] = None,
         scope_id: Optional[str] = None,
+        sampling: Optional[Sampling] = None,
     ) -> None:
         """
         Main function to initialize the singleton.
@@ -64,6 +66,7 @@ class AgentaSingleton:
             host (Optional[str]): Host name of the backend server. Defaults to None. If not provided, will look for "backend_host" in the config file, then "AGENTA_HOST" in environment variables.
             api_key (Optional[str]): API Key to use with the host of the backend server. Defaults to None. If not provided, will look for "api_key" in the config file, then "AGENTA_API_KEY" in environment variables.
             config_fname (Optional[str]): Path to the configuration file (relative or absolute). Defaults to None.
+            sampling (Optional[Sampling]): Head and tail sampling of traces. Defaults to None. If not provided, will look for "AGENTA_TRACING_SAMPLING_*" in environment variables.
 
         """
 
@@ -100,6 +103,7 @@ class AgentaSingleton:
             url=f"{self.host}/api/otlp/v1/traces",  # type: ignore
             redact=redact,
             redact_on_error=redact_on_error,
+            sampling=sampling,
         )
 
         self.tracing.configure(
@@ -165,6 +169,7 @@ def init(
     redact_on_error: Optional[bool] = True,
     scope_type: Optional[str] = None,
     scope_id: Optional[str] = None,
+    sampling: Optional[Sampling] = None,
 ):
     """Main function to initialize the agenta sdk.
 
@@ -181,6 +186,7 @@ def init(
         host (Optional[str]): Host name of the backend server. Defaults to None. If not provided, will look for "backend_host" in the config file, then "AGENTA_HOST" in environment variables.
         api_key (Optional[str]): API Key to use with the host of the backend server. Defaults to None. If not provided, will look for "api_key" in the config file, then "AGENTA_API_KEY" in environment variables.
         config_fname (Optional[str]): Path to the configuration file. Defaults to None.
+        sampling (Optional[Sampling]): Head and tail sampling of traces. Defaults to None.
     """
 
     singleton = AgentaSingleton()
@@ -193,6 +199,7 @@ def init(
         redact_on_error=redact_on_error,
         scope_type=scope_type,
         scope_id=scope_id,
+        sampling=sampling,
     )
 
     set_global(
@@ -12,6 +12,7 @@ class TracingContext(BaseModel):
     credentials: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
     references: Optional[Dict[str, Any]] = None
+    inline: Optional[bool] = None
     link: Optional[Dict[str, Any]] = None
 
 
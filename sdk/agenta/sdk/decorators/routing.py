@@ -1,6 +1,14 @@
-from typing import Type, Any, Callable, Dict, Optional, Tuple, List
-from inspect import signature, iscoroutinefunction, Signature, Parameter
+from typing import Type, Any, AsyncIterator, Callable, Dict, Optional, Tuple, List
+from inspect import (
+    signature,
+    iscoroutinefunction,
+    isasyncgen,
+    isgenerator,
+    Signature,
+    Parameter,
+)
 from functools import wraps
+from json import dumps
 from traceback import format_exception
 from asyncio import sleep
 from uuid import UUID
@@ -8,6 +16,8 @@ from pydantic import BaseModel, HttpUrl, ValidationError
 from os import environ
 
 from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 
 from agenta.sdk.middleware.mock import MockMiddleware
 from agenta.sdk.middleware.inline import InlineMiddleware
@@ -19,6 +29,7 @@ from agenta.sdk.middleware.cors import CORSMiddleware
 
 from agenta.sdk.context.routing import (
     routing_context_manager,
+    routing_context,
     RoutingContext,
 )
 from agenta.sdk.context.tracing import (
@@ -42,6 +53,9 @@ log = get_module_logger(__name__)
 
 AGENTA_RUNTIME_PREFIX = environ.get("AGENTA_RUNTIME_PREFIX", "")
 
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 app = FastAPI(
     docs_url=f"{AGENTA_RUNTIME_PREFIX}/docs",  # Swagger UI
     openapi_url=f"{AGENTA_RUNTIME_PREFIX}/openapi.json",  # OpenAPI schema
@@ -105,6 +119,11 @@ class entrypoint:
     - It's better to make it explicit that an endpoint is for the playground.
     - Prefixing the routes with /run is more futureproof in case we add more endpoints.
 
+    Streaming:
+    - If the function is a generator or an async generator, the chunks are streamed
+      back as they are produced, using SSE (Accept: text/event-stream) or NDJSON (default).
+    - Each chunk is sent as a `data` frame, and the inline trace is sent as a final `trace` frame.
+
     Example:
     ```python
         import agenta as ag
@@ -340,6 +359,7 @@ class entrypoint:
                     credentials=credentials,
                     parameters=parameters,
                     references=references,
+                    inline=inline,
                 )
             ):
                 try:
@@ -349,6 +369,9 @@ class entrypoint:
                         else self.func(*args, **kwargs)
                     )
 
+                    if isasyncgen(result) or isgenerator(result):
+                        return self.handle_stream(request, result, inline)
+
                     return await self.handle_success(result, inline)
 
                 except Exception as error:  # pylint: disable=broad-except
@@ -402,6 +425,120 @@ class entrypoint:
                     content_type=content_type,
                 )
 
+    def handle_stream(
+        self,
+        request: Request,
+        result: Any,
+        inline: bool,
+    ):
+        accept = request.headers.get("accept") or ""
+        media_type = SSE_MEDIA_TYPE if SSE_MEDIA_TYPE in accept else NDJSON_MEDIA_TYPE
+
+        # The response body is iterated after execute_wrapper() has returned,
+        # so the routing and tracing contexts are captured here and re-entered
+        # while streaming.
+        _routing_context = routing_context.get()
+        _tracing_context = tracing_context.get()
+
+        chunks: AsyncIterator[Any] = (
+            result if isasyncgen(result) else iterate_in_threadpool(result)
+        )
+
+        async def stream():
+            with routing_context_manager(context=_routing_context):
+                with tracing_context_manager(context=_tracing_context):
+                    content_type = "text/plain"
+
+                    try:
+                        async for chunk in chunks:
+                            if isinstance(chunk, (dict, list)):
+                                content_type = "application/json"
+
+                            yield self.encode_frame(
+                                media_type,
+                                "data",
+                                {"data": self.patch_chunk(chunk)},
+                            )
+
+                    except Exception as error:  # pylint: disable=broad-except
+                        # The status code is already sent, so the error is a frame.
+                        display_exception("Application Exception")
+
+                        stacktrace = format_exception(
+                            error, value=error, tb=error.__traceback__
+                        )  # type: ignore
+
+                        yield self.encode_frame(
+                            media_type,
+                            "error",
+                            {"message": str(error), "stacktrace": stacktrace},
+                        )
+
+                        return
+
+                    tree = None
+                    tree_id = None
+                    trace_id = None
+                    span_id = None
+
+                    with suppress():
+                        (
+                            tree,
+                            tree_id,
+                            trace_id,
+                            span_id,
+                        ) = await self.fetch_inline_trace(inline)
+
+                    trace = BaseResponse(
+                        content_type=content_type,
+                        tree_id=tree_id,
+                        trace_id=trace_id,
+                        span_id=span_id,
+                    ).model_dump(exclude_none=True)
+
+                    if tree:
+                        trace["tree"] = tree
+
+                    yield self.encode_frame(media_type, "trace", trace)
+
+        return StreamingResponse(stream(), media_type=media_type)
+
+    def patch_chunk(
+        self,
+        chunk: Any,
+    ):
+        """
+        Patch a streamed chunk so that it can be encoded as JSON.
+
+        Strings, numbers, dictionaries and lists are kept as they are,
+        pydantic models (e.g. litellm chunks) are dumped, anything else is stringified.
+        """
+        if chunk is None or isinstance(chunk, (str, int, float, bool, dict, list)):
+            return chunk
+
+        if hasattr(chunk, "model_dump"):
+            return chunk.model_dump()
+
+        return str(chunk)
+
+    def encode_frame(
+        self,
+        media_type: str,
+        event: str,
+        payload: Dict[str, Any],
+    ) -> str:
+        """
+        Encode a streamed frame as an SSE event or as an NDJSON line.
+
+        Example:
+        - SSE:    'event: data\ndata: {"data": "Hello"}\n\n'
+        - NDJSON: '{"event": "data", "data": "Hello"}\n'
+        """
+        if media_type == SSE_MEDIA_TYPE:
+            return f"event: {event}\ndata: {dumps(payload, default=str)}\n\n"
+
+        return dumps({"event": event, **payload}, default=str) + "\n"
+
     def handle_failure(
         self,
         error: Exception,
@@ -1,11 +1,18 @@
 from typing import Callable, Optional, Any, Dict, List, Union
 
+from time import time_ns
 from functools import wraps
 from itertools import chain
-from inspect import iscoroutinefunction, getfullargspec
+from contextlib import contextmanager
+from inspect import (
+    iscoroutinefunction,
+    isgeneratorfunction,
+    isasyncgenfunction,
+    getfullargspec,
+)
 
 from opentelemetry import baggage
-from opentelemetry.trace import NonRecordingSpan
+from opentelemetry.trace import NonRecordingSpan, Status, StatusCode, use_span
 from opentelemetry.context import attach, detach, get_current
 from opentelemetry.baggage import set_baggage, get_all
 
@@ -33,6 +40,7 @@ class instrument:  # pylint: disable=invalid-name
         redact: Optional[Callable[..., Any]] = None,
         redact_on_error: Optional[bool] = True,
         max_depth: Optional[int] = 2,
+        max_chunks: Optional[int] = 1000,
         # DEPRECATING
         kind: str = "task",
         spankind: Optional[str] = "TASK",
@@ -45,9 +53,12 @@ class instrument:  # pylint: disable=invalid-name
         self.redact = redact
         self.redact_on_error = redact_on_error
         self.max_depth = max_depth
+        self.max_chunks = max_chunks
 
     def __call__(self, func: Callable[..., Any]):
         is_coroutine_function = iscoroutinefunction(func)
+        is_generator_function = isgeneratorfunction(func)
+        is_async_generator_function = isasyncgenfunction(func)
 
         @wraps(func)
         async def awrapper(*args, **kwargs):
@@ -105,10 +116,186 @@ class instrument:  # pylint: disable=invalid-name
 
             return auto_instrumented(*args, **kwargs)
 
+        @wraps(func)
+        async def agwrapper(*args, **kwargs):
+            span = self._start_span(func)
+
+            with self._use_span(span):
+                self._set_link()
+
+                self._pre_instrument(func, *args, **kwargs)
+
+                generator = func(*args, **kwargs)
+
+            chunks = []
+            count = 0
+
+            try:
+                while True:
+                    with self._use_span(span):
+                        try:
+                            chunk = await generator.__anext__()
+                        except StopAsyncIteration:
+                            break
+
+                    count = self._add_chunk(span, chunks, count, chunk)
+
+                    yield chunk
+
+            except GeneratorExit:
+                await generator.aclose()
+
+                raise
+
+            except Exception as error:
+                self._record_error(span, error)
+
+                raise
+
+            else:
+                with self._use_span(span):
+                    self._post_instrument(self._aggregate(chunks))
+
+            finally:
+                self._end_span(span, count)
+
+        @wraps(func)
+        def gwrapper(*args, **kwargs):
+            span = self._start_span(func)
+
+            with self._use_span(span):
+                self._set_link()
+
+                self._pre_instrument(func, *args, **kwargs)
+
+                generator = func(*args, **kwargs)
+
+            chunks = []
+            count = 0
+
+            try:
+                while True:
+                    with self._use_span(span):
+                        try:
+                            chunk = next(generator)
+                        except StopIteration:
+                            break
+
+                    count = self._add_chunk(span, chunks, count, chunk)
+
+                    yield chunk
+
+            except GeneratorExit:
+                generator.close()
+
+                raise
+
+            except Exception as error:
+                self._record_error(span, error)
+
+                raise
+
+            else:
+                with self._use_span(span):
+                    self._post_instrument(self._aggregate(chunks))
+
+            finally:
+                self._end_span(span, count)
+
+        if is_async_generator_function:
+            return agwrapper
+
+        if is_generator_function:
+            return gwrapper
+
         return awrapper if is_coroutine_function else wrapper
 
+    # --- STREAMING --- #
+    # Generators are iterated by the caller, possibly from different threads or tasks,
+    # so the span is not kept as the current span between chunks. Instead, it is
+    # started manually and made current only while the next chunk is being produced.
+
+    def _start_span(self, func):
+        self._parse_type_and_kind()
+
+        token = self._attach_baggage()
+
+        ctx = self._get_traceparent()
+
+        span = ag.tracer.start_span(
+            name=func.__name__,
+            kind=self.kind,
+            context=ctx,
+        )
+
+        self._detach_baggage(token)
+
+        return span
+
+    @contextmanager
+    def _use_span(self, span):
+        token = self._attach_baggage()
+
+        try:
+            with use_span(
+                span,
+                end_on_exit=False,
+                record_exception=False,
+                set_status_on_exception=False,
+            ):
+                yield
+        finally:
+            self._detach_baggage(token)
+
+    def _add_chunk(self, span, chunks, count, chunk) -> int:
+        if count == 0 and span.is_recording():
+            with suppress():
+                span.set_attribute(
+                    "ag.metrics.unit.streaming.time_to_first_chunk",
+                    round((time_ns() - span.start_time) / 1_000_000, 3),  # milliseconds
+                )
+
+        # Chunks are only referenced here, and aggregated once the stream is over.
+        if self.max_chunks is None or count < self.max_chunks:
+            chunks.append(chunk)
+
+        return count + 1
+
+    def _aggregate(self, chunks: List[Any]) -> Any:
+        """
+        Aggregate the streamed chunks into a single output.
+
+        Example:
+        - chunks = ["Hello", ", ", "World!"]
+            -> "Hello, World!"
+        - chunks = [{"delta": "Hello"}, {"delta": "World!"}]
+            -> [{"delta": "Hello"}, {"delta": "World!"}]
+        """
+        if chunks and all(isinstance(chunk, str) for chunk in chunks):
+            return "".join(chunks)
+
+        return chunks
+
+    def _record_error(self, span, error: Exception):
+        with suppress():
+            span.record_exception(error)
+            span.set_status(
+                Status(
+                    status_code=StatusCode.ERROR,
+                    description=f"{type(error).__name__}: {error}",
+                )
+            )
+
+    def _end_span(self, span, count: int):
+        if span.is_recording():
+            with suppress():
+                span.set_attribute("ag.metrics.unit.streaming.chunks", float(count))
+
+        span.end()
+
     def _parse_type_and_kind(self):
-        if not ag.tracing.get_current_span().is_recording():
+        # Roots are workflows, i.e. without any parent span, sampled or not
+        if not ag.tracing.get_current_span().get_span_context().is_valid:
             self.type = "workflow"
 
         self.kind = parse_span_kind(self.type)
@@ -142,12 +329,16 @@ class instrument:  # pylint: disable=invalid-name
 
         references = context.references
 
-        token = None
-        if references:
-            for k, v in references.items():
-                token = attach(baggage.set_baggage(f"ag.refs.{k}", v))
+        if not references:
+            return None
+
+        # All references in one context, attached (and later detached) at once
+        ctx = get_current()
 
-        return token
+        for k, v in references.items():
+            ctx = baggage.set_baggage(f"ag.refs.{k}", v, context=ctx)
+
+        return attach(ctx)
 
     def _detach_baggage(
         self,
@@ -164,6 +355,10 @@ class instrument:  # pylint: disable=invalid-name
     ):
         span = ag.tracing.get_current_span()
 
+        # e.g. not sampled, in which case there is nothing to record
+        if not span.is_recording():
+            return
+
         context = tracing_context.get()
 
         with suppress():
@@ -201,6 +396,9 @@ class instrument:  # pylint: disable=invalid-name
     ):
         span = ag.tracing.get_current_span()
 
+        if not span.is_recording():
+            return
+
         with suppress():
             cost = None
             usage = {}
@@ -59,20 +59,16 @@ def litellm_handler():
 
             kind = SpanKind.CLIENT
 
-            self.span[litellm_call_id] = CustomSpan(
-                ag.tracer.start_span(name=f"litellm_{kind.name.lower()}", kind=kind)
-            )
-
-            span = self.span[litellm_call_id]
-
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
-                return
+            span = ag.tracer.start_span(name=f"litellm_{kind.name.lower()}", kind=kind)
 
+            # e.g. not sampled, in which case there is nothing to record
             if not span.is_recording():
-                log.error("Agenta SDK - litellm span not recording.")
                 return
 
+            span = CustomSpan(span)
+
+            self.span[litellm_call_id] = span
+
             span.set_attributes(
                 attributes={"node": type},
                 namespace="type",
@@ -106,10 +102,9 @@ def litellm_handler():
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
@@ -123,7 +118,11 @@ def litellm_handler():
             end_time,
         ):
             if kwargs.get("stream"):
-                return
+                # STREAMED CALLS ARE LOGGED ONCE, WHEN THE STREAM IS COMPLETE
+                response_obj = kwargs.get("complete_streaming_response")
+
+                if response_obj is None:
+                    return
 
             litellm_call_id = kwargs.get("litellm_call_id")
 
@@ -131,10 +130,9 @@ def litellm_handler():
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
@@ -206,10 +204,9 @@ def litellm_handler():
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
@@ -237,10 +234,9 @@ def litellm_handler():
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
@@ -253,16 +249,22 @@ def litellm_handler():
             start_time,
             end_time,
         ):
+            if kwargs.get("stream"):
+                # STREAMED CALLS ARE LOGGED ONCE, WHEN THE STREAM IS COMPLETE
+                response_obj = kwargs.get("complete_streaming_response")
+
+                if response_obj is None:
+                    return
+
             litellm_call_id = kwargs.get("litellm_call_id")
 
             if not litellm_call_id:
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
@@ -334,10 +336,9 @@ def litellm_handler():
                 log.warning("Agenta SDK - litellm tracing failed")
                 return
 
-            span = self.span[litellm_call_id]
+            span = self.span.get(litellm_call_id)
 
-            if not span:
-                log.warning("Agenta SDK - litellm tracing failed")
+            if not span:  # e.g. not sampled
                 return
 
             if not span.is_recording():
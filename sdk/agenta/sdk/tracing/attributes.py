@@ -1,10 +1,38 @@
-from json import loads, dumps
+from json import dumps
+from os import getenv
 from typing import Optional, Union, Sequence, Any, Dict
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 Primitive = Union[str, int, float, bool, bytes]
 PrimitivesSequence = Sequence[Primitive]
 Attribute = Union[Primitive, PrimitivesSequence]
 
+_JSON_PREFIX = "@ag.type=json:"
+_TRUNCATION_MARKER = "...[truncated {dropped} bytes]"
+
+# Byte budgets for encoded attributes, per attribute and per span (0 means unlimited)
+MAX_ATTRIBUTE_SIZE = int(getenv("AGENTA_TRACING_MAX_ATTRIBUTE_SIZE", str(1024 * 1024)))
+MAX_SPAN_SIZE = int(getenv("AGENTA_TRACING_MAX_SPAN_SIZE", "0"))
+
+
+class Budget:
+    """
+    Tracks the bytes used and dropped while encoding attributes,
+    within an optional remaining (per-span) byte budget.
+    """
+
+    def __init__(
+        self,
+        remaining: Optional[int] = None,
+    ):
+        self.remaining = remaining
+        self.used = 0
+        self.dropped = 0
+
 
 def _marshal(
     unmarshalled: Dict[str, Any],
@@ -12,6 +40,7 @@ def _marshal(
     parent_key: Optional[str] = "",
     depth: Optional[int] = 0,
     max_depth: Optional[int] = None,
+    marshalled: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Marshals a dictionary of unmarshalled attributes into a flat dictionary
@@ -40,55 +69,56 @@ def _marshal(
         "ag.node.children.1.name": "child2"
     }
     """
-    marshalled = {}
+    # A single flat dictionary is filled in place, across all levels
+    if marshalled is None:
+        marshalled = {}
 
     # If max_depth is set and we've reached it,
-    # just return the unmarshalled attributes
+    # just return the unmarshalled attributes (encoded later on)
     if max_depth is not None and depth >= max_depth:
         marshalled[parent_key] = unmarshalled
-        # MISSING ENCODING TO JSON IF NOT PRIMITIVE
 
         return marshalled
 
+    items = (
+        unmarshalled.items()
+        if isinstance(unmarshalled, dict)
+        else enumerate(unmarshalled)
+    )
+
     # Otherwise,
     # iterate over the unmarshalled attributes and marshall them
-    for key, value in unmarshalled.items():
-        child_key = f"{parent_key}.{key}" if parent_key else key
+    for key, value in items:
+        child_key = f"{parent_key}.{key}" if parent_key else str(key)
 
         if isinstance(value, dict):
-            dict_key = child_key
-
-            marshalled.update(
-                _marshal(
-                    value,
-                    parent_key=dict_key,
-                    depth=depth + 1,
-                    max_depth=max_depth,
-                )
+            _marshal(
+                value,
+                parent_key=child_key,
+                depth=depth + 1,
+                max_depth=max_depth,
+                marshalled=marshalled,
             )
         elif isinstance(value, list):
             if max_depth is not None and depth + 1 >= max_depth:
                 marshalled[child_key] = value
-                # MISSING ENCODING TO JSON IF NOT PRIMITIVE
             else:
+                # A list and its indices share one level of depth
                 for i, item in enumerate(value):
                     list_key = f"{child_key}.{i}"
 
                     if isinstance(item, (dict, list)):
-                        marshalled.update(
-                            _marshal(
-                                item,
-                                parent_key=list_key,
-                                depth=depth + 1,
-                                max_depth=max_depth,
-                            )
+                        _marshal(
+                            item,
+                            parent_key=list_key,
+                            depth=depth + 1,
+                            max_depth=max_depth,
+                            marshalled=marshalled,
                         )
                     else:
                         marshalled[list_key] = item
-                        # MISSING ENCODING TO JSON IF NOT PRIMITIVE
         else:
             marshalled[child_key] = value
-            # MISSING ENCODING TO JSON IF NOT PRIMITIVE
 
     return marshalled
 
@@ -103,65 +133,119 @@ def _encode_key(
     return f"ag.{namespace}.{key}"
 
 
-def _make_serializable(value: Any) -> Any:
+def _default(value: Any) -> Any:
     """
-    Transform complex nested structures into JSON-serializable form.
-    Handles Pydantic models, nested dictionaries and lists recursively.
+    Fallback for values the JSON encoder cannot handle natively.
+    Handles Pydantic models, and represents anything else.
     """
-    if value is None or isinstance(value, (str, int, float, bool, bytes)):
-        return value
-
     # Handle Pydantic objects (prioritize v2 over v1 API)
     if hasattr(value, "model_dump"):  # Pydantic v2
         return value.model_dump()
     elif hasattr(value, "dict"):  # Pydantic v1
         return value.dict()
 
-    if isinstance(value, dict):
-        try:
-            # Test serialization without modifying - optimizes for already-serializable dicts
-            dumps(
-                value
-            )  # If serialization fails, we'll catch the exception and process deeply
-            return value  # Avoid unnecessary recursion for serializable dicts
-        except TypeError:
-            return {k: _make_serializable(v) for k, v in value.items()}
-    elif isinstance(value, list):
+    return repr(value)
+
+
+def _dumps(value: Any) -> str:
+    """
+    Encode a value to JSON in a single pass, using orjson when available.
+    """
+    if orjson is not None:
         try:
-            # Test serialization without modifying - optimizes for already-serializable lists
-            dumps(
-                value
-            )  # If serialization fails, we'll catch the exception and process deeply
-            return value  # Avoid unnecessary recursion for serializable lists
-        except TypeError:
-            return [_make_serializable(item) for item in value]
+            return orjson.dumps(
+                value,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS,
+            ).decode("utf-8")
+        except (TypeError, ValueError):  # e.g. integers above 64 bits
+            pass
 
-    return repr(value)
+    return dumps(value, default=_default)
+
+
+def _truncate(
+    encoded: str,
+    budget: Budget,
+) -> Optional[str]:
+    """
+    Truncate an encoded value to the per-attribute and remaining per-span byte budgets.
+    Truncated JSON is no longer valid, so it is kept as a plain string, with a marker.
+    """
+    limit = MAX_ATTRIBUTE_SIZE or None
+
+    if budget.remaining is not None:
+        limit = min(limit, budget.remaining) if limit is not None else budget.remaining
+
+    if limit is None:
+        return encoded
+
+    # A character is at most 4 bytes, so short strings skip the byte count,
+    # unless the bytes are accounted for in a per-span budget
+    if budget.remaining is None and len(encoded) * 4 <= limit:
+        return encoded
+
+    data = encoded.encode("utf-8")
+    size = len(data)
+
+    if size > limit:
+        if encoded.startswith(_JSON_PREFIX):
+            data = data[len(_JSON_PREFIX) :]
+
+        # The marker counts towards the limit, and is never longer
+        # than when formatted with every byte dropped
+        marker = _TRUNCATION_MARKER.format(dropped=len(data))
+        truncated = data[: max(limit - len(marker), 0)].decode("utf-8", "ignore")
+        dropped = len(data) - len(truncated.encode("utf-8"))
+
+        budget.dropped += dropped
+
+        encoded = (
+            truncated + _TRUNCATION_MARKER.format(dropped=dropped)
+            if truncated
+            else None
+        )
+        size = len(encoded.encode("utf-8")) if encoded else 0
 
+    budget.used += size
 
-def _encode_value(value: Any) -> Optional[Attribute]:
+    if budget.remaining is not None:
+        budget.remaining = max(budget.remaining - size, 0)
+
+    return encoded
+
+
+def _encode_value(
+    value: Any,
+    budget: Optional[Budget] = None,
+) -> Optional[Attribute]:
     """
     Encode values for tracing, ensuring proper JSON serialization.
     Adds the @ag.type=json: prefix only to appropriate values.
     """
+    if budget is None:
+        budget = Budget()
+
     if value is None:
         return None
 
-    if isinstance(value, (str, int, float, bool, bytes)):
+    if isinstance(value, (bool, int, float, bytes)):
         return value
 
+    if isinstance(value, str):
+        return _truncate(value, budget)
+
     try:
         if (
             isinstance(value, (dict, list))
             or hasattr(value, "model_dump")
             or hasattr(value, "dict")
         ):
-            serializable_value = _make_serializable(value)
-            return "@ag.type=json:" + dumps(serializable_value)
-    except TypeError:
+            return _truncate(_JSON_PREFIX + _dumps(value), budget)
+    except (TypeError, ValueError):
         pass
 
-    return repr(value)
+    return _truncate(repr(value), budget)
 
 
 def serialize(
@@ -169,17 +253,20 @@ def serialize(
     namespace: str,
     attributes: Dict[str, Any],
     max_depth: Optional[int] = None,
+    budget: Optional[Budget] = None,
 ) -> Dict[str, str]:
     if not isinstance(attributes, dict):
         return {}
 
-    _attributes = {
-        k: v
-        for k, v in {
-            _encode_key(namespace, key): _encode_value(value)
-            for key, value in _marshal(attributes, max_depth=max_depth).items()
-        }.items()
-        if v is not None
-    }
+    if budget is None:
+        budget = Budget()
+
+    _attributes = {}
+
+    for key, value in _marshal(attributes, max_depth=max_depth).items():
+        encoded = _encode_value(value, budget)
+
+        if encoded is not None:
+            _attributes[_encode_key(namespace, key)] = encoded
 
     return _attributes
@@ -1,5 +1,6 @@
 from typing import Optional, Dict, List
 from threading import Lock
+from collections import OrderedDict
 
 from opentelemetry.baggage import get_all as get_baggage
 from opentelemetry.context import Context
@@ -16,9 +17,16 @@ from opentelemetry.sdk.trace.export import (
 
 from agenta.sdk.utils.logging import get_module_logger
 from agenta.sdk.tracing.conventions import Reference
+from agenta.sdk.tracing.sampling import TailSampler
+from agenta.sdk.context.tracing import tracing_context
 
 log = get_module_logger(__name__)
 
+# Traces buffered for tail sampling, beyond which the oldest ones are decided early
+_MAX_BUFFERED_TRACES = 2048
+# Decisions remembered for tail sampling, so that late spans follow their trace's
+_MAX_DECIDED_TRACES = 4 * _MAX_BUFFERED_TRACES
+
 
 class TraceProcessor(BatchSpanProcessor):
     def __init__(
@@ -26,6 +34,7 @@ class TraceProcessor(BatchSpanProcessor):
         span_exporter: SpanExporter,
         references: Dict[str, str] = None,
         inline: bool = False,
+        tail: Optional[TailSampler] = None,
         max_queue_size: int = None,
         schedule_delay_millis: float = None,
         max_export_batch_size: int = None,
@@ -49,6 +58,19 @@ class TraceProcessor(BatchSpanProcessor):
             self._spans: Dict[int, List[ReadableSpan]] = dict()
         # --- INLINE
 
+        # --- TAIL SAMPLING
+        self.tail = tail if not self.inline else None
+
+        if self.tail:
+            self._open: Dict[int, Dict[int, bool]] = dict()
+            self._buffer: Dict[int, List[ReadableSpan]] = OrderedDict()
+            self._inline_traces: Dict[int, bool] = dict()
+            # None while pending, then whether the trace was kept
+            self._decided: Dict[int, Optional[bool]] = OrderedDict()
+            self._late: Dict[int, List[ReadableSpan]] = dict()
+            self._lock = Lock()
+        # --- TAIL SAMPLING
+
     def on_start(
         self,
         span: Span,
@@ -73,6 +95,23 @@ class TraceProcessor(BatchSpanProcessor):
             self._registry[span.context.trace_id][span.context.span_id] = True
         # --- INLINE
 
+        # --- TAIL SAMPLING
+        if self.tail:
+            with self._lock:
+                trace_id = span.context.trace_id
+
+                if trace_id in self._decided:  # late spans are not waited for
+                    return
+
+                if trace_id not in self._open:
+                    self._open[trace_id] = dict()
+
+                self._open[trace_id][span.context.span_id] = True
+
+                if tracing_context.get().inline:
+                    self._inline_traces[trace_id] = True
+        # --- TAIL SAMPLING
+
     def on_end(
         self,
         span: ReadableSpan,
@@ -93,11 +132,126 @@ class TraceProcessor(BatchSpanProcessor):
                 self.export(span.context.trace_id)
         # --- INLINE
 
+        # --- TAIL SAMPLING
+        elif self.tail:
+            self._sample(span)
+        # --- TAIL SAMPLING
+
         # --- DISTRIBUTED
         else:
             super().on_end(span)
         # --- DISTRIBUTED
 
+    def _sample(
+        self,
+        span: ReadableSpan,
+    ):
+        decisions = []
+
+        with self._lock:
+            trace_id = span.context.trace_id
+
+            # LATE SPANS FOLLOW THE DECISION ALREADY MADE FOR THEIR TRACE, IF ANY
+            if trace_id in self._decided:
+                keep = self._decided[trace_id]
+
+                if keep is None:
+                    self._late.setdefault(trace_id, []).append(span)
+
+                    return
+
+            else:
+                keep = None
+
+                if trace_id not in self._buffer:
+                    self._buffer[trace_id] = list()
+
+                self._buffer[trace_id].append(span)
+
+                self._open.get(trace_id, {}).pop(span.context.span_id, None)
+
+                # THE TRACE IS DECIDED ONCE ALL OF ITS SPANS HAVE ENDED, I.E. ONCE ITS ROOT HAS ENDED
+                if not self._open.get(trace_id):
+                    decisions.append(trace_id)
+
+                # TRACES THAT NEVER END ARE DECIDED EARLY, WITH WHATEVER WAS BUFFERED
+                while len(self._buffer) - len(decisions) > _MAX_BUFFERED_TRACES:
+                    oldest = next(
+                        _trace_id
+                        for _trace_id in self._buffer
+                        if _trace_id not in decisions
+                    )
+                    decisions.append(oldest)
+
+            decided = self._pop(decisions)
+
+        if keep:
+            super().on_end(span)
+
+        self._decide(decided)
+
+    def _pop(
+        self,
+        trace_ids: List[int],
+    ):
+        decided = []
+
+        for trace_id in trace_ids:
+            self._open.pop(trace_id, None)
+
+            self._decided[trace_id] = None
+
+            decided.append(
+                (
+                    trace_id,
+                    self._buffer.pop(trace_id),
+                    self._inline_traces.pop(trace_id, False),
+                )
+            )
+
+        while len(self._decided) > _MAX_DECIDED_TRACES:
+            self._decided.popitem(last=False)
+
+        return decided
+
+    def _decide(
+        self,
+        decided,
+    ):
+        for trace_id, spans, inline in decided:
+            keep = self.tail.should_keep(spans, inline=inline)
+
+            with self._lock:
+                self._decided[trace_id] = keep
+
+                spans = spans + self._late.pop(trace_id, [])
+
+            if keep:
+                for span in spans:
+                    super().on_end(span)
+
+    def _drain(self):
+        with self._lock:
+            decided = self._pop(list(self._buffer.keys()))
+
+        self._decide(decided)
+
+    def shutdown(self) -> None:
+        # --- TAIL SAMPLING
+        if self.tail:
+            self._drain()
+
+            stats = self.tail.stats.get()
+
+            log.info(
+                "Agenta - Tail sampling: %s traces kept, %s traces dropped.",
+                stats["kept"],
+                stats["dropped"],
+            )
+        # --- TAIL SAMPLING
+
+        super().shutdown()
+
     def export(
         self,
         trace_id: int,
@@ -119,11 +273,18 @@ class TraceProcessor(BatchSpanProcessor):
         self,
         timeout_millis: int = None,
     ) -> bool:
+        # --- TAIL SAMPLING
+        if self.tail:
+            self._drain()
+        # --- TAIL SAMPLING
+
         ret = super().force_flush(timeout_millis)
 
         if not ret:
             log.warning("Agenta - Skipping export due to timeout.")
 
+        return ret
+
     def is_ready(
         self,
         trace_id: Optional[int] = None,
@@ -0,0 +1,190 @@
+from typing import Optional, Callable, Sequence, Dict, List
+from os import getenv
+from threading import Lock
+
+from pydantic import BaseModel, ConfigDict
+
+from opentelemetry.context import Context
+from opentelemetry.trace import Link, SpanKind, get_current_span
+from opentelemetry.trace.status import StatusCode
+from opentelemetry.util.types import Attributes
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.sampling import (
+    Sampler,
+    SamplingResult,
+    Decision,
+    ParentBased,
+    TraceIdRatioBased,
+)
+
+from agenta.sdk.context.tracing import tracing_context
+from agenta.sdk.utils.constants import TRUTHY
+
+Rule = Callable[[Sequence[ReadableSpan]], bool]
+
+
+class Sampling(BaseModel):
+    """
+    Sampling configuration for the SDK tracing.
+
+    - ratio: head sampling ratio, deterministic by trace id (1.0 keeps everything).
+    - tail: whether to buffer traces and decide once their root has ended.
+    - errors: (tail) keep traces with at least one span in error.
+    - latency: (tail) keep traces whose root lasted at least this long, in milliseconds.
+    - cost: (tail) keep traces whose spans cost at least this much, in total.
+    - rules: (tail) keep traces for which any of these predicates returns True.
+
+    Inline traces (e.g. from /test) are always kept.
+    """
+
+    ratio: float = 1.0
+    tail: bool = False
+    errors: bool = True
+    latency: Optional[float] = None
+    cost: Optional[float] = None
+    rules: List[Rule] = []
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_env(cls) -> "Sampling":
+        latency = getenv("AGENTA_TRACING_SAMPLING_LATENCY")
+        cost = getenv("AGENTA_TRACING_SAMPLING_COST")
+
+        return cls(
+            ratio=float(getenv("AGENTA_TRACING_SAMPLING_RATIO", "1.0")),
+            tail=getenv("AGENTA_TRACING_SAMPLING_TAIL", "false").lower() in TRUTHY,
+            errors=getenv("AGENTA_TRACING_SAMPLING_ERRORS", "true").lower() in TRUTHY,
+            latency=float(latency) if latency else None,
+            cost=float(cost) if cost else None,
+        )
+
+
+class SamplingStats:
+    def __init__(self):
+        self.kept = 0
+        self.dropped = 0
+        self._lock = Lock()
+
+    def count(self, kept: bool) -> None:
+        with self._lock:
+            if kept:
+                self.kept += 1
+            else:
+                self.dropped += 1
+
+    def get(self) -> Dict[str, int]:
+        with self._lock:
+            return {"kept": self.kept, "dropped": self.dropped}
+
+
+class HeadSampler(Sampler):
+    """
+    Samples traces by ratio, deterministically by trace id, following the parent's decision.
+    Spans started within an inline trace are always sampled.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 1.0,
+    ):
+        self.ratio = ratio
+        self.stats = SamplingStats()
+
+        self._sampler = ParentBased(TraceIdRatioBased(ratio))
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state=None,
+    ) -> SamplingResult:
+        if tracing_context.get().inline:
+            result = SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+        else:
+            result = self._sampler.should_sample(
+                parent_context,
+                trace_id,
+                name,
+                kind,
+                attributes,
+                links,
+                trace_state,
+            )
+
+        parent_span_context = get_current_span(parent_context).get_span_context()
+
+        # Count decisions per trace, i.e. on local roots only
+        if not parent_span_context.is_valid or parent_span_context.is_remote:
+            self.stats.count(result.decision.is_sampled())
+
+        return result
+
+    def get_description(self) -> str:
+        return f"HeadSampler{{{self.ratio}}}"
+
+
+class TailSampler:
+    """
+    Decides whether to keep a trace, once all of its spans have ended.
+    """
+
+    def __init__(
+        self,
+        sampling: Sampling,
+    ):
+        self.sampling = sampling
+        self.stats = SamplingStats()
+
+    def should_keep(
+        self,
+        spans: Sequence[ReadableSpan],
+        inline: bool = False,
+    ) -> bool:
+        keep = inline or self._should_keep(spans)
+
+        self.stats.count(keep)
+
+        return keep
+
+    def _should_keep(
+        self,
+        spans: Sequence[ReadableSpan],
+    ) -> bool:
+        if self.sampling.errors and any(
+            span.status.status_code == StatusCode.ERROR for span in spans
+        ):
+            return True
+
+        if self.sampling.latency is not None:
+            roots = [
+                span for span in spans if span.parent is None or span.parent.is_remote
+            ]
+
+            for root in roots:
+                duration = (root.end_time - root.start_time) / 1_000_000  # milliseconds
+
+                if duration >= self.sampling.latency:
+                    return True
+
+        if self.sampling.cost is not None:
+            cost = sum(
+                float(span.attributes.get("ag.metrics.unit.costs.total") or 0.0)
+                for span in spans
+            )
+
+            if cost >= self.sampling.cost:
+                return True
+
+        for rule in self.sampling.rules:
+            try:
+                if rule(spans):
+                    return True
+            except:  # pylint: disable=bare-except
+                pass
+
+        return False
@@ -1,10 +1,18 @@
 from typing import Optional, Union, Any, Dict
+from weakref import WeakKeyDictionary
 
 from opentelemetry.trace import SpanContext
 from opentelemetry.trace.status import Status, StatusCode
 from opentelemetry.sdk.trace import Span
 
-from agenta.sdk.tracing.attributes import serialize
+from agenta.sdk.tracing.attributes import serialize, Budget, MAX_SPAN_SIZE
+
+_BYTES_KEY = "ag.metrics.unit.attributes.bytes"
+_DROPPED_BYTES_KEY = "ag.metrics.unit.attributes.dropped_bytes"
+
+# Spans are wrapped on demand (e.g. on each get_current_span()),
+# so budgets are kept per wrapped span, for as long as it lives
+_budgets: "WeakKeyDictionary[Span, Budget]" = WeakKeyDictionary()
 
 
 class CustomSpan(Span):  # INHERITANCE FOR TYPING ONLY
@@ -60,6 +68,29 @@ class CustomSpan(Span):  # INHERITANCE FOR TYPING ONLY
     def end(self) -> None:
         self._span.end()
 
+    ## --- ATTRIBUTES BUDGET --- ##
+    # The bytes used and dropped so far are also reported on the span, as metrics.
+
+    def _get_budget(self) -> Budget:
+        budget = _budgets.get(self._span)
+
+        if budget is None:
+            budget = _budgets[self._span] = Budget(remaining=MAX_SPAN_SIZE or None)
+
+        return budget
+
+    def _put_budget(
+        self,
+        budget: Budget,
+        used: int,
+        dropped: int,
+    ) -> None:
+        if MAX_SPAN_SIZE and budget.used != used:
+            self._span.set_attribute(_BYTES_KEY, float(budget.used))
+
+        if budget.dropped != dropped:
+            self._span.set_attribute(_DROPPED_BYTES_KEY, float(budget.dropped))
+
     ## --- CUSTOM METHODS W/ ATTRIBUTES SERALIZATION --- ##
 
     def set_attributes(
@@ -68,14 +99,20 @@ class CustomSpan(Span):  # INHERITANCE FOR TYPING ONLY
         namespace: Optional[str] = None,
         max_depth: Optional[int] = None,
     ) -> None:
+        budget = self._get_budget()
+        used, dropped = budget.used, budget.dropped
+
         self._span.set_attributes(
             attributes=serialize(
                 namespace=namespace,
                 attributes=attributes,
                 max_depth=max_depth,
+                budget=budget,
             )
         )
 
+        self._put_budget(budget, used, dropped)
+
     def set_attribute(
         self,
         key: str,
@@ -27,6 +27,7 @@ from agenta.sdk.tracing.processors import (
     _get_last_ended,
 )
 from agenta.sdk.tracing.exporters import InlineExporter, OTLPExporter
+from agenta.sdk.tracing.sampling import Sampling, HeadSampler, TailSampler
 from agenta.sdk.tracing.spans import CustomSpan
 from agenta.sdk.tracing.inline import parse_inline_trace
 from agenta.sdk.tracing.conventions import Reference, is_valid_attribute_key
@@ -65,6 +66,7 @@ class Tracing(metaclass=Singleton):
         url: str,
         redact: Optional[Callable[..., Any]] = None,
         redact_on_error: Optional[bool] = True,
+        sampling: Optional[Sampling] = None,
     ) -> None:
         # ENDPOINT (OTLP)
         self.otlp_url = url
@@ -88,6 +90,12 @@ class Tracing(metaclass=Singleton):
         self.redact = redact
         self.redact_on_error = redact_on_error
 
+        # SAMPLING
+        self.sampling = sampling or Sampling.from_env()
+        # SAMPLERS -- HEAD & TAIL
+        self.head: Optional[HeadSampler] = None
+        self.tail: Optional[TailSampler] = None
+
     # PUBLIC
 
     def configure(
@@ -99,9 +107,14 @@ class Tracing(metaclass=Singleton):
         if api_key:
             self.headers["Authorization"] = f"ApiKey {api_key}"
 
+        # SAMPLERS -- HEAD & TAIL
+        self.head = HeadSampler(ratio=self.sampling.ratio)
+        self.tail = TailSampler(self.sampling) if self.sampling.tail else None
+
         # TRACER PROVIDER
         self.tracer_provider = TracerProvider(
-            resource=Resource(attributes={"service.name": "agenta-sdk"})
+            resource=Resource(attributes={"service.name": "agenta-sdk"}),
+            sampler=self.head,
         )
 
         # --- INLINE
@@ -133,6 +146,7 @@ class Tracing(metaclass=Singleton):
                     credentials=self.credentials,
                 ),
                 references=self.references,
+                tail=self.tail,
             )
 
             self.tracer_provider.add_span_processor(_otlp)
@@ -164,6 +178,9 @@ class Tracing(metaclass=Singleton):
             if span is None:
                 span = self.get_current_span()
 
+            if not span.is_recording():  # e.g. not sampled
+                return
+
             span.set_attributes(
                 attributes={"internals": attributes},
                 namespace="data",
@@ -181,11 +198,12 @@ class Tracing(metaclass=Singleton):
             for key in refs.keys():
                 if key in [_.value for _ in Reference.__members__.values()]:
                     # ADD REFERENCE TO THIS SPAN
-                    span.set_attribute(
-                        key.value if isinstance(key, Enum) else key,
-                        refs[key],
-                        namespace="refs",
-                    )
+                    if span.is_recording():  # e.g. not sampled
+                        span.set_attribute(
+                            key.value if isinstance(key, Enum) else key,
+                            refs[key],
+                            namespace="refs",
+                        )
 
                     # AND TO ALL SPANS CREATED AFTER THIS ONE
                     self.references[key] = refs[key]
@@ -200,6 +218,9 @@ class Tracing(metaclass=Singleton):
             if span is None:
                 span = self.get_current_span()
 
+            if not span.is_recording():  # e.g. not sampled
+                return
+
             for key in meta.keys():
                 if is_valid_attribute_key(key):
                     span.set_attribute(
@@ -217,6 +238,9 @@ class Tracing(metaclass=Singleton):
             if span is None:
                 span = self.get_current_span()
 
+            if not span.is_recording():  # e.g. not sampled
+                return
+
             for key in metrics.keys():
                 if is_valid_attribute_key(key):
                     span.set_attribute(
@@ -255,6 +279,22 @@ class Tracing(metaclass=Singleton):
 
         return _inline_trace
 
+    def get_sampling_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of traces kept and dropped by head and tail sampling.
+
+        Returns:
+            Dict with "head" and "tail" kept/dropped counts
+        """
+        _stats = {}
+
+        if self.head:
+            _stats["head"] = self.head.stats.get()
+
+        if self.tail:
+            _stats["tail"] = self.tail.stats.get()
+
+        return _stats
+
     def extract(
         self,
         *args,
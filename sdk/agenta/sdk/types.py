@@ -1,6 +1,8 @@
+import re
 import json
 from dataclasses import dataclass
-from typing import List, Union, Optional, Dict, Literal, Any
+from functools import lru_cache
+from typing import List, Tuple, Union, Optional, Dict, Literal, Any
 
 from pydantic import ConfigDict, BaseModel, HttpUrl
 from pydantic import BaseModel, Field, model_validator
@@ -399,6 +401,61 @@ class TemplateFormatError(PromptTemplateError):
         super().__init__(message)
 
 
+_CURLY_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(template_format: str, content: str) -> Any:
+    """
+    Compile a template once per (template_format, content), and cache it.
+
+    - jinja2: a compiled jinja2.Template
+    - curly: a tuple of literal and variable tokens, e.g.
+        "Hello {{name}}!" -> (("Hello ", None), (None, "name"), ("!", None))
+    """
+    if template_format == "jinja2":
+        from jinja2 import Template
+
+        return Template(content)
+
+    if template_format == "curly":
+        tokens: List[Tuple[Optional[str], Optional[str]]] = []
+        position = 0
+
+        for match in _CURLY_PATTERN.finditer(content):
+            if match.start() > position:
+                tokens.append((content[position : match.start()], None))
+
+            tokens.append((None, match.group(1)))
+            position = match.end()
+
+        if position < len(content):
+            tokens.append((content[position:], None))
+
+        return tuple(tokens)
+
+    return None
+
+
+def _render_curly(
+    tokens: Tuple[Tuple[Optional[str], Optional[str]], ...],
+    kwargs: Dict[str, Any],
+) -> str:
+    """Render tokenized curly templates in a single pass"""
+    unreplaced = [
+        key for literal, key in tokens if key is not None and key not in kwargs
+    ]
+
+    if unreplaced:
+        raise TemplateFormatError(
+            f"Unreplaced variables in curly template: {unreplaced}"
+        )
+
+    return "".join(
+        literal if key is None else str(kwargs[key]) for literal, key in tokens
+    )
+
+
 class PromptTemplate(BaseModel):
     """A template for generating prompts with formatting capabilities"""
 
@@ -446,27 +503,17 @@ class PromptTemplate(BaseModel):
             if self.template_format == "fstring":
                 return content.format(**kwargs)
             elif self.template_format == "jinja2":
-                from jinja2 import Template, TemplateError
+                from jinja2 import TemplateError
 
                 try:
-                    return Template(content).render(**kwargs)
+                    return _compile_template("jinja2", content).render(**kwargs)
                 except TemplateError as e:
                     raise TemplateFormatError(
                         f"Jinja2 template error in content: '{content}'. Error: {str(e)}",
                         original_error=e,
                     )
             elif self.template_format == "curly":
-                import re
-
-                result = content
-                for key, value in kwargs.items():
-                    result = re.sub(r"\{\{" + key + r"\}\}", str(value), result)
-                if re.search(r"\{\{.*?\}\}", result):
-                    unreplaced = re.findall(r"\{\{(.*?)\}\}", result)
-                    raise TemplateFormatError(
-                        f"Unreplaced variables in curly template: {unreplaced}"
-                    )
-                return result
+                return _render_curly(_compile_template("curly", content), kwargs)
             else:
                 raise TemplateFormatError(
                     f"Unknown template format: {self.template_format}"
@@ -523,17 +570,14 @@ class PromptTemplate(BaseModel):
             else:
                 new_content = None
 
+            # Messages are already validated, so they are copied rather than rebuilt
             new_messages.append(
-                Message(
-                    role=msg.role,
-                    content=new_content,
-                    name=msg.name,
-                    tool_calls=msg.tool_calls,
-                    tool_call_id=msg.tool_call_id,
-                )
+                msg.model_copy()
+                if new_content == msg.content
+                else msg.model_copy(update={"content": new_content})
             )
 
-        return PromptTemplate(
+        return PromptTemplate.model_construct(
             messages=new_messages,
             template_format=self.template_format,
             llm_config=self.llm_config,
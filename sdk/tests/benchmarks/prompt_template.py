@@ -0,0 +1,72 @@
+"""
+Benchmark PromptTemplate.format() over realistic multi-message prompts.
+
+Usage:
+    python prompt_template.py [iterations]
+"""
+
+import sys
+from timeit import timeit
+
+from agenta.sdk.types import PromptTemplate, Message
+
+SYSTEM_PROMPT = (
+    "You are {{persona}}, an assistant for {{company}}. "
+    "Answer in {{language}}, in at most {{max_words}} words. "
+    "Use the following context to answer the question.\n\n{{context}}"
+)
+
+HISTORY = [
+    Message(role="user", content="What is the refund policy for {{product}}?"),
+    Message(role="assistant", content="Refunds are accepted within 30 days."),
+    Message(role="user", content="And for orders shipped to {{country}}?"),
+    Message(role="assistant", content="The same policy applies, shipping excluded."),
+]
+
+USER_PROMPT = "Question from {{customer}}: {{question}}"
+
+INPUTS = {
+    "persona": "Ada",
+    "company": "Acme",
+    "language": "English",
+    "max_words": 120,
+    "context": "\n".join(f"Document {i}: " + "lorem ipsum " * 50 for i in range(10)),
+    "product": "Acme Rocket",
+    "country": "France",
+    "customer": "Jane",
+    "question": "Can I get a refund after 45 days?",
+}
+
+
+def build(template_format: str) -> PromptTemplate:
+    messages = [
+        Message(role="system", content=SYSTEM_PROMPT),
+        *HISTORY,
+        Message(role="user", content=USER_PROMPT),
+    ]
+
+    if template_format == "jinja2":
+        messages = [
+            message.model_copy(
+                update={
+                    "content": message.content.replace("{{", "{{ ").replace("}}", " }}")
+                }
+            )
+            for message in messages
+        ]
+
+    return PromptTemplate(messages=messages, template_format=template_format)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    for template_format in ["curly", "jinja2"]:
+        template = build(template_format)
+
+        seconds = timeit(lambda: template.format(**INPUTS), number=iterations)
+
+        print(
+            f"{template_format:>8}: {seconds / iterations * 1_000_000:8.2f} us/format"
+            f" ({iterations} iterations, {len(template.messages)} messages)"
+        )
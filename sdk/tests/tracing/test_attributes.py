@@ -0,0 +1,95 @@
+import pytest
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from agenta.sdk.tracing import attributes, spans
+from agenta.sdk.tracing.attributes import Budget, _marshal, _truncate, serialize
+from agenta.sdk.tracing.spans import CustomSpan
+
+
+@pytest.fixture
+def span():
+    tracer = TracerProvider(shutdown_on_exit=False).get_tracer("tests")
+
+    _span = tracer.start_span("test")
+    yield _span
+    _span.end()
+
+
+class TestMarshal:
+    def test_lists_are_flattened_by_index(self):
+        marshalled = _marshal({"x": [{"a": 1, "b": [2, 3]}, 4]})
+
+        assert marshalled == {"x.0.a": 1, "x.0.b.0": 2, "x.0.b.1": 3, "x.1": 4}
+
+    def test_lists_share_a_level_with_their_items(self):
+        marshalled = _marshal({"x": [{"a": {"b": 1}}], "y": {"z": 2}}, max_depth=2)
+
+        assert marshalled == {"x.0.a": {"b": 1}, "y.z": 2}
+
+    def test_max_depth_keeps_lists_whole(self):
+        marshalled = _marshal({"x": [1, 2], "y": {"z": [3]}}, max_depth=2)
+
+        assert marshalled == {"x.0": 1, "x.1": 2, "y.z": [3]}
+
+
+class TestTruncate:
+    @pytest.mark.parametrize("limit", [40, 64, 100, 1000])
+    def test_truncated_values_fit_the_limit(self, monkeypatch, limit):
+        monkeypatch.setattr(attributes, "MAX_ATTRIBUTE_SIZE", limit)
+        budget = Budget()
+
+        truncated = _truncate("é" * 1000, budget)
+
+        assert truncated.endswith("bytes]")
+        assert len(truncated.encode("utf-8")) <= limit
+        assert budget.dropped == 2000 - len(truncated.split("...")[0].encode())
+
+    def test_json_prefix_is_dropped(self, monkeypatch):
+        monkeypatch.setattr(attributes, "MAX_ATTRIBUTE_SIZE", 64)
+
+        encoded = serialize(
+            namespace="data",
+            attributes={"inputs": {"a": "x" * 100}},
+            max_depth=1,
+        )
+
+        value = encoded["ag.data.inputs"]
+
+        assert not value.startswith("@ag.type=json:")
+        assert len(value.encode("utf-8")) <= 64
+
+    def test_values_without_room_for_the_marker_are_dropped(self, monkeypatch):
+        monkeypatch.setattr(attributes, "MAX_ATTRIBUTE_SIZE", 10)
+        budget = Budget()
+
+        assert _truncate("x" * 100, budget) is None
+        assert budget.dropped == 100
+
+    def test_values_within_the_limit_are_kept(self, monkeypatch):
+        monkeypatch.setattr(attributes, "MAX_ATTRIBUTE_SIZE", 100)
+
+        assert _truncate("x" * 100, Budget(remaining=100)) == "x" * 100
+
+
+class TestSpanBudget:
+    def test_budget_is_shared_across_wrappers(self, monkeypatch, span):
+        monkeypatch.setattr(spans, "MAX_SPAN_SIZE", 150)
+
+        CustomSpan(span).set_attributes({"a": "x" * 100}, namespace="data")
+        CustomSpan(span).set_attributes({"b": "y" * 100}, namespace="data")
+
+        assert span.attributes["ag.data.a"] == "x" * 100
+        assert len(span.attributes["ag.data.b"].encode("utf-8")) <= 50
+        assert span.attributes[spans._BYTES_KEY] <= 150
+        assert span.attributes[spans._DROPPED_BYTES_KEY] > 0
+
+    def test_unlimited_spans_report_dropped_bytes_only(self, monkeypatch, span):
+        monkeypatch.setattr(spans, "MAX_SPAN_SIZE", 0)
+        monkeypatch.setattr(attributes, "MAX_ATTRIBUTE_SIZE", 50)
+
+        CustomSpan(span).set_attributes({"a": "x" * 100}, namespace="data")
+        CustomSpan(span).set_attributes({"b": "y" * 100}, namespace="data")
+
+        assert spans._BYTES_KEY not in span.attributes
+        assert span.attributes[spans._DROPPED_BYTES_KEY] > 100
@@ -0,0 +1,31 @@
+from opentelemetry.baggage import get_all
+
+from agenta.sdk.context.tracing import TracingContext, tracing_context
+from agenta.sdk.decorators.tracing import instrument
+
+
+class TestBaggage:
+    def test_references_are_attached_and_detached_at_once(self):
+        token = tracing_context.set(
+            TracingContext(references={"application.id": "a", "variant.id": "v"})
+        )
+
+        try:
+            before = dict(get_all())
+
+            baggage_token = instrument()._attach_baggage()
+
+            assert dict(get_all()) == {
+                **before,
+                "ag.refs.application.id": "a",
+                "ag.refs.variant.id": "v",
+            }
+
+            instrument()._detach_baggage(baggage_token)
+
+            assert dict(get_all()) == before
+        finally:
+            tracing_context.reset(token)
+
+    def test_nothing_is_attached_without_references(self):
+        assert instrument()._attach_baggage() is None
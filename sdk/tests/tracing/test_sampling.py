@@ -0,0 +1,175 @@
+import pytest
+
+from opentelemetry.trace import StatusCode, use_span
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from agenta.sdk.context.tracing import TracingContext, tracing_context_manager
+from agenta.sdk.tracing.sampling import Sampling, HeadSampler, TailSampler
+from agenta.sdk.tracing.processors import TraceProcessor
+
+
+@pytest.fixture
+def head():
+    def _head(ratio: float):
+        sampler = HeadSampler(ratio=ratio)
+        tracer = TracerProvider(
+            sampler=sampler,
+            shutdown_on_exit=False,
+        ).get_tracer("tests")
+
+        return sampler, tracer
+
+    return _head
+
+
+@pytest.fixture
+def tail():
+    def _tail(**kwargs):
+        sampler = TailSampler(Sampling(tail=True, **kwargs))
+        exporter = InMemorySpanExporter()
+        processor = TraceProcessor(exporter, tail=sampler)
+
+        provider = TracerProvider(shutdown_on_exit=False)
+        provider.add_span_processor(processor)
+
+        return sampler, processor, exporter, provider.get_tracer("tests")
+
+    return _tail
+
+
+class TestHeadSampler:
+    def test_ratio_one_keeps_every_trace(self, head):
+        sampler, tracer = head(1.0)
+
+        with tracer.start_as_current_span("root") as root:
+            with tracer.start_as_current_span("child") as child:
+                assert child.is_recording()
+
+            assert root.is_recording()
+
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+
+    def test_ratio_zero_drops_every_trace(self, head):
+        sampler, tracer = head(0.0)
+
+        with tracer.start_as_current_span("root") as root:
+            with tracer.start_as_current_span("child") as child:
+                assert not child.is_recording()
+
+            assert not root.is_recording()
+
+        # Counted once per trace, not once per span
+        assert sampler.stats.get() == {"kept": 0, "dropped": 1}
+
+    def test_inline_traces_are_always_kept(self, head):
+        sampler, tracer = head(0.0)
+
+        with tracing_context_manager(context=TracingContext(inline=True)):
+            with tracer.start_as_current_span("root") as root:
+                assert root.is_recording()
+
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+
+
+class TestTailSampling:
+    def test_trace_is_decided_once_its_root_has_ended(self, tail):
+        sampler, processor, exporter, tracer = tail(errors=True)
+
+        with tracer.start_as_current_span("root"):
+            with tracer.start_as_current_span("child") as child:
+                child.set_status(StatusCode.ERROR)
+
+            assert sampler.stats.get() == {"kept": 0, "dropped": 0}
+
+        processor.force_flush()
+
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+        assert {span.name for span in exporter.get_finished_spans()} == {
+            "root",
+            "child",
+        }
+
+    def test_trace_without_errors_is_dropped(self, tail):
+        sampler, processor, exporter, tracer = tail(errors=True)
+
+        with tracer.start_as_current_span("root"):
+            with tracer.start_as_current_span("child"):
+                pass
+
+        processor.force_flush()
+
+        assert sampler.stats.get() == {"kept": 0, "dropped": 1}
+        assert exporter.get_finished_spans() == ()
+
+    def test_trace_is_kept_by_cost_or_rule(self, tail):
+        sampler, processor, exporter, tracer = tail(
+            errors=False,
+            cost=1.0,
+            rules=[lambda spans: any(span.name == "keep" for span in spans)],
+        )
+
+        with tracer.start_as_current_span("costly") as span:
+            span.set_attribute("ag.metrics.unit.costs.total", 2.0)
+
+        with tracer.start_as_current_span("keep"):
+            pass
+
+        with tracer.start_as_current_span("drop"):
+            pass
+
+        processor.force_flush()
+
+        assert sampler.stats.get() == {"kept": 2, "dropped": 1}
+        assert {span.name for span in exporter.get_finished_spans()} == {
+            "costly",
+            "keep",
+        }
+
+    def test_force_flush_drains_open_traces(self, tail):
+        sampler, processor, exporter, tracer = tail(errors=True)
+
+        root = tracer.start_span("root")
+
+        with use_span(root, end_on_exit=False):
+            with tracer.start_as_current_span("child") as child:
+                child.set_status(StatusCode.ERROR)
+
+        processor.force_flush()
+
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+        assert [span.name for span in exporter.get_finished_spans()] == ["child"]
+
+        root.end()
+
+        processor.force_flush()
+
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+        assert [span.name for span in exporter.get_finished_spans()] == [
+            "child",
+            "root",
+        ]
+
+    def test_late_spans_follow_the_decision_of_their_trace(self, tail):
+        sampler, processor, exporter, tracer = tail(errors=True)
+
+        with tracer.start_as_current_span("root") as root:
+            with tracer.start_as_current_span("child") as child:
+                child.set_status(StatusCode.ERROR)
+
+            processor.force_flush()
+
+            with tracer.start_as_current_span("late"):
+                pass
+
+        processor.force_flush()
+
+        # Not decided again, nor counted twice
+        assert sampler.stats.get() == {"kept": 1, "dropped": 0}
+        assert {span.name for span in exporter.get_finished_spans()} == {
+            "child",
+            "late",
+            "root",
+        }
@@ -0,0 +1,157 @@
+from json import loads
+from threading import get_ident
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from agenta.sdk.context.tracing import TracingContext, tracing_context
+from agenta.sdk.decorators.routing import (
+    NDJSON_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    entrypoint,
+)
+
+
+TRACE_ID = 0x0AF7651916CD43DD8448EB211C80319C
+SPAN_ID = 0xB7AD6B7169203331
+
+
+class Chunk(BaseModel):
+    delta: str
+
+
+def _request(accept=None):
+    headers = [(b"accept", accept.encode())] if accept else []
+
+    return Request({"type": "http", "headers": headers})
+
+
+def _parse(media_type, body):
+    if media_type == SSE_MEDIA_TYPE:
+        frames = []
+
+        for frame in body.split("\n\n")[:-1]:
+            event, data = frame.split("\n")
+
+            assert event.startswith("event: ")
+            assert data.startswith("data: ")
+
+            frames.append({"event": event[7:], **loads(data[6:])})
+
+        return frames
+
+    return [loads(line) for line in body.splitlines()]
+
+
+async def _stream(result, accept=None):
+    token = tracing_context.set(
+        TracingContext(link={"trace_id": TRACE_ID, "span_id": SPAN_ID})
+    )
+
+    try:
+        response = entrypoint.__new__(entrypoint).handle_stream(
+            _request(accept), result, inline=False
+        )
+    finally:
+        tracing_context.reset(token)
+
+    body = "".join([frame async for frame in response.body_iterator])
+
+    return response.media_type, _parse(response.media_type, body)
+
+
+async def _async_chunks():
+    yield "Hello"
+    yield {"content": " world"}
+    yield Chunk(delta="!")
+
+
+def _sync_chunks():
+    yield "Hello"
+    yield {"content": " world"}
+    yield Chunk(delta="!")
+
+
+class TestHandleStream:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "accept, media_type",
+        [
+            (None, NDJSON_MEDIA_TYPE),
+            ("application/json", NDJSON_MEDIA_TYPE),
+            (NDJSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE),
+            ("text/event-stream, */*", SSE_MEDIA_TYPE),
+        ],
+    )
+    async def test_media_type_follows_the_accept_header(self, accept, media_type):
+        streamed_media_type, frames = await _stream(_async_chunks(), accept)
+
+        assert streamed_media_type == media_type
+        assert [frame["event"] for frame in frames] == ["data"] * 3 + ["trace"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("accept", [NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE])
+    @pytest.mark.parametrize("chunks", [_async_chunks, _sync_chunks])
+    async def test_chunks_then_the_trace(self, accept, chunks):
+        _, frames = await _stream(chunks(), accept)
+
+        assert frames == [
+            {"event": "data", "data": "Hello"},
+            {"event": "data", "data": {"content": " world"}},
+            {"event": "data", "data": {"delta": "!"}},
+            {
+                "event": "trace",
+                "version": "3.0",
+                "content_type": "application/json",
+                "tree_id": "0af76519-16cd-43dd-8448-eb211c80319c",
+                "trace_id": "0af7651916cd43dd8448eb211c80319c",
+                "span_id": "b7ad6b7169203331",
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_text_chunks_are_plain_text(self):
+        async def chunks():
+            yield "Hello"
+
+        _, frames = await _stream(chunks())
+
+        assert frames[-1]["content_type"] == "text/plain"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("accept", [NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE])
+    async def test_errors_end_the_stream_with_an_error_frame(self, accept):
+        async def chunks():
+            yield "Hello"
+            raise ValueError("boom")
+
+        _, frames = await _stream(chunks(), accept)
+
+        assert [frame["event"] for frame in frames] == ["data", "error"]
+        assert frames[-1]["message"] == "boom"
+        assert "ValueError: boom" in "".join(frames[-1]["stacktrace"])
+
+    @pytest.mark.asyncio
+    async def test_sync_generators_run_in_the_threadpool(self):
+        threads = []
+
+        def chunks():
+            threads.append(get_ident())
+            yield "Hello"
+
+        await _stream(chunks())
+
+        assert threads and threads[0] != get_ident()
+
+
+class TestPatchChunk:
+    @pytest.mark.parametrize("chunk", [None, "a", 1, 1.5, True, {"a": 1}, [1]])
+    def test_json_values_are_kept(self, chunk):
+        assert entrypoint.__new__(entrypoint).patch_chunk(chunk) == chunk
+
+    def test_models_are_dumped_and_anything_else_stringified(self):
+        patch_chunk = entrypoint.__new__(entrypoint).patch_chunk
+
+        assert patch_chunk(Chunk(delta="a")) == {"delta": "a"}
+        assert patch_chunk(b"a") == "b'a'"